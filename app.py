@@ -1,16 +1,22 @@
 import os
-from flask import Flask, render_template, request, redirect, url_for, jsonify
-import subprocess
-import sys
+from flask import Flask, Response, g, render_template, request, redirect, url_for, jsonify
 import pandas as pd
 from pathlib import Path
-import gc
 import logging
 import json
-import numpy as np
+import re
 from datetime import datetime
 import requests
+import threading
+import time
 from collections import defaultdict
+from finance_ml.config.configuration import ConfigurationManager
+from finance_ml.components.prediction_history import PredictionHistoryStore
+from finance_ml.pipeline.pipeline_runner import PipelineRunner
+from finance_ml.pipeline.job_manager import JobManager
+from finance_ml.utils.exceptions import JobQueueFullError
+from finance_ml.utils.prometheus import CONTENT_TYPE, MetricsRegistry
+from finance_ml.utils.tail_cache import TailCache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -23,6 +29,55 @@ app = Flask(__name__)
 
 MAX_REQUESTS_PER_USER = 30   
 
+# Warm pipeline workers, created on the first prediction request.
+# PIPELINE_WORKERS is the number of pipeline jobs that run at the same time,
+# MAX_PENDING_JOBS caps how many may be queued or running before we refuse new ones,
+# PIPELINE_TIMEOUT is how many seconds a job may run before its worker is killed.
+PIPELINE_WORKERS = int(os.getenv('PIPELINE_WORKERS', '1'))
+MAX_PENDING_JOBS = int(os.getenv('MAX_PENDING_JOBS', '16'))
+PIPELINE_TIMEOUT = int(os.getenv('PIPELINE_TIMEOUT', '800'))
+job_manager = None
+job_manager_lock = threading.Lock()
+
+# Job status polling and chart data must not eat into the per-user quota
+QUOTA_EXEMPT_ENDPOINTS = {'job_status', 'prediction_job', 'chart_data', 'health_check', 'metrics', 'static'}
+
+# Chart data is served from the tail of each run's data file
+CHART_DAYS = 7
+# Symbols such as RELIANCE.NS, M&M.NS, BAJAJ-AUTO.NS or ^NSEI
+TICKER_PATTERN = re.compile(r"[A-Za-z0-9^][A-Za-z0-9&._-]{0,31}")
+MAX_CHART_DAYS = 365
+chart_tail_cache = TailCache()
+
+# Batch predictions run on a pipeline worker with the already trained models
+MAX_BATCH_TICKERS = 500
+
+# Prometheus metrics of this process, served at /metrics
+PIPELINE_BUCKETS = (1, 5, 10, 30, 60, 120, 300, 600, 1200, 1800, 3600)
+prometheus_metrics = MetricsRegistry()
+request_latency = prometheus_metrics.histogram(
+    'finsight_http_request_duration_seconds', 'Latency of HTTP requests', ['method', 'endpoint', 'status'])
+pipeline_job_duration = prometheus_metrics.histogram(
+    'finsight_pipeline_job_duration_seconds', 'Time from submitting a pipeline job until it finished, queueing included',
+    ['status'], buckets=PIPELINE_BUCKETS)
+pipeline_stage_duration = prometheus_metrics.histogram(
+    'finsight_pipeline_stage_duration_seconds', 'Wall time of the stages of completed pipeline jobs',
+    ['stage'], buckets=PIPELINE_BUCKETS)
+
+def pipeline_jobs_by_status():
+    counts = job_manager.status_counts() if job_manager is not None else {}
+    return {(status,): counts.get(status, 0) for status in ('queued', 'running')}
+
+prometheus_metrics.gauge('finsight_pipeline_jobs', 'Pipeline jobs waiting for a worker or running on one',
+                         ['status'], callback=pipeline_jobs_by_status)
+
+def record_pipeline_job(job):
+    """Records the duration of a finished pipeline job, and of its stages if it completed."""
+    pipeline_job_duration.observe((job.finished_at - job.submitted_at).total_seconds(), status=job.status)
+    if job.status == 'completed':
+        for stage, seconds in (job.future.result().get('stage_seconds') or {}).items():
+            pipeline_stage_duration.observe(seconds, stage=stage)
+
 # Store usage count per user
 usage_log = defaultdict(int)
 
@@ -33,9 +88,23 @@ def has_exceeded_quota(ip: str) -> bool:
     usage_log[ip] += 1
     return False
 
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_latency(response):
+    if 'request_started' in g:
+        # The endpoint name, not the path, keeps tickers and job ids out of the labels
+        request_latency.observe(time.perf_counter() - g.request_started, method=request.method,
+                                endpoint=request.endpoint or 'not_found', status=response.status_code)
+    return response
+
 @app.before_request
 def apply_quota_limit():
     """Enforce per-user total usage limit."""
+    if request.endpoint in QUOTA_EXEMPT_ENDPOINTS:
+        return None
     ip = request.remote_addr or "unknown"
     if has_exceeded_quota(ip):
         return jsonify({
@@ -43,10 +112,26 @@ def apply_quota_limit():
             "message": "Usage limit reached. This demo is for limited portfolio showcase only."
         }), 403
 
-def get_performance_metrics():
-    """Reads the latest performance metrics from the metrics file."""
-    # Only use the metrics file in the model_evaluation directory
-    metrics_path = Path('artifacts/model_evaluation/metrics.json')
+def get_run_config_manager(ticker=None, run_id=None):
+    """Returns the ConfigurationManager of a ticker's pipeline run, defaulting to its latest published run.
+
+    Raises:
+        ValueError: if run_id is not an existing run of the ticker
+    """
+    config_manager = ConfigurationManager()
+    if ticker and run_id is not None and not config_manager.run_exists(ticker, run_id):
+        raise ValueError(f"No run {run_id!r} of {ticker!r}")
+    if ticker and run_id is None:
+        run_id = config_manager.get_latest_run_id(ticker)
+    if ticker and run_id:
+        return ConfigurationManager(ticker=ticker, run_id=run_id)
+    return config_manager
+
+def get_performance_metrics(ticker=None, run_id=None):
+    """Reads the performance metrics of a pipeline run from its metrics file."""
+    # Only use the metrics file in the run's model_evaluation directory
+    config_manager = get_run_config_manager(ticker, run_id)
+    metrics_path = Path(config_manager.get_model_evaluation_config().metrics_file_name)
     
     if metrics_path.exists():
         try:
@@ -67,84 +152,27 @@ def get_performance_metrics():
     return None
 
 def get_historical_highlights():
-    """Reads prediction history and returns the top 3 most accurate predictions."""
-    history_path = Path('artifacts/model_prediction/prediction_history.csv')
-    if not history_path.exists():
+    """Returns the top 3 most accurate predictions from the prediction history."""
+    prediction_config = ConfigurationManager().get_model_prediction_config()
+    if not (prediction_config.history_db.exists() or prediction_config.legacy_history_csv.exists()):
         return []
-    
+
     try:
-        history_df = pd.read_csv(history_path)
-        if history_df.empty or 'Actual' not in history_df.columns or 'Predicted' not in history_df.columns:
-            return []
-            
-        # Calculate absolute percentage error for sorting
-        history_df['Error'] = np.abs(history_df['Predicted'] - history_df['Actual'])
-        history_df = history_df.sort_values(by='Error', ascending=True)
-        
-        # Get top 3, format them for display
-        highlights = history_df.head(3).to_dict('records')
-        
-        # Clean up memory
-        del history_df
-        gc.collect()
-        
-        return highlights
+        # The store keeps an index on the prediction error, so this reads only 3 rows
+        history = PredictionHistoryStore(prediction_config.history_db, legacy_csv_path=prediction_config.legacy_history_csv)
+        return history.top_k_by_error(k=3)
     except Exception as e:
         print(f"Error reading or processing historical highlights: {e}")
         return []
 
-def run_pipeline(choice, ticker=None):
-    """Executes the main ML pipeline as a subprocess."""
-    command = [sys.executable, 'main.py', '--choice', choice]
-    if choice == '1' and ticker:
-        command.extend(['--ticker', ticker])
-    
-    logging.info(f"Executing command: {' '.join(command)}")
-    try:
-        process = subprocess.Popen(
-            command,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            encoding='utf-8',
-            errors='ignore'
-        )
-        stdout, stderr = process.communicate(timeout=800) # 8-minute timeout
-        if process.returncode != 0:
-            logging.error(f"Pipeline execution failed.\nSTDOUT: {stdout}\nSTDERR: {stderr}")
-            return False, None
-        
-        # Extract ticker from output - the prediction component prints "Predicted Close Price for {ticker}: {price}"
-        detected_ticker = None
-        for line in stdout.splitlines():
-            if "Predicted Close Price for" in line:
-                parts = line.split("Predicted Close Price for")[1].split(":")
-                if parts:
-                    detected_ticker = parts[0].strip()
-                break
-        
-        logging.info(f"Pipeline executed successfully. Detected ticker: {detected_ticker}")
-        return True, detected_ticker
-    except Exception as e:
-        logging.error(f"Failed to run pipeline: {e}")
-        return False, None
-
-def get_latest_prediction():
-    """Reads the latest prediction from the predictions file."""
-    prediction_path = Path('artifacts/model_prediction/predictions.csv')
-    if not prediction_path.exists():
-        return None
-    try:
-        pred_df = pd.read_csv(prediction_path)
-        if not pred_df.empty:
-            prediction_data = pred_df.tail(1).to_dict('records')[0]
-            # Check if we need to extract ticker from the data
-            if 'Ticker' in prediction_data:
-                prediction_data['ticker'] = prediction_data['Ticker']
-            return prediction_data
-    except Exception as e:
-        logging.error(f"Error reading prediction file: {e}")
-    return None
+def get_job_manager():
+    """Returns the process-wide job manager, starting the warm pipeline workers on first use."""
+    global job_manager
+    with job_manager_lock:
+        if job_manager is None:
+            runner = PipelineRunner(max_workers=PIPELINE_WORKERS, job_timeout=PIPELINE_TIMEOUT)
+            job_manager = JobManager(runner, max_pending=MAX_PENDING_JOBS, on_job_done=record_pipeline_job)
+    return job_manager
 
 @app.route('/')
 def index():
@@ -159,6 +187,11 @@ def index():
 def health_check():
     return {'status': 'healthy'}, 200
 
+@app.route('/metrics')
+def metrics():
+    """Request latencies, pipeline durations and queue depth in the Prometheus text format."""
+    return Response(prometheus_metrics.render(), content_type=CONTENT_TYPE)
+
 # Add better error handling for the main routes
 @app.errorhandler(500)
 def server_error(e):
@@ -171,49 +204,28 @@ def server_error(e):
 def not_found(e):
     return {'error': 'Route not found'}, 404
 
-def get_chart_data_from_pipeline(ticker):
+def get_chart_data_from_pipeline(ticker, run_id=None, days=CHART_DAYS):
     """
-    Reads historical data from the file generated by the data ingestion pipeline.
+    Reads the last `days` bars from the file generated by the data ingestion pipeline.
     """
     try:
-        # The data ingestion pipeline saves the data here
-        data_path = Path('artifacts/data_ingestion/raw_data.csv')
+        # The data ingestion pipeline saves the data in the run's namespace
+        config_manager = get_run_config_manager(ticker, run_id)
+        data_path = Path(config_manager.get_data_ingestion_config().raw_data_file)
         if not data_path.exists():
             print(f"Data file not found at {data_path}")
             return None, None
 
-        # Read only necessary columns and use chunks for memory efficiency
-        chunks = pd.read_csv(data_path, usecols=['Datetime', 'Ticker', 'Close'], chunksize=1000)
-        relevant_data = []
-        
-        for chunk in chunks:
-            # Filter for the specific ticker
-            ticker_data = chunk[chunk['Ticker'] == ticker]
-            if not ticker_data.empty:
-                relevant_data.append(ticker_data)
-        
-        if not relevant_data:
-            print(f"No data found for ticker {ticker}")
-            return None, None
-            
-        # Combine filtered chunks
-        hist_df = pd.concat(relevant_data, ignore_index=True)
-        hist_df['Datetime'] = pd.to_datetime(hist_df['Datetime'])
-        hist_df = hist_df.sort_values('Datetime')
-
-        # Get the last 7 days for the chart
-        last_7_days = hist_df.tail(7)
+        # Only the tail of the file is read, and it is cached until the file changes
+        tail_df = chart_tail_cache.get(data_path, days, usecols=['Datetime', 'Ticker', 'Close'])
+        recent = tail_df[tail_df['Ticker'] == ticker]
         
-        if len(last_7_days) == 0:
+        if len(recent) == 0:
             print(f"No recent data found for ticker {ticker}")
             return None, None
             
-        prices = last_7_days['Close'].tolist()
-        dates = last_7_days['Datetime'].dt.strftime('%Y-%m-%d').tolist()
-        
-        # Clean up memory
-        del hist_df, last_7_days
-        gc.collect()
+        prices = recent['Close'].tolist()
+        dates = pd.to_datetime(recent['Datetime']).dt.strftime('%Y-%m-%d').tolist()
         
         print(f"Chart data prepared: {len(dates)} dates and {len(prices)} prices for {ticker}")
         return prices, dates
@@ -222,6 +234,62 @@ def get_chart_data_from_pipeline(ticker):
         return None, None
 
 
+@app.route('/api/chart/<ticker>')
+def chart_data(ticker):
+    """Returns the latest bars of a ticker's most recent run as JSON, e.g. /api/chart/TCS.NS?days=30."""
+    if not TICKER_PATTERN.fullmatch(ticker):
+        return {'error': 'Invalid ticker'}, 400
+    run_id = request.args.get('run_id')
+    if run_id is not None and not ConfigurationManager().run_exists(ticker, run_id):
+        return {'error': f'No run {run_id} of {ticker}'}, 404
+    days = max(1, min(request.args.get('days', CHART_DAYS, type=int), MAX_CHART_DAYS))
+    prices, dates = get_chart_data_from_pipeline(ticker, run_id, days=days)
+    if prices is None:
+        return {'error': f'No chart data for {ticker}'}, 404
+    return {'ticker': ticker, 'dates': dates, 'prices': prices}, 200
+
+
+def render_prediction(prediction_data):
+    """Renders the results page for a finished pipeline run."""
+    logging.info(f"Prediction data: {prediction_data}")  # Debug log
+    display_ticker = prediction_data.get('ticker')
+
+    run_id = prediction_data.get('run_id')
+    metrics = get_performance_metrics(display_ticker, run_id)
+    highlights = get_historical_highlights() # Refresh highlights
+
+    # Prepare chart data - use the ticker the pipeline actually ran for (manual or AI selection)
+    chart_prices, chart_dates = get_chart_data_from_pipeline(display_ticker, run_id)
+
+    # Get today's date in the correct format
+    today_date = datetime.now().strftime('%Y-%m-%d')
+
+    return render_template(
+        'index.html',
+        prediction=prediction_data,
+        metrics=metrics,
+        ticker=display_ticker,
+        chart_prices=chart_prices,
+        chart_dates=chart_dates,
+        highlights=highlights,
+        today_date=today_date  # Add today's date
+    )
+
+
+def submit_prediction_job(choice, ticker):
+    """Validates a prediction request and queues it. Returns (job, error_message, status_code)."""
+    if choice not in ('1', '2'):
+        return None, "Invalid choice. Please select manual or LLM-powered prediction.", 400
+    if choice == '1' and not ticker:
+        logging.warning("Company name or ticker symbol is required for manual prediction.")
+        return None, "Company name or ticker symbol is required for manual prediction.", 400
+    try:
+        return get_job_manager().submit(choice, ticker), None, 202
+    except JobQueueFullError as e:
+        logging.warning(f"Rejected prediction request: {e}")
+        return None, "The server is busy with other predictions. Please try again in a few minutes.", 503
+
+
 @app.route('/predict', methods=['GET', 'POST'])
 def predict():
     if request.method == 'GET':
@@ -233,55 +301,85 @@ def predict():
         ticker = request.form.get('ticker') # Safely get the ticker
         logging.info(f"Choice: {choice}, Ticker: {ticker}")
 
-        if choice == '1' and not ticker:
-            logging.warning("Company name or ticker symbol is required for manual prediction.")
-            return render_template('index.html', error="Company name or ticker symbol is required for manual prediction.")
+        job, error, _ = submit_prediction_job(choice, ticker)
+        if error:
+            return render_template('index.html', error=error)
 
-        # Run the main pipeline
-        pipeline_success, detected_ticker = run_pipeline(choice, ticker)
-        if not pipeline_success:
-            error_message = "An error occurred during the pipeline execution. This may be due to insufficient data for the selected ticker. Please try a different ticker with more historical data."
-            return render_template('index.html', error=error_message)
+        # Free the request thread right away; the results page polls the job
+        return redirect(url_for('prediction_job', job_id=job.job_id))
+
+    except Exception as e:
+        logging.error(f"Error during prediction: {e}", exc_info=True)
+        return render_template('index.html', error="An error occurred during the prediction process.")
 
-        # After the pipeline runs, get the latest prediction and metrics
-        prediction_data = get_latest_prediction()
-        logging.info(f"Prediction data: {prediction_data}")  # Debug log
-        
-        # Determine which ticker to display
-        display_ticker = ticker
-        if choice == '2' and detected_ticker:
-            display_ticker = detected_ticker
-            logging.info(f"AI selected ticker: {display_ticker}")
-        
-        # If we have prediction data but no ticker (should never happen now), add the ticker
-        if prediction_data and not 'ticker' in prediction_data and display_ticker:
-            prediction_data['ticker'] = display_ticker
-        
-        metrics = get_performance_metrics()
-        highlights = get_historical_highlights() # Refresh highlights
 
-        # Prepare chart data - use the display_ticker for both manual and AI selection
-        chart_prices, chart_dates = get_chart_data_from_pipeline(display_ticker)
+@app.route('/predict/<job_id>')
+def prediction_job(job_id):
+    """Results page for a prediction job; shows the loading screen until the job finishes."""
+    job = get_job_manager().get(job_id)
+    if job is None:
+        return render_template('index.html', error="Prediction job not found. It may have expired, please try again.")
 
-        # Get today's date in the correct format
+    if not job.done:
         today_date = datetime.now().strftime('%Y-%m-%d')
-        
-        return render_template(
-            'index.html', 
-            prediction=prediction_data, 
-            metrics=metrics,
-            ticker=display_ticker,  # Use the display_ticker which works for both manual and AI selection
-            chart_prices=chart_prices,
-            chart_dates=chart_dates,
-            highlights=highlights,
-            today_date=today_date  # Add today's date
-        )
+        return render_template('index.html', job_id=job.job_id, today_date=today_date)
+
+    if job.status != 'completed':
+        error_message = "An error occurred during the pipeline execution. This may be due to insufficient data for the selected ticker. Please try a different ticker with more historical data."
+        return render_template('index.html', error=error_message)
 
+    try:
+        return render_prediction(job.future.result())
     except Exception as e:
         logging.error(f"Error during prediction: {e}", exc_info=True)
         return render_template('index.html', error="An error occurred during the prediction process.")
 
 
+@app.route('/api/jobs', methods=['POST'])
+def submit_job():
+    """Queues a pipeline run. Expects 'choice' and optionally 'ticker' in the JSON body."""
+    data = request.get_json(silent=True) or {}
+    job, error, status_code = submit_prediction_job(str(data.get('choice', '')), data.get('ticker'))
+    if error:
+        return {'error': error}, status_code
+
+    response = job.to_dict()
+    response['status_url'] = url_for('job_status', job_id=job.job_id)
+    return response, status_code
+
+
+@app.route('/api/jobs/<job_id>')
+def job_status(job_id):
+    """Returns the status of a pipeline job, and its prediction once completed."""
+    job = get_job_manager().get(job_id)
+    if job is None:
+        return {'error': 'Job not found'}, 404
+    return job.to_dict(), 200
+
+
+@app.route('/api/predict_batch', methods=['POST'])
+def predict_batch():
+    """Queues a prediction of the next close of many tickers from their latest runs. Expects a 'tickers' list in the JSON body."""
+    data = request.get_json(silent=True) or {}
+    tickers = data.get('tickers')
+    if isinstance(tickers, str):
+        tickers = tickers.split(',')
+    if not isinstance(tickers, list) or not tickers:
+        return {'error': "Provide a list of tickers, e.g. {\"tickers\": [\"TCS.NS\", \"INFY.NS\"]}"}, 400
+    if len(tickers) > MAX_BATCH_TICKERS:
+        return {'error': f'At most {MAX_BATCH_TICKERS} tickers per request'}, 400
+
+    try:
+        job = get_job_manager().submit_batch([str(t) for t in tickers])
+    except JobQueueFullError as e:
+        logging.warning(f"Rejected batch prediction request: {e}")
+        return {'error': 'The server is busy with other predictions. Please try again in a few minutes.'}, 503
+
+    response = job.to_dict()
+    response['status_url'] = url_for('job_status', job_id=job.job_id)
+    return response, 202
+
+
 
 @app.route('/external_predict', methods=['POST'])
 def external_predict():
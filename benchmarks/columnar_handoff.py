@@ -0,0 +1,136 @@
+"""Parse time and peak memory of the raw data hand-off: CSV text against typed Parquet.
+
+Writes a synthetic OHLCV history in both formats, then runs the read of every
+consumer of raw_data the way it is done for each format. Times are the best of
+--repeats in this process; peak memory is measured in a fresh interpreter per
+read, above what the imports already take (read from /proc, so Linux only):
+
+    python benchmarks/columnar_handoff.py --rows 250000 --repeats 5
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from finance_ml.config.configuration import ConfigurationManager
+from finance_ml.utils.columnar import write_frame
+
+# Every consumer's read, as it was done on raw_data.csv and as it is done on raw_data.parquet
+READS = """
+import pandas as pd
+from finance_ml.utils.columnar import iter_frames, read_frame, read_parquet_tail
+from finance_ml.utils.tail_cache import read_csv_tail
+
+def csv_frame(path, columns=None):
+    df = pd.read_csv(path, usecols=columns)
+    df["Datetime"] = pd.to_datetime(df["Datetime"])
+    return df
+
+READS = {
+    "validate": {
+        "csv": lambda path, features, lookback: sum(len(chunk) for chunk in pd.read_csv(path, chunksize=50_000)),
+        "parquet": lambda path, features, lookback: sum(len(chunk) for chunk in iter_frames(path, 50_000)),
+    },
+    "transform": {
+        "csv": lambda path, features, lookback: csv_frame(path)[features].to_numpy(),
+        "parquet": lambda path, features, lookback: read_frame(path, columns=features).to_numpy(),
+    },
+    "predict": {
+        "csv": lambda path, features, lookback: csv_frame(path),
+        "parquet": lambda path, features, lookback: read_frame(path, columns=list(dict.fromkeys(["Ticker", "Datetime", "Close"] + features))),
+    },
+    "predict_many": {
+        "csv": lambda path, features, lookback: read_csv_tail(path, lookback, usecols=["Datetime"] + features),
+        "parquet": lambda path, features, lookback: read_parquet_tail(path, lookback, columns=["Datetime"] + features),
+    },
+    "chart": {
+        "csv": lambda path, features, lookback: read_csv_tail(path, 365, usecols=["Datetime", "Ticker", "Close"]),
+        "parquet": lambda path, features, lookback: read_parquet_tail(path, 365, columns=["Datetime", "Ticker", "Close"]),
+    },
+}
+"""
+
+# Run in a fresh interpreter so the peak only covers one read
+COLD_READ = READS + """
+import json, sys
+
+def rss_kb(field):
+    with open("/proc/self/status") as f:
+        return next(int(line.split()[1]) for line in f if line.startswith(field + ":"))
+
+consumer, fmt, path, features, lookback = sys.argv[1], sys.argv[2], sys.argv[3], sys.argv[4].split(","), int(sys.argv[5])
+before_kb = rss_kb("VmRSS")
+READS[consumer][fmt](path, features, lookback)
+print(json.dumps({"peak_mb": (rss_kb("VmHWM") - before_kb) / 1024}))
+"""
+
+
+def best_of(func, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def cold_read(consumer, fmt, path, features, lookback):
+    proc = subprocess.run(
+        [sys.executable, "-c", COLD_READ, consumer, fmt, path, ",".join(features), str(lookback)],
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def synthetic_ohlcv(rows, seed=0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 1000 * np.exp(np.cumsum(rng.normal(0, 0.01, rows)))
+    spread = close * rng.uniform(0, 0.01, rows)
+    return pd.DataFrame({
+        "Ticker": "RELIANCE.NS",
+        "Datetime": pd.date_range("2000-01-03 09:15", periods=rows, freq="min", tz="Asia/Kolkata"),
+        "Open": close + rng.normal(0, 1, rows),
+        "High": close + spread,
+        "Low": close - spread,
+        "Close": close,
+        "Volume": rng.integers(1_000, 1_000_000, rows),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=250_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    config_manager = ConfigurationManager()
+    features = list(config_manager.params.data_transformation.features)
+    lookback = config_manager.params.data_transformation.lookback
+    namespace = {}
+    exec(READS, namespace)
+    reads = namespace["READS"]
+
+    df = synthetic_ohlcv(args.rows)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = {"csv": os.path.join(tmp_dir, "raw_data.csv"), "parquet": os.path.join(tmp_dir, "raw_data.parquet")}
+        df.to_csv(paths["csv"], index=False)
+        write_frame(df, paths["parquet"], config_manager.schema.COLUMNS)
+
+        print(f"{args.rows} rows: csv {os.path.getsize(paths['csv']) / 2**20:.1f} MB, "
+              f"parquet {os.path.getsize(paths['parquet']) / 2**20:.1f} MB\n")
+        print(f"{'consumer':>13} {'csv ms':>9} {'parquet ms':>11} {'speedup':>8} {'csv MB':>8} {'parquet MB':>11}")
+        for consumer, read in reads.items():
+            seconds = {fmt: best_of(lambda: read[fmt](paths[fmt], features, lookback), args.repeats) for fmt in paths}
+            peaks = {fmt: cold_read(consumer, fmt, paths[fmt], features, lookback)["peak_mb"] for fmt in paths}
+            print(f"{consumer:>13} {seconds['csv'] * 1000:>9.1f} {seconds['parquet'] * 1000:>11.1f} "
+                  f"{seconds['csv'] / seconds['parquet']:>7.1f}x {peaks['csv']:>8.1f} {peaks['parquet']:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
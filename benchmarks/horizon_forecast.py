@@ -0,0 +1,67 @@
+"""Latency of multi-step forecasts: compiled rollout versus one model.predict call per step.
+
+Builds an untrained model with the architecture and sizes from params.yaml,
+so it runs without any pipeline artifacts:
+
+    python benchmarks/horizon_forecast.py --horizons 5 20 --repeats 5
+"""
+import argparse
+import os
+import time
+
+os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "2")
+
+import numpy as np
+
+from finance_ml.components.forecasting import rollout, rollout_loop
+from finance_ml.config.configuration import ConfigurationManager
+
+
+def build_model(params, lookback, n_features):
+    from tensorflow import keras
+    return keras.Sequential([
+        keras.Input((lookback, n_features)),
+        keras.layers.LSTM(params.lstm_units_1, return_sequences=True),
+        keras.layers.LSTM(params.lstm_units_2),
+        keras.layers.Dense(params.dense_units_1, activation="relu"),
+        keras.layers.Dropout(params.dropout_rate),
+        keras.layers.Dense(1),
+    ])
+
+
+def best_of(func, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--horizons", type=int, nargs="+", default=[5, 20])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    config_manager = ConfigurationManager()
+    _, training_params = config_manager.get_model_training_config()
+    transformation_params = config_manager.params.data_transformation
+    lookback, n_features = transformation_params.lookback, len(transformation_params.features)
+
+    model = build_model(training_params, lookback, n_features)
+    window = np.random.default_rng(0).standard_normal((1, lookback, n_features)).astype(np.float32)
+
+    print(f"{'horizon':>8} {'loop ms':>10} {'compiled ms':>12} {'speedup':>8} {'max abs diff':>13}")
+    for horizon in args.horizons:
+        # The first call traces and compiles the rollout, it is not part of the timing
+        compiled_path = rollout(model, window, horizon)
+        loop_path = rollout_loop(model, window, horizon)
+        loop_s = best_of(lambda: rollout_loop(model, window, horizon), args.repeats)
+        compiled_s = best_of(lambda: rollout(model, window, horizon), args.repeats)
+        print(f"{horizon:>8} {loop_s * 1000:>10.1f} {compiled_s * 1000:>12.1f} {loop_s / compiled_s:>7.1f}x "
+              f"{np.abs(compiled_path - loop_path).max():>13.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Latency and memory of the NumPy LSTM engine against Keras for the same model.
+
+Exports an untrained model with the architecture and sizes from params.yaml,
+then times predictions in this process and measures import + load + first
+prediction of each engine in a fresh interpreter (peak RSS is read from
+/proc, so Linux only):
+
+    python benchmarks/numpy_lstm.py --batch-sizes 1 200 --repeats 20
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "2")
+
+import numpy as np
+from sklearn.preprocessing import StandardScaler
+
+from finance_ml.config.configuration import ConfigurationManager
+
+# Run in a fresh interpreter so the measured RSS only covers one engine
+COLD_START = """
+import json, sys, time
+start = time.perf_counter()
+engine, model_path, scaler_path, lookback, n_features = sys.argv[1], sys.argv[2], sys.argv[3], int(sys.argv[4]), int(sys.argv[5])
+import numpy as np
+if engine == "keras":
+    from finance_ml.components.model_registry import _load_keras_model, _load_scaler
+    model, scaler = _load_keras_model(model_path), _load_scaler(scaler_path)
+    predict = lambda X: model.predict_on_batch(X)
+else:
+    from finance_ml.components.numpy_lstm import load_numpy_model, load_numpy_scaler
+    model, scaler = load_numpy_model(model_path), load_numpy_scaler(model_path)
+    predict = model.predict
+predict(np.zeros((1, lookback, n_features), dtype=np.float32))
+seconds = time.perf_counter() - start
+# Peak RSS of this process; unlike ru_maxrss it does not include the parent's peak from before exec
+with open("/proc/self/status") as f:
+    peak_kb = next(int(line.split()[1]) for line in f if line.startswith("VmHWM:"))
+print(json.dumps({"seconds": seconds, "max_rss_mb": peak_kb / 1024}))
+"""
+
+
+def best_of(func, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def cold_start(engine, model_path, scaler_path, lookback, n_features):
+    proc = subprocess.run(
+        [sys.executable, "-c", COLD_START, engine, model_path, scaler_path, str(lookback), str(n_features)],
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 200])
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    from tensorflow import keras
+    from joblib import dump
+    from finance_ml.components.numpy_lstm import export_numpy_model, load_numpy_model
+
+    config_manager = ConfigurationManager()
+    _, params = config_manager.get_model_training_config()
+    transformation_params = config_manager.params.data_transformation
+    lookback, n_features = transformation_params.lookback, len(transformation_params.features)
+
+    model = keras.Sequential([
+        keras.Input((lookback, n_features)),
+        keras.layers.LSTM(params.lstm_units_1, return_sequences=True),
+        keras.layers.LSTM(params.lstm_units_2),
+        keras.layers.Dense(params.dense_units_1, activation="relu"),
+        keras.layers.Dropout(params.dropout_rate),
+        keras.layers.Dense(1),
+    ])
+    scaler = StandardScaler().fit(np.random.default_rng(0).uniform(100, 200, (500, n_features)))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        keras_path = os.path.join(tmp_dir, "lstm_model.keras")
+        scaler_path = os.path.join(tmp_dir, "scaler.joblib")
+        numpy_path = os.path.join(tmp_dir, "lstm_model.npz")
+        model.save(keras_path)
+        dump(scaler, scaler_path)
+        export_numpy_model(model, scaler, numpy_path)
+        numpy_model = load_numpy_model(numpy_path)
+
+        print(f"artifact size: keras {os.path.getsize(keras_path) / 1024:.0f} KB, "
+              f"npz {os.path.getsize(numpy_path) / 1024:.0f} KB\n")
+        print(f"{'batch':>6} {'keras ms':>10} {'numpy ms':>10} {'max abs diff':>13}")
+        for batch_size in args.batch_sizes:
+            X = np.random.default_rng(1).standard_normal((batch_size, lookback, n_features)).astype(np.float32)
+            model.predict_on_batch(X)
+            keras_s = best_of(lambda: model.predict_on_batch(X), args.repeats)
+            numpy_s = best_of(lambda: numpy_model.predict(X), args.repeats)
+            diff = np.abs(numpy_model.predict(X) - np.asarray(model.predict_on_batch(X))).max()
+            print(f"{batch_size:>6} {keras_s * 1000:>10.2f} {numpy_s * 1000:>10.2f} {diff:>13.2e}")
+
+        print(f"\n{'engine':>6} {'cold start s':>13} {'max RSS MB':>11}")
+        for engine, path in (("keras", keras_path), ("numpy", numpy_path)):
+            result = cold_start(engine, path, scaler_path, lookback, n_features)
+            print(f"{engine:>6} {result['seconds']:>13.2f} {result['max_rss_mb']:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+"""Offline benchmarks of the pipeline and app hot paths, compared with a stored baseline.
+
+Every benchmark runs on the same synthetic OHLCV history in a temporary
+workspace, with the local data provider, a tiny model and network access
+refused, so the timings only depend on the code and the machine:
+
+    python benchmarks/suite.py                     # compare with benchmarks/baseline.json, recording it if missing
+    python benchmarks/suite.py --save-baseline     # record a new baseline, e.g. on new hardware
+    python benchmarks/suite.py --require-baseline  # in CI: fail instead of recording when the baseline is missing
+
+Times are the best of --repeats in seconds. The run exits with status 1 when
+a benchmark is more than --threshold slower than the baseline.
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import math
+import os
+import platform
+import shutil
+import socket
+import sys
+import tempfile
+import time
+from concurrent.futures import Future
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+
+os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "2")
+
+import numpy as np
+import pandas as pd
+import yaml
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+# app.py lives in the repository root
+sys.path.insert(0, str(REPO_ROOT))
+
+TICKER = "BENCH.NS"
+# Machine-specific, so not committed: CI keeps it between runs, see the README
+DEFAULT_BASELINE = REPO_ROOT / "benchmarks" / "baseline.json"
+# Slowdowns smaller than this are timer noise on the millisecond benchmarks
+MIN_DELTA_SECONDS = 0.001
+# Small enough that training measures the input pipeline and the fit loop, not the LSTM maths
+TINY_MODEL = {"lstm_units_1": 8, "lstm_units_2": 8, "dense_units_1": 8}
+
+
+def synthetic_ohlcv(rows, ticker=TICKER, seed=0) -> pd.DataFrame:
+    """Business-day bars of a geometric random walk; the same rows and seed always give the same frame."""
+    rng = np.random.default_rng(seed)
+    close = 1000 * np.exp(np.cumsum(rng.normal(0, 0.01, rows)))
+    spread = close * rng.uniform(0, 0.01, rows)
+    return pd.DataFrame({
+        "Ticker": ticker,
+        "Datetime": pd.date_range("2000-01-03", periods=rows, freq="B", tz="Asia/Kolkata"),
+        "Open": close + rng.normal(0, 1, rows),
+        "High": close + spread,
+        "Low": close - spread,
+        "Close": close,
+        "Volume": rng.integers(1_000, 1_000_000, rows),
+    })
+
+
+def best_of(func, repeats, number=1):
+    """Seconds per call of func: the best of repeats rounds of number calls each."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+    return min(timings)
+
+
+def refuse_network():
+    """Makes every connection attempt raise, so nothing can quietly time a download."""
+    def refuse(*args, **kwargs):
+        raise RuntimeError("The benchmarks run offline, a connection was attempted")
+    socket.socket.connect = refuse
+    socket.create_connection = refuse
+
+
+def prepare_workspace(root: Path, rows):
+    """Writes the configs with the local provider and the tiny model into root, and the synthetic history.
+
+    Returns the history as a DataFrame.
+    """
+    config = yaml.safe_load((REPO_ROOT / "config" / "config.yaml").read_text())
+    config["data_ingestion"]["provider"] = "local"
+    params = yaml.safe_load((REPO_ROOT / "params.yaml").read_text())
+    params["data_ingestion"]["period"] = "max"
+    params["model_training"].update(TINY_MODEL)
+
+    (root / "config").mkdir()
+    (root / "config" / "config.yaml").write_text(yaml.safe_dump(config))
+    (root / "params.yaml").write_text(yaml.safe_dump(params))
+    shutil.copy(REPO_ROOT / "schema.yaml", root / "schema.yaml")
+
+    df = synthetic_ohlcv(rows)
+    data_dir = root / config["data_ingestion"]["local_data_dir"]
+    data_dir.mkdir(parents=True)
+    df.drop(columns="Ticker").to_csv(data_dir / f"{TICKER}.csv", index=False)
+    return df
+
+
+def bench_ingestion(config_manager, repeats) -> dict:
+    from finance_ml.components.data_ingestion import DataIngestion
+    from finance_ml.components.data_providers import LocalFileProvider
+    from finance_ml.utils.columnar import read_frame
+
+    config = config_manager.get_data_ingestion_config()
+    provider = LocalFileProvider(config.local_data_dir)
+
+    def first_download():
+        # An empty store, so every bar is parsed, stored and written to raw_data
+        shutil.rmtree(config.store_dir, ignore_errors=True)
+        DataIngestion(config, TICKER, provider=provider).download_data()
+
+    features = list(config_manager.params.data_transformation.features)
+    return {
+        "ingest_csv_parse": best_of(lambda: provider.fetch(TICKER, config.interval, period=config.period), repeats),
+        "ingest_download": best_of(first_download, repeats),
+        "raw_data_read": best_of(lambda: read_frame(config.raw_data_file, columns=features), repeats),
+    }
+
+
+def bench_transformation(config_manager, df, repeats) -> dict:
+    from finance_ml.components.data_transformation import DataTransformation
+    from finance_ml.utils.handoff import Handoff
+
+    config = config_manager.get_data_transformation_config()
+    # Handed over in memory, so the timing is scaling and windowing, not the read
+    handoff = Handoff()
+    handoff.put(config.raw_data_file, df)
+    return {"transform_windowing": best_of(lambda: DataTransformation(config, handoff).transform_and_save_data(), repeats)}
+
+
+def bench_training(config_manager, epochs, repeats) -> tuple:
+    from finance_ml.components.model_training import ModelTraining
+
+    config, params = config_manager.get_model_training_config()
+
+    def train(n_epochs):
+        return lambda: ModelTraining(config, replace(params, epochs=n_epochs)).train_model()
+
+    # The difference between a 1 epoch and a 1 + epochs training leaves out
+    # building, tracing and saving the model
+    one_epoch = best_of(train(1), repeats)
+    more_epochs = best_of(train(1 + epochs), repeats)
+    samples = len(np.load(config.X_train_path, mmap_mode="r"))
+    seconds_per_epoch = max(more_epochs - one_epoch, 0.0) / epochs
+    return {"train_epoch": seconds_per_epoch}, {"train_samples_per_sec": samples / max(seconds_per_epoch, 1e-9)}
+
+
+def bench_prediction(config_manager, repeats) -> dict:
+    from finance_ml.components.model_registry import get_model_registry
+    from finance_ml.components.prediction import ModelPrediction
+
+    base_config = config_manager.get_model_prediction_config()
+    results = {}
+    for engine in ("keras", "numpy"):
+        config = replace(base_config, engine=engine)
+        registry = get_model_registry(config.model_cache_size, config.model_cache_memory_mb, engine=engine)
+
+        def cold():
+            # Nothing cached: the model and scaler are loaded from disk again
+            registry.clear()
+            ModelPrediction(config).predict()
+
+        results[f"predict_cold_{engine}"] = best_of(cold, repeats)
+        results[f"predict_warm_{engine}"] = best_of(lambda: ModelPrediction(config).predict(), repeats)
+    return results
+
+
+class StubRunner:
+    """Stands in for PipelineRunner: every job completes at once, no pipeline runs."""
+
+    def submit(self, choice, ticker=None, force=False, stages=None) -> Future:
+        future = Future()
+        future.set_result({"ticker": ticker, "run_id": None, "stage_seconds": {}})
+        return future
+
+
+def bench_app(repeats, number) -> dict:
+    import app as webapp
+    from finance_ml.pipeline.job_manager import JobManager
+
+    # Repeated requests from the test client would otherwise run into the per-user quota
+    webapp.MAX_REQUESTS_PER_USER = math.inf
+    webapp.job_manager = JobManager(StubRunner(), max_pending=math.inf, on_job_done=webapp.record_pipeline_job)
+    client = webapp.app.test_client()
+
+    def request(method, path, expected_status, **kwargs):
+        def call():
+            response = client.open(path, method=method, **kwargs)
+            if response.status_code != expected_status:
+                raise RuntimeError(f"{method} {path} returned {response.status_code}, expected {expected_status}")
+        return call
+
+    return {
+        "app_index": best_of(request("GET", "/", 200), repeats, number),
+        "app_predict_submit": best_of(
+            request("POST", "/predict", 302, data={"choice": "1", "ticker": TICKER}), repeats, number),
+        "app_chart_data": best_of(request("GET", f"/api/chart/{TICKER}?days=365", 200), repeats, number),
+    }
+
+
+def run_benchmarks(args) -> tuple:
+    """Returns (timings, extra figures) of every benchmark, run in a fresh temporary workspace."""
+    from finance_ml.config.configuration import ConfigurationManager
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        df = prepare_workspace(Path(tmp_dir), args.rows)
+        os.chdir(tmp_dir)
+        try:
+            # Progress bars and per-step logs would bury the report
+            logging.disable(logging.INFO)
+            with contextlib.redirect_stdout(io.StringIO()):
+                config_manager = ConfigurationManager()
+                timings, extra = {}, {}
+                timings.update(bench_ingestion(config_manager, args.repeats))
+                timings.update(bench_transformation(config_manager, df, args.repeats))
+                train_timings, train_extra = bench_training(config_manager, args.epochs, args.repeats)
+                timings.update(train_timings)
+                extra.update(train_extra)
+                timings.update(bench_prediction(config_manager, args.repeats))
+                timings.update(bench_app(args.repeats, args.requests))
+        finally:
+            logging.disable(logging.NOTSET)
+            os.chdir(cwd)
+    return timings, extra
+
+
+def environment() -> dict:
+    return {"python": platform.python_version(), "machine": platform.machine(),
+            "processor": platform.processor(), "cpu_count": os.cpu_count()}
+
+
+def find_regressions(timings, baseline, threshold, min_delta=MIN_DELTA_SECONDS) -> list:
+    """Names of the benchmarks more than threshold (a fraction) slower than in baseline.
+
+    Differences below min_delta seconds never count, and benchmarks the
+    baseline does not have are skipped.
+    """
+    return [
+        name for name, seconds in timings.items()
+        if name in baseline and seconds > baseline[name] * (1 + threshold) and seconds - baseline[name] > min_delta
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2_000, help="Bars of synthetic history")
+    parser.add_argument("--epochs", type=int, default=3, help="Epochs timed for the training throughput")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--requests", type=int, default=20, help="Requests per repeat of the app benchmarks")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown as a fraction, 0.25 = 25%%")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Record this run as the new baseline")
+    parser.add_argument("--require-baseline", action="store_true",
+                        help="Exit with an error instead of recording a baseline when there is none")
+    args = parser.parse_args()
+
+    settings = {"rows": args.rows, "epochs": args.epochs}
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else None
+    if baseline is None and args.require_baseline and not args.save_baseline:
+        sys.exit(f"No baseline at {args.baseline}. Restore it, or record one with --save-baseline.")
+    if baseline is not None and not args.save_baseline and baseline["settings"] != settings:
+        sys.exit(f"The baseline was recorded with {baseline['settings']}, not {settings}. "
+                 f"Run with the same settings or record a new baseline with --save-baseline.")
+
+    refuse_network()
+    timings, extra = run_benchmarks(args)
+
+    baseline_timings = baseline["results"] if baseline is not None and not args.save_baseline else {}
+    if baseline is not None and not args.save_baseline and baseline["environment"] != environment():
+        print(f"Warning: the baseline was recorded on {baseline['environment']}, this is {environment()}\n")
+    regressions = find_regressions(timings, baseline_timings, args.threshold)
+
+    print(f"{'benchmark':>20} {'baseline ms':>12} {'current ms':>11} {'change':>8}")
+    for name, seconds in timings.items():
+        if name in baseline_timings:
+            change = f"{(seconds / baseline_timings[name] - 1) * 100:+7.1f}%"
+            print(f"{name:>20} {baseline_timings[name] * 1000:>12.2f} {seconds * 1000:>11.2f} {change:>8}"
+                  f"{'  REGRESSION' if name in regressions else ''}")
+        else:
+            print(f"{name:>20} {'-':>12} {seconds * 1000:>11.2f} {'-':>8}")
+    for name, value in extra.items():
+        print(f"{name:>20} {value:>33.0f}")
+
+    if baseline is None or args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps({
+            "recorded_at": datetime.now().isoformat(timespec="seconds"),
+            "settings": settings,
+            "environment": environment(),
+            "results": timings,
+        }, indent=2))
+        print(f"\nBaseline saved to {args.baseline}")
+    elif regressions:
+        print(f"\n{len(regressions)} benchmark(s) more than {args.threshold:.0%} slower than the baseline: "
+              f"{', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,40 @@
 from src.finance_ml import logger
-from finance_ml.pipeline.stage_01_LLMticker import TickerFinderPipeline
-from finance_ml.pipeline.stage_02_data_ingestion import DataIngestionTrainingPipeline
-from finance_ml.pipeline.stage_03_data_validation import DataValidationTrainingPipeline
-from finance_ml.pipeline.stage_04_data_transformation import DataTransformationTrainingPipeline
-from finance_ml.pipeline.stage_05_model_training import ModelTrainingPipeline
-from finance_ml.pipeline.stage_06_model_evaluation import ModelEvaluationPipeline
-from finance_ml.pipeline.stage_07_model_prediction import ModelPredictionPipeline
+from finance_ml.pipeline.pipeline_runner import run_pipeline_stages
+from finance_ml.pipeline.stage_registry import SELECTABLE_STAGES
 import argparse
 
+def write_import_report(path='artifacts/import_report.json'):
+    """Measures how long main.py and every stage module take to import, in fresh interpreters."""
+    import json
+    from pathlib import Path
+    from finance_ml.pipeline.stage_registry import STAGES
+    from finance_ml.utils.import_report import import_time_report, format_import_report
+
+    modules = ['finance_ml.pipeline.pipeline_runner'] + [stage.module for stage in STAGES]
+    report = import_time_report(modules)
+    print(format_import_report(report))
+
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=4)
+    logger.info(f"Import time report saved at: {path}")
+    return report
+
 def run_pipeline():
     parser = argparse.ArgumentParser(description='Run FinSight ML Pipeline')
     parser.add_argument('--choice', type=str, help='Choice of operation: 1 for manual, 2 for LLM')
     parser.add_argument('--ticker', type=str, help='Stock ticker symbol for manual choice')
+    parser.add_argument('--force', action='store_true', help='Run every stage even if its cached outputs are up to date')
+    parser.add_argument('--stages', type=str, default='all',
+                        help=f"Comma separated stages to run, from: {','.join(SELECTABLE_STAGES)} (default: all). "
+                             "Skipped stages' outputs are taken from the ticker's latest run")
+    parser.add_argument('--import-report', action='store_true',
+                        help='Print how long each stage module takes to import, save it to artifacts/import_report.json and exit')
     args = parser.parse_args()
 
+    if args.import_report:
+        return write_import_report()
+
     choice = args.choice
     ticker_symbol = args.ticker
 
@@ -21,88 +42,7 @@ def run_pipeline():
     if choice is None:
         choice = input("Select ticker source:\n1. Enter manually\n2. Use LLM agent\nEnter 1 or 2: ").strip()
 
-
-
-    STAGE_NAME = "Ticker Finder Stage"
-    try:
-        logger.info(f">>>>>> {STAGE_NAME} started <<<<<<")
-        ticker_pipeline = TickerFinderPipeline()
-        if choice == '1':
-            if ticker_symbol is None:
-                ticker = ticker_pipeline.main(choice=choice)
-            else:
-                ticker = ticker_pipeline.main(choice=choice, ticker=ticker_symbol)
-        else:
-            ticker = ticker_pipeline.main(choice=choice)
-        logger.info(f">>>>>> {STAGE_NAME} completed <<<<<<\n\nx==========x")
-    except Exception as e:
-        logger.exception(e)
-        raise e
-
-
-    STAGE_NAME = "Data Ingestion Stage"
-    try:
-        logger.info(f"\n\n>>>>> {STAGE_NAME} started <<<<<")
-        ingestion = DataIngestionTrainingPipeline(ticker=ticker)
-        ingestion.main()
-        logger.info(f">>>>> {STAGE_NAME} completed <<<<<\n\nx==========x")
-    except Exception as e:
-        logger.exception(e)
-        raise e
-
-    STAGE_NAME = "Data Validation stage"
-    try:
-        logger.info(f">>>>>>  {STAGE_NAME} started <<<<<<")
-        obj = DataValidationTrainingPipeline()
-        obj.main()
-        logger.info(f">>>>>>  {STAGE_NAME} completed <<<<<<\n\nx==========x")
-    except Exception as e:
-        logger.exception(e)
-        raise e
-
-
-    STAGE_NAME = "Data Transformation stage"
-    try:
-        logger.info(f">>>>>>  {STAGE_NAME} started <<<<<<")
-        obj = DataTransformationTrainingPipeline()
-        obj.main()
-        logger.info(f">>>>>>  {STAGE_NAME} completed <<<<<<\n\nx==========x")
-    except Exception as e:
-        logger.exception(e)
-        raise e
-
-
-    STAGE_NAME = "Model Training stage"
-    try:
-        logger.info(f">>>>>>  {STAGE_NAME} started <<<<<<")
-        obj = ModelTrainingPipeline()
-        obj.main()
-        logger.info(f">>>>>>  {STAGE_NAME} completed <<<<<<\n\nx==========x")
-    except Exception as e:
-        logger.exception(e)
-        raise e
-
-
-    STAGE_NAME= "Model Evaluation stage"
-    try:
-        logger.info(f'>>>>>>>>>  {STAGE_NAME} started <<<<<<<<<')
-        obj = ModelEvaluationPipeline()
-        obj.main()
-        logger.info(f'>>>>>>>>>  {STAGE_NAME} Completed <<<<<<<<<\n\nx==========x')
-    except Exception as e:
-        logger.exception(e)
-        raise e
-
-
-    STAGE_NAME = "Final Prediction stage"
-    try:
-        logger.info(f">>>>>>  {STAGE_NAME} started <<<<<<")
-        obj = ModelPredictionPipeline()
-        obj.main()
-        logger.info(f">>>>>>  {STAGE_NAME} completed <<<<<<\n\nx==========x")
-    except Exception as e:
-        logger.exception(e)
-        raise e
+    return run_pipeline_stages(choice, ticker_symbol, force=args.force, stages=args.stages)
 
 if __name__ == '__main__':
-    run_pipeline()
\ No newline at end of file
+    run_pipeline()
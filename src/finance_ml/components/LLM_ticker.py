@@ -1,82 +1,234 @@
-from phi.agent import Agent
-from phi.model.groq import Groq
-from phi.model.openai import OpenAIChat
-from phi.tools.yfinance import YFinanceTools
-from phi.tools.googlesearch import GoogleSearch
-from phi.tools.duckduckgo import DuckDuckGo
+import json
+import os
+import random
 import re
+import threading
 import time
-import yfinance as yf
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
 
-from datetime import datetime
 from src.finance_ml import logger
 from src.finance_ml.utils.exceptions import AgentExecutionError
 from src.finance_ml.utils.encoding import ensure_utf8_console
+from finance_ml.components.ticker_resolver import get_ticker_resolver
 
 ensure_utf8_console()
 
-today = datetime.now().strftime("%B %d, %Y")
+# NSE trades on Indian Standard Time, which has no daylight saving
+IST = timezone(timedelta(hours=5, minutes=30))
 
-try:
-    web_agent = Agent(
-        name="WebAgent",
-        role="Market research expert",
-        model=OpenAIChat(id="gpt-4o"),   #Groq(id="meta-llama/llama-4-scout-17b-16e-instruct"),
-        tools=[GoogleSearch(), DuckDuckGo()],
-        instructions=[
-            f"You are a web analyst. Search current news (as of {today}) to identify Indian stocks showing bullish trends today. Focus on companies with positive momentum, news, or sentiment. Return the NSE ticker (ending with .NS) of the most bullish stock you find, and mention it in your answer."
-        ],
-        show_tools_calls=True,
-        markdown=False,
-    )
-
-    finance_agent = Agent(
-        name="FinanceAnalyst",
-        role="Finance analyst expert",
-        model=OpenAIChat(id="gpt-4o"),
-        tools=[
-            YFinanceTools(
-                company_news=True,
-                technical_indicators=True,
-                historical_prices=True,
-                analyst_recommendations=True,
-                stock_price=True,
-                income_statements=True,
-                key_financial_ratios=True,
-                company_info=True
-            )
-        ],
-        instructions=[
-            f"You are a financial analyst. Study financial data for stocks considered bullish today ({today}) and select the single most promising Indian stock for intraday or short-term trading. Return the NSE ticker (ending with .NS) in your answer."
-        ],
-        show_tools_calls=True,
-        markdown=False,
-    )
-
-    finsight_agent = Agent(
-        team=[web_agent, finance_agent],
-        model=OpenAIChat(id="gpt-4o"),
-        tools=[YFinanceTools()],
-        instructions=[
-            f"Based on your team's research as of {today}, provide the NSE ticker (ending with .NS) of the most bullish Indian stock for today. You may include a brief explanation, but make sure the ticker is present in your answer. Do not suggest BSE or delisted stocks."
-        ],
-        show_tools_calls=True,
-        markdown=False,
-    )
-
-except Exception as e:
-    logger.error("Error while initializing agents", exc_info=True)
-    raise AgentExecutionError("Failed to initialize one or more agents.") from e
+# List of default tickers to use when LLM fails (for testing/fallback)
+FALLBACK_TICKERS = [
+    "RELIANCE.NS",  # Reliance Industries
+    "TCS.NS",       # Tata Consultancy Services
+    "INFY.NS",      # Infosys
+    "HDFCBANK.NS",  # HDFC Bank
+    "ITC.NS"        # ITC Limited
+]
 
 
-def is_valid_ticker(ticker):
+def build_phi_agent(today):
+    """Builds the phi agent team. phi and the model clients are only imported here, on first use."""
     try:
-        data = yf.download(ticker, period="1d", interval="1d")
-        return not data.empty
-    except Exception:
+        from phi.agent import Agent
+        from phi.model.groq import Groq
+        from phi.model.openai import OpenAIChat
+        from phi.tools.yfinance import YFinanceTools
+        from phi.tools.googlesearch import GoogleSearch
+        from phi.tools.duckduckgo import DuckDuckGo
+
+        web_agent = Agent(
+            name="WebAgent",
+            role="Market research expert",
+            model=OpenAIChat(id="gpt-4o"),   #Groq(id="meta-llama/llama-4-scout-17b-16e-instruct"),
+            tools=[GoogleSearch(), DuckDuckGo()],
+            instructions=[
+                f"You are a web analyst. Search current news (as of {today}) to identify Indian stocks showing bullish trends today. Focus on companies with positive momentum, news, or sentiment. Return the NSE ticker (ending with .NS) of the most bullish stock you find, and mention it in your answer."
+            ],
+            show_tools_calls=True,
+            markdown=False,
+        )
+
+        finance_agent = Agent(
+            name="FinanceAnalyst",
+            role="Finance analyst expert",
+            model=OpenAIChat(id="gpt-4o"),
+            tools=[
+                YFinanceTools(
+                    company_news=True,
+                    technical_indicators=True,
+                    historical_prices=True,
+                    analyst_recommendations=True,
+                    stock_price=True,
+                    income_statements=True,
+                    key_financial_ratios=True,
+                    company_info=True
+                )
+            ],
+            instructions=[
+                f"You are a financial analyst. Study financial data for stocks considered bullish today ({today}) and select the single most promising Indian stock for intraday or short-term trading. Return the NSE ticker (ending with .NS) in your answer."
+            ],
+            show_tools_calls=True,
+            markdown=False,
+        )
+
+        finsight_agent = Agent(
+            team=[web_agent, finance_agent],
+            model=OpenAIChat(id="gpt-4o"),
+            tools=[YFinanceTools()],
+            instructions=[
+                f"Based on your team's research as of {today}, provide the NSE ticker (ending with .NS) of the most bullish Indian stock for today. You may include a brief explanation, but make sure the ticker is present in your answer. Do not suggest BSE or delisted stocks."
+            ],
+            show_tools_calls=True,
+            markdown=False,
+        )
+
+        return finsight_agent
+
+    except Exception as e:
+        logger.error("Error while initializing agents", exc_info=True)
+        raise AgentExecutionError("Failed to initialize one or more agents.") from e
+
+
+class StubAgent:
+    """Local stand-in for the agent team that answers with a fixed ticker, for tests and offline runs."""
+
+    def __init__(self, ticker="RELIANCE.NS"):
+        self.ticker = ticker
+        self.calls = 0
+
+    def run(self, *args, **kwargs):
+        self.calls += 1
+        return SimpleNamespace(content=f"The most bullish NSE stock today is {self.ticker}.")
+
+
+# Factories taking today's date string and returning an agent whose run() response has .content
+AGENT_BACKENDS = {
+    "phi": build_phi_agent,
+    "stub": lambda today: StubAgent(),
+}
+
+
+def register_agent_backend(name, factory):
+    AGENT_BACKENDS[name] = factory
+
+
+_agents = {}
+_agents_lock = threading.Lock()
+
+
+def get_agent(backend="phi", day=None):
+    """Returns the agent of a backend, building it on first use and again when the date in its instructions is stale."""
+    day = day or trading_day()
+    with _agents_lock:
+        cached = _agents.get(backend)
+        if cached is None or cached[0] != day:
+            if backend not in AGENT_BACKENDS:
+                raise AgentExecutionError(f"Unknown agent backend: {backend}")
+            logger.info(f"Building '{backend}' agent for {day}")
+            _agents[backend] = (day, AGENT_BACKENDS[backend](day.strftime("%B %d, %Y")))
+        return _agents[backend][1]
+
+
+def trading_day(now=None):
+    """The NSE trading day a moment belongs to. Weekends belong to the preceding Friday."""
+    now = now or datetime.now(IST)
+    day = now.astimezone(IST).date() if now.tzinfo else now.date()
+    if day.weekday() >= 5:
+        day -= timedelta(days=day.weekday() - 4)
+    return day
+
+
+def _try_lock(fd) -> bool:
+    """Takes an exclusive lock on an open file without waiting. Returns False if another process holds it.
+
+    The operating system drops the lock when its process exits, so a crash never leaves it held.
+    """
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        return True
+    except (BlockingIOError, PermissionError):
         return False
 
 
+def _unlock(fd):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+class DailyPickCache:
+    """Remembers the ticker picked by the agents for a trading day, shared by every process through a JSON file."""
+
+    def __init__(self, cache_file, ttl_hours=12):
+        self.cache_file = Path(cache_file)
+        self.ttl = ttl_hours * 3600
+        self.lock_path = self.cache_file.with_name(self.cache_file.name + ".lock")
+        self._lock_fd = None
+
+    def get(self, day):
+        """Returns the pick of a trading day, or None if there is none or it is older than the TTL."""
+        try:
+            with open(self.cache_file) as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if entry.get("trading_day") != day.isoformat() or time.time() - entry.get("picked_at", 0) > self.ttl:
+            return None
+        return entry.get("ticker")
+
+    def set(self, day, ticker):
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_file.with_name(f".{self.cache_file.name}.{uuid.uuid4().hex[:8]}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"trading_day": day.isoformat(), "ticker": ticker, "picked_at": time.time()}, f)
+        os.replace(tmp_path, self.cache_file)
+
+    def acquire(self, timeout=1800, poll_seconds=1):
+        """Takes the cross-process pick lock, so concurrent jobs wait for one agent run instead of starting their own.
+
+        The lock is an flock (msvcrt.locking on Windows) on the lock file, which the operating system
+        drops when its holder exits, so a crashed process never leaves a stale lock behind. Returns
+        False if the lock is still held after timeout, the caller then goes ahead without it.
+        """
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.lock_path, os.O_CREAT | os.O_WRONLY)
+        deadline = time.monotonic() + timeout
+        while not _try_lock(fd):
+            if time.monotonic() >= deadline:
+                os.close(fd)
+                logger.warning(f"Pick lock {self.lock_path} still held after {timeout}s, picking without it")
+                return False
+            time.sleep(poll_seconds)
+        self._lock_fd = fd
+        return True
+
+    def release(self):
+        # The lock file stays, removing it would let a waiter lock a file that is already replaced
+        if self._lock_fd is not None:
+            _unlock(self._lock_fd)
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+
+def is_valid_ticker(ticker):
+    """Checks a ticker against the NSE listing and the validation cache before downloading anything."""
+    return get_ticker_resolver().is_valid(ticker)
+
+
 def extract_ticker(text):
     """Extract the first valid NSE ticker (ending with .NS) from any text."""
     matches = re.findall(r"\b[A-Z0-9]{2,8}\.NS\b", text.upper())
@@ -87,36 +239,62 @@ def extract_ticker(text):
     return None
 
 
-def get_bullish_ticker(max_retries=3, delay=5):
-    # List of default tickers to use when LLM fails (for testing/fallback)
-    fallback_tickers = [
-        "RELIANCE.NS",  # Reliance Industries
-        "TCS.NS",       # Tata Consultancy Services
-        "INFY.NS",      # Infosys
-        "HDFCBANK.NS",  # HDFC Bank
-        "ITC.NS"        # ITC Limited
-    ]
-    
+def _ask_agent(agent, max_retries, delay):
+    """Runs the agent until it names a valid ticker. Returns None if every attempt fails."""
+    for attempt in range(1, max_retries + 1):
+        try:
+            logger.info(f"Running Finsight Agent to get bullish ticker... (Attempt {attempt})")
+            result = agent.run()
+            logger.info(f"Raw LLM output: {result.content}")
+            ticker = extract_ticker(result.content)
+            if ticker and is_valid_ticker(ticker):
+                logger.info(f"Top bullish stock ticker identified: {ticker}")
+                return ticker
+            logger.warning(f"No valid ticker found in agent response. Retrying...")
+        except Exception as e:
+            logger.error(f"Agent execution failed on attempt {attempt}: {e}", exc_info=True)
+        if attempt < max_retries:
+            logger.info(f"Retrying in {delay} seconds...")
+            time.sleep(delay)
+    return None
+
+
+def get_bullish_ticker(max_retries=None, delay=None, config=None):
+    """Returns today's most bullish NSE ticker according to the agent team.
+
+    The pick is cached per trading day, so only the first request of the day
+    runs the agents. Fallback tickers are not cached, the next request tries
+    the agents again.
+    """
     try:
-        for attempt in range(1, max_retries + 1):
+        if config is None:
+            from finance_ml.config.configuration import ConfigurationManager
+            config = ConfigurationManager().get_llm_ticker_config()
+        max_retries = max_retries or config.max_retries
+        delay = config.retry_delay_seconds if delay is None else delay
+
+        day = trading_day()
+        cache = DailyPickCache(config.pick_cache_file, ttl_hours=config.pick_ttl_hours)
+        ticker = cache.get(day)
+        if ticker is None:
+            cache.acquire()
             try:
-                logger.info(f"Running Finsight Agent to get bullish ticker... (Attempt {attempt})")
-                result = finsight_agent.run()
-                logger.info(f"Raw LLM output: {result.content}")
-                ticker = extract_ticker(result.content)
-                if ticker and is_valid_ticker(ticker):
-                    logger.info(f"Top bullish stock ticker identified: {ticker}")
-                    return ticker
-                logger.warning(f"No valid ticker found in agent response. Retrying...")
-            except Exception as e:
-                logger.error(f"Agent execution failed on attempt {attempt}: {e}", exc_info=True)
-            if attempt < max_retries:
-                logger.info(f"Retrying in {delay} seconds...")
-                time.sleep(delay)
+                # Another process may have picked while we waited for the lock
+                ticker = cache.get(day)
+                if ticker is None:
+                    ticker = _ask_agent(get_agent(config.backend, day), max_retries, delay)
+                    if ticker is not None:
+                        cache.set(day, ticker)
+            finally:
+                cache.release()
+        else:
+            logger.info(f"Using the bullish ticker already picked for {day}: {ticker}")
+
+        if ticker is not None:
+            return ticker
     
         # If all attempts fail, use a fallback ticker
-        import random
-        fallback_ticker = random.choice(fallback_tickers)
+        fallback_ticker = random.choice(FALLBACK_TICKERS)
         logger.warning(f"LLM selection failed, using fallback ticker: {fallback_ticker}")
         return fallback_ticker
 
@@ -124,5 +302,3 @@ def get_bullish_ticker(max_retries=3, delay=5):
         logger.error("Critical error in get_bullish_ticker", exc_info=True)
         # Return a safe default ticker if everything fails
         return "RELIANCE.NS"
-
-
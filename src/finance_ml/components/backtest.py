@@ -0,0 +1,136 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from finance_ml.entity.config_entity import ModelTrainingParams
+from finance_ml.utils.windowing import create_sequences
+
+TRADING_DAYS_PER_YEAR = 252
+
+
+def walk_forward_folds(n_rows, lookback, n_folds, test_size, train_window=0) -> list:
+    """Row ranges of the walk-forward folds, oldest first.
+
+    The last n_folds * test_size rows are cut into consecutive test blocks. Each
+    fold trains on the rows before its test block: all of them, or only the last
+    train_window rows if train_window is set.
+
+    Raises:
+        ValueError: if the first fold would have no more training rows than lookback
+
+    Returns:
+        list: (train_start, test_start, test_end) per fold
+    """
+    first_test = n_rows - n_folds * test_size
+    if min(first_test, train_window or first_test) <= lookback:
+        raise ValueError(f"{n_rows} rows are not enough for {n_folds} folds of {test_size} rows with a lookback of {lookback}")
+
+    folds = []
+    for fold in range(n_folds):
+        test_start = first_test + fold * test_size
+        train_start = max(0, test_start - train_window) if train_window else 0
+        folds.append((train_start, test_start, test_start + test_size))
+    return folds
+
+
+def regression_metrics(y_true, y_pred) -> dict:
+    """The metrics of ModelEvaluation.evaluate, computed on whole arrays."""
+    y_true, y_pred = np.asarray(y_true, dtype=np.float64), np.asarray(y_pred, dtype=np.float64)
+    errors = y_pred - y_true
+    non_zero = y_true != 0
+    mape = np.mean(np.abs(errors[non_zero] / y_true[non_zero])) * 100
+    return {
+        "mae_in_rupees": float(np.mean(np.abs(errors))),
+        "rmse_in_rupees": float(np.sqrt(np.mean(errors ** 2))),
+        "mape_percentage": float(mape),
+        "accuracy_percentage": float(100 - mape),
+        "directional_accuracy_percentage": float(np.mean(np.sign(np.diff(y_true)) == np.sign(np.diff(y_pred))) * 100),
+    }
+
+
+def strategy_metrics(y_true, y_pred, previous_close, cost_bps=0.0) -> dict:
+    """Long/flat strategy: hold the stock for a day whenever the model predicts a close above the previous one.
+
+    Every change of position pays cost_bps basis points.
+    """
+    y_true, y_pred = np.asarray(y_true, dtype=np.float64), np.asarray(y_pred, dtype=np.float64)
+    previous_close = np.asarray(previous_close, dtype=np.float64)
+
+    daily_returns = y_true / previous_close - 1
+    position = (y_pred > previous_close).astype(np.float64)
+    trades = np.abs(np.diff(position, prepend=0.0))
+    pnl = position * daily_returns - trades * cost_bps / 10_000
+
+    equity = np.cumprod(1 + pnl)
+    drawdown = 1 - equity / np.maximum.accumulate(equity)
+    volatility = pnl.std()
+    return {
+        "strategy_return_percentage": float((equity[-1] - 1) * 100),
+        "buy_and_hold_return_percentage": float((y_true[-1] / previous_close[0] - 1) * 100),
+        "sharpe_ratio": float(pnl.mean() / volatility * np.sqrt(TRADING_DAYS_PER_YEAR)) if volatility > 0 else 0.0,
+        "max_drawdown_percentage": float(drawdown.max() * 100),
+        "hit_rate_percentage": float(np.mean(np.sign(y_pred - previous_close) == np.sign(daily_returns)) * 100),
+        "trades": int(trades.sum()),
+        "days_in_market": int(position.sum()),
+    }
+
+
+def fold_windows(values, train_start, test_start, test_end, lookback) -> tuple:
+    """Training and test windows of a fold, standardized with statistics of the fold's training rows only.
+
+    Returns:
+        tuple: X_train, y_train, X_test, y_test (scaled), and the mean and scale of the target column
+    """
+    train = values[train_start:test_start]
+    mean = train.mean(axis=0)
+    scale = train.std(axis=0)
+    scale[scale == 0] = 1.0
+    scaled = (values - mean) / scale
+
+    X_train, y_train = create_sequences(scaled[train_start:test_start], lookback)
+    X_test, y_test = create_sequences(scaled[test_start - lookback:test_end], lookback)
+    return X_train, y_train, X_test, y_test, mean[0], scale[0]
+
+
+@dataclass(frozen=True)
+class FoldJob:
+    """Training and scoring of one fold, run by run_fold in a worker process."""
+    fold: int
+    values: np.ndarray # (rows, features) prices of the whole backtest, first feature is the target
+    train_start: int
+    test_start: int
+    test_end: int
+    lookback: int
+    params: ModelTrainingParams
+    checkpoint_path: str
+    init_model_path: str = None # Refit: continue training this fold's predecessor instead of a new model
+
+
+def run_fold(job: FoldJob) -> dict:
+    """Trains the fold's model and predicts every test window in one batched call.
+
+    Returns:
+        dict: fold, y_true, y_pred and previous_close in rupees, as arrays over the fold's test rows
+    """
+    from tensorflow import keras
+    from finance_ml.components.model_training import build_model
+    from finance_ml.components.training_input import configure_tensorflow, make_dataset
+
+    configure_tensorflow(job.params)
+    X_train, y_train, X_test, _, target_mean, target_scale = fold_windows(
+        job.values, job.train_start, job.test_start, job.test_end, job.lookback)
+
+    if job.init_model_path:
+        model = keras.models.load_model(job.init_model_path)
+    else:
+        model = build_model(job.params, input_shape=X_train.shape[1:])
+    model.fit(make_dataset(X_train, y_train, job.params), epochs=job.params.epochs, verbose=0)
+    model.save(job.checkpoint_path)
+
+    y_pred_scaled = np.asarray(model.predict_on_batch(X_test.astype(np.float32)))[:, 0]
+    return {
+        "fold": job.fold,
+        "y_true": job.values[job.test_start:job.test_end, 0],
+        "y_pred": y_pred_scaled * target_scale + target_mean,
+        "previous_close": job.values[job.test_start - 1:job.test_end - 1, 0],
+    }
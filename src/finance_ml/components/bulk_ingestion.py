@@ -0,0 +1,110 @@
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from finance_ml import logger
+from finance_ml.components.data_providers import get_data_provider
+from finance_ml.components.ohlcv_store import OHLCVStore
+from finance_ml.entity.config_entity import BulkIngestionConfig
+from finance_ml.utils.exceptions import DownloadError
+
+
+class BulkDataIngestion:
+    """Brings the OHLCV store up to date for a whole watchlist in one pass.
+
+    Tickers that need the same download window (a full period backfill, or
+    the delta since the same last timestamp) are grouped into multi-symbol
+    requests of at most batch_size tickers. Groups are downloaded on a bounded
+    thread pool, the tickers whose download failed are retried with
+    exponential backoff, and each ticker is written to its own store partition.
+    """
+
+    def __init__(self, config: BulkIngestionConfig, provider=None):
+        self.config = config
+        self.provider = provider or get_data_provider(config.provider, config.local_data_dir)
+        self.store = OHLCVStore(config.store_dir)
+
+    def _plan_batches(self, tickers):
+        """Groups tickers by download window and splits the groups into batches."""
+        groups = defaultdict(list)
+        metas = {}
+        for ticker in tickers:
+            start, meta = self.store.plan_update(ticker, self.config.period, self.config.interval)
+            groups[start].append(ticker)
+            metas[ticker] = meta
+
+        batches = []
+        for start, group in groups.items():
+            for i in range(0, len(group), self.config.batch_size):
+                batches.append((start, group[i:i + self.config.batch_size]))
+        return batches, metas
+
+    def _download_batch(self, start, tickers) -> dict:
+        """Downloads one batch, retrying the tickers that failed with exponential backoff.
+
+        Raises:
+            DownloadError: if some tickers still failed after max_retries, with the frames of the others
+        """
+        frames = {}
+        pending = list(tickers)
+        for attempt in range(1, self.config.max_retries + 1):
+            try:
+                if start is None:
+                    frames.update(self.provider.fetch_many(pending, self.config.interval, period=self.config.period))
+                else:
+                    frames.update(self.provider.fetch_many(pending, self.config.interval, start=start))
+                return frames
+            except DownloadError as e:
+                frames.update(e.frames)
+                pending = e.failed
+                error = e
+            except Exception as e:
+                error = e
+            if attempt == self.config.max_retries:
+                raise DownloadError(pending, frames) from error
+            delay = self.config.backoff_seconds * 2 ** (attempt - 1)
+            logger.warning(f"Download of {len(pending)} tickers failed on attempt {attempt}: {error}. Retrying in {delay}s")
+            time.sleep(delay)
+
+    def ingest(self, tickers) -> dict:
+        """Updates the store for every ticker.
+
+        Returns:
+            dict: 'fetched' maps each updated ticker to its number of new bars,
+                  'missing' lists tickers without data and 'failed' the tickers
+                  whose batch still failed after all retries
+        """
+        tickers = list(dict.fromkeys(tickers)) # Drop duplicates, keep order
+        batches, metas = self._plan_batches(tickers)
+        logger.info(f"Bulk ingestion of {len(tickers)} tickers in {len(batches)} batches")
+
+        summary = {'fetched': {}, 'missing': [], 'failed': []}
+        with ThreadPoolExecutor(max_workers=self.config.max_workers) as executor:
+            futures = {
+                executor.submit(self._download_batch, start, batch): batch
+                for start, batch in batches
+            }
+            for future in as_completed(futures):
+                batch = futures[future]
+                try:
+                    frames = future.result()
+                except DownloadError as e:
+                    logger.error(f"Giving up on {len(e.failed)} of a batch of {len(batch)} tickers: {e}")
+                    summary['failed'].extend(e.failed)
+                    frames = e.frames
+
+                for ticker in batch:
+                    if ticker in summary['failed']:
+                        continue
+                    df = frames.get(ticker)
+                    if df is None or df.empty:
+                        summary['missing'].append(ticker)
+                        continue
+                    self.store.append(ticker, self.config.interval, df, meta=metas[ticker])
+                    summary['fetched'][ticker] = len(df)
+
+        logger.info(
+            f"Bulk ingestion done: {len(summary['fetched'])} updated, "
+            f"{len(summary['missing'])} without data, {len(summary['failed'])} failed"
+        )
+        return summary
@@ -1,39 +1,37 @@
-import yfinance as yf
-import pandas as pd
+from finance_ml.components.data_providers import get_data_provider
+from finance_ml.components.ohlcv_store import OHLCVStore
+from finance_ml.utils.columnar import write_frame
+from finance_ml.utils.common import create_directories
+from finance_ml.utils.handoff import Handoff
+from finance_ml.utils.spans import span
 
 class DataIngestion:
-    def __init__(self, config, ticker):
+    def __init__(self, config, ticker, provider=None, handoff: Handoff = None):
         self.config = config
+        self.handoff = handoff or Handoff()
         self.ticker = ticker
+        self.provider = provider or get_data_provider(config.provider, config.local_data_dir)
+        self.store = OHLCVStore(config.store_dir)
 
     def download_data(self):
-        df = yf.download(
-            tickers=self.ticker,
-            period=self.config.period,
-            interval=self.config.interval,
-            auto_adjust=True
-        )
+        # Only bars newer than the last stored timestamp are downloaded
+        with span("download", ticker=self.ticker, provider=self.config.provider) as record:
+            record["bars"] = self.store.update(self.ticker, self.provider, self.config.period, self.config.interval)
+
+        df = self.store.read(self.ticker, self.config.interval, period=self.config.period)
         if df.empty:
             print(f"No data for {self.ticker}")
             return df
-        
-        df = df.reset_index()
-
-
-        print("Columns after reset_index:", df.columns.tolist())
-        print("First 5 rows:\n", df.head())
-
 
         df['Ticker'] = self.ticker
-        df.columns = df.columns.droplevel(level=1)
-
-        # Rename 'Date' to 'Datetime' to match your expected column names
-        df = df.rename(columns={'Date': 'Datetime'})
-
-        print("Columns after renaming:", df.columns.tolist())
-
         df = df[['Ticker', 'Datetime', 'Open', 'High', 'Low', 'Close', 'Volume']]
 
-        df.to_csv(self.config.raw_data_file, index=False)
+        # The run keeps its own snapshot of the store, so later appends by
+        # other runs do not change the data this run trains on. It is written
+        # once as Parquet with the schema.yaml types, later stages read only
+        # the columns they need instead of parsing text again
+        create_directories([self.config.root_dir])
+        write_frame(df, self.config.raw_data_file, self.config.all_schemas)
+        self.handoff.put(self.config.raw_data_file, df)
         print(f"Data saved to {self.config.raw_data_file}")
-        return df
\ No newline at end of file
+        return df
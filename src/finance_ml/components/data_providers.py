@@ -0,0 +1,204 @@
+import warnings
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+import pandas as pd
+
+from finance_ml import logger
+from finance_ml.utils.exceptions import DownloadError
+
+OHLCV_COLUMNS = ['Datetime', 'Open', 'High', 'Low', 'Close', 'Volume']
+
+
+def period_start(end, period):
+    """Returns the first timestamp covered by a yfinance-style period ('5d', '6mo', '3y', 'ytd', 'max').
+
+    Returns None for 'max'.
+    """
+    end = pd.Timestamp(end)
+    if period == 'max':
+        return None
+    if period == 'ytd':
+        return end.normalize().replace(month=1, day=1)
+    if period.endswith('mo'):
+        return end - pd.DateOffset(months=int(period[:-2]))
+    if period.endswith('y'):
+        return end - pd.DateOffset(years=int(period[:-1]))
+    if period.endswith('wk'):
+        return end - pd.DateOffset(weeks=int(period[:-2]))
+    if period.endswith('d'):
+        return end - pd.DateOffset(days=int(period[:-1]))
+    raise ValueError(f"Unsupported period: {period}")
+
+
+def normalize_ohlcv(df: pd.DataFrame) -> pd.DataFrame:
+    """Brings a provider DataFrame to the OHLCV_COLUMNS layout, sorted by Datetime."""
+    if isinstance(df.columns, pd.MultiIndex):
+        # yfinance returns (Price, Ticker) columns; keep the price level
+        df = df.copy()
+        df.columns = df.columns.get_level_values(0)
+    if 'Datetime' not in df.columns:
+        df = df.reset_index()
+    df = df.rename(columns={'Date': 'Datetime', 'index': 'Datetime'})
+    df['Datetime'] = pd.to_datetime(df['Datetime'])
+    return df[OHLCV_COLUMNS].sort_values('Datetime').reset_index(drop=True)
+
+
+def split_multi_ticker_frame(df: pd.DataFrame, tickers) -> dict:
+    """Splits a grouped multi-symbol download into one OHLCV DataFrame per ticker.
+
+    yfinance returns (Price, Ticker) or, with group_by='ticker', (Ticker, Price)
+    MultiIndex columns; the ticker level is found by looking for the symbols.
+    Tickers without any bars are left out.
+    """
+    if df.empty:
+        return {}
+    if not isinstance(df.columns, pd.MultiIndex):
+        # A single-symbol download comes back with flat columns
+        return {tickers[0]: normalize_ohlcv(df).dropna(subset=['Close'])}
+
+    ticker_level = 0 if set(tickers) & set(df.columns.get_level_values(0)) else 1
+    available = set(df.columns.get_level_values(ticker_level))
+
+    frames = {}
+    for ticker in tickers:
+        if ticker not in available:
+            continue
+        ticker_df = df.xs(ticker, axis=1, level=ticker_level)
+        ticker_df = normalize_ohlcv(ticker_df).dropna(subset=['Close'])
+        if not ticker_df.empty:
+            ticker_df['Volume'] = ticker_df['Volume'].fillna(0).astype('int64')
+            frames[ticker] = ticker_df.reset_index(drop=True)
+    return frames
+
+
+def yfinance_history(ticker, interval, period=None, start=None) -> pd.DataFrame:
+    """Bars of one symbol from yfinance, with OHLCV_COLUMNS.
+
+    Returns an empty DataFrame if Yahoo has no data for the symbol. Unlike
+    yf.download, which logs failed requests and returns an empty frame,
+    network errors and rate limits are raised.
+    """
+    import yfinance as yf
+    from yfinance.exceptions import YFTickerMissingError
+
+    kwargs = {'start': start} if start is not None else {'period': period}
+    try:
+        with warnings.catch_warnings():
+            # raise_errors is deprecated in favour of a process-wide yfinance setting
+            warnings.simplefilter("ignore", DeprecationWarning)
+            df = yf.Ticker(ticker).history(interval=interval, auto_adjust=True, actions=False,
+                                           raise_errors=True, **kwargs)
+    except YFTickerMissingError:
+        return pd.DataFrame(columns=OHLCV_COLUMNS)
+    if df.empty:
+        return pd.DataFrame(columns=OHLCV_COLUMNS)
+    if interval[-1] not in ('m', 'h'):
+        # yf.download returns daily and longer bars without a time zone
+        df.index = df.index.tz_localize(None)
+    return normalize_ohlcv(df).dropna(subset=['Close'])
+
+
+class MarketDataProvider(ABC):
+    """Source of OHLCV bars.
+
+    fetch() returns a DataFrame with OHLCV_COLUMNS for one ticker, either for
+    the whole period or for every bar at or after start. fetch_many() does the
+    same for a group of tickers sharing the same window and returns a dict of
+    ticker -> DataFrame; providers that support grouped requests override it.
+    Tickers without data are left out. If some tickers could not be downloaded,
+    fetch_many() raises DownloadError listing them, so the caller can retry
+    those tickers only.
+    """
+
+    @abstractmethod
+    def fetch(self, ticker, interval, period=None, start=None) -> pd.DataFrame:
+        ...
+
+    def fetch_many(self, tickers, interval, period=None, start=None) -> dict:
+        frames = {}
+        for ticker in tickers:
+            df = self.fetch(ticker, interval, period=period, start=start)
+            if not df.empty:
+                frames[ticker] = df
+        return frames
+
+
+class YFinanceProvider(MarketDataProvider):
+    def fetch(self, ticker, interval, period=None, start=None) -> pd.DataFrame:
+        import yfinance as yf
+
+        kwargs = {'start': start} if start is not None else {'period': period}
+        df = yf.download(
+            tickers=ticker,
+            interval=interval,
+            auto_adjust=True,
+            progress=False,
+            **kwargs
+        )
+        if df.empty:
+            return pd.DataFrame(columns=OHLCV_COLUMNS)
+        return normalize_ohlcv(df)
+
+    def fetch_many(self, tickers, interval, period=None, start=None) -> dict:
+        import yfinance as yf
+
+        kwargs = {'start': start} if start is not None else {'period': period}
+        df = yf.download(
+            tickers=list(tickers),
+            interval=interval,
+            auto_adjust=True,
+            progress=False,
+            group_by='ticker',
+            threads=False, # Concurrency is handled by the caller's thread pool
+            **kwargs
+        )
+        frames = split_multi_ticker_frame(df, list(tickers))
+
+        # yf.download returns no bars both for unknown symbols and for failed requests,
+        # so the tickers it has no bars for are asked for again one at a time
+        failed = []
+        for ticker in tickers:
+            if ticker in frames:
+                continue
+            try:
+                ticker_df = yfinance_history(ticker, interval, period=period, start=start)
+            except Exception as e:
+                logger.warning(f"Download of {ticker} failed: {e}")
+                failed.append(ticker)
+                continue
+            if not ticker_df.empty:
+                frames[ticker] = ticker_df
+        if failed:
+            raise DownloadError(failed, frames)
+        return frames
+
+
+class LocalFileProvider(MarketDataProvider):
+    """Reads bars from <data_dir>/<ticker>.csv, for tests and offline runs."""
+
+    def __init__(self, data_dir):
+        self.data_dir = Path(data_dir)
+
+    def fetch(self, ticker, interval, period=None, start=None) -> pd.DataFrame:
+        path = self.data_dir / f"{ticker}.csv"
+        if not path.exists():
+            return pd.DataFrame(columns=OHLCV_COLUMNS)
+
+        df = normalize_ohlcv(pd.read_csv(path))
+        if start is not None:
+            df = df[df['Datetime'] >= pd.Timestamp(start)]
+        elif period is not None and not df.empty:
+            first = period_start(df['Datetime'].iloc[-1], period)
+            if first is not None:
+                df = df[df['Datetime'] >= first]
+        return df.reset_index(drop=True)
+
+
+def get_data_provider(name, local_data_dir=None) -> MarketDataProvider:
+    """Returns the provider configured in config.yaml ('yfinance' or 'local')."""
+    if name == 'yfinance':
+        return YFinanceProvider()
+    if name == 'local':
+        return LocalFileProvider(local_data_dir)
+    raise ValueError(f"Unknown market data provider: {name}")
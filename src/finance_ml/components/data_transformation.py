@@ -1,36 +1,41 @@
 from finance_ml.entity.config_entity import DataTransformationConfig
 from sklearn.preprocessing import StandardScaler
 import numpy as np
-import pandas as pd
 import os
 import traceback
 from joblib import dump # Import dump to save the scaler
 from finance_ml import logger
+from finance_ml.utils.columnar import read_frame
+from finance_ml.utils.common import create_directories
+from finance_ml.utils.handoff import Handoff
+from finance_ml.utils.spans import span
+from finance_ml.utils.windowing import create_sequences
 
 class DataTransformation:
-    def __init__(self, config: DataTransformationConfig):
+    def __init__(self, config: DataTransformationConfig, handoff: Handoff = None):
         self.config = config
+        self.handoff = handoff or Handoff()
 
-    def transform_and_save_data(self, feature="Close", lookback=None, split_ratio=0.95):
+    def transform_and_save_data(self, features=None, lookback=None, split_ratio=0.95):
         """
         Loads raw data, transforms it, and saves the transformed data and scaler.
 
         Args:
-            feature (str): The feature column to use for transformation (default 'close').
+            features (list): Feature columns to use, the first one is the prediction target (default from params.yaml).
             lookback (int): Number of previous time steps to use for prediction (default 60).
             split_ratio (float): Ratio for splitting data into training and testing sets (default 0.95).
         """
+        if features is None:
+            features = list(self.config.features)
         if lookback is None:
             lookback = self.config.lookback
             
         raw_data_path = self.config.raw_data_file
 
-        df = pd.read_csv(raw_data_path)
+        df = self.handoff.get(raw_data_path, lambda path: read_frame(path, columns=features))
         logger.info(f"Raw data loaded from: {raw_data_path}")
 
-        df['Datetime'] = pd.to_datetime(df['Datetime'])
-        data = df[[feature]].copy()
-        values = data.values
+        values = df[features].to_numpy(dtype=np.float64)
 
         scaler = StandardScaler()
         scaled_data = scaler.fit_transform(values)
@@ -47,40 +52,30 @@ class DataTransformation:
             logger.error("Training data is too short for sequence generation. Try using more historical data or reduce lookback.")
             return
 
-
-        def create_sequences(data):
-            X, y = [], []
-            for i in range(lookback, len(data)):
-                X.append(data[i - lookback:i, 0])
-                y.append(data[i, 0])
-            return np.array(X), np.array(y)
-
-        X_train, y_train = create_sequences(train_data)
-        X_test, y_test = create_sequences(test_data)
-
-        # Print/debug before reshape
-        print("X_train shape before reshape:", X_train.shape)
-
-        if X_train.ndim == 2:
-            X_train = X_train.reshape((X_train.shape[0], X_train.shape[1], 1))
-        else:
-            logger.warning("X_train already 3D or unexpected shape: skipping reshape or needs manual fix.")
-
-        if X_test.ndim == 2:
-            X_test = X_test.reshape((X_test.shape[0], X_test.shape[1], 1))
-        else:
-            logger.warning("X_test already 3D or unexpected shape: skipping reshape or needs manual fix.")
-
-
+        create_directories([self.config.root_dir])
         try:
-        # Save transformed data and scaler
-            np.save(os.path.join(self.config.root_dir, 'X_train.npy'), X_train)
+            # Windows are strided views on the scaled data and are written
+            # straight into memory-mapped .npy files, so X is never built in memory
+            with span("windowing", rows=len(scaled_data), lookback=lookback):
+                X_train, y_train = create_sequences(
+                    train_data, lookback, out_path=os.path.join(self.config.root_dir, 'X_train.npy'))
+                X_test, y_test = create_sequences(
+                    test_data, lookback, out_path=os.path.join(self.config.root_dir, 'X_test.npy'))
+            logger.info(f"X_train shape: {X_train.shape} | X_test shape: {X_test.shape}")
+
+            # Save targets and scaler
+            outputs = {
+                'X_train.npy': X_train, 'y_train.npy': y_train,
+                'X_test.npy': X_test, 'y_test.npy': y_test, 'scaler.joblib': scaler,
+            }
             np.save(os.path.join(self.config.root_dir, 'y_train.npy'), y_train)
-            np.save(os.path.join(self.config.root_dir, 'X_test.npy'), X_test)
             np.save(os.path.join(self.config.root_dir, 'y_test.npy'), y_test)
             dump(scaler, os.path.join(self.config.root_dir, 'scaler.joblib')) # Save the scaler
+            for name, value in outputs.items():
+                self.handoff.put(os.path.join(self.config.root_dir, name), value)
 
             logger.info("Transformed data and scaler saved.")
         except Exception as e:
             logger.error(f"Error saving transformed data: {e}")
-            logger.error(traceback.format_exc())
\ No newline at end of file
+            logger.error(traceback.format_exc())
+            raise
\ No newline at end of file
@@ -1,35 +1,174 @@
 import os
+from pathlib import Path
+
+import pandas as pd
+
 from finance_ml import logger
 from finance_ml.entity.config_entity import DataValidationConfig
-import pandas as pd
+from finance_ml.utils.columnar import column_names, iter_frames
+from finance_ml.utils.common import create_directories, load_json, save_json
+from finance_ml.utils.exceptions import DataValidationError
+
+# schema.yaml says 'object' for text columns, pandas 3 reads them as 'str'
+STRING_DTYPES = {"object", "str", "string"}
+PRICE_COLUMNS = ["Open", "High", "Low", "Close"]
+# Offending rows kept per check, so the report stays small for any file size
+MAX_EXAMPLES = 5
+
+# Checks that only produce a warning, every other failed check fails the validation
+WARNING_CHECKS = {"calendar_gaps"}
+
+
+def _dtype_matches(actual, expected) -> bool:
+    if expected in STRING_DTYPES:
+        return actual in STRING_DTYPES
+    if expected.startswith("datetime64"):
+        # Any unit or time zone; CSV files hold the timestamps as text, invalid_datetime checks those
+        return actual.startswith("datetime64") or actual in STRING_DTYPES
+    return actual == expected
+
 
 class DataValidation:
+    """Validates the raw data against schema.yaml and basic OHLCV sanity rules.
+
+    The header is checked first, then the file is read in chunks of
+    chunk_size rows, so memory does not grow with the file. The file is
+    Parquet, or CSV for runs from before the Parquet hand-off. Every check
+    runs on whole chunks at once. Checks that compare a row with the previous
+    one carry the last timestamp over from the previous chunk.
+    """
     def __init__(self, config: DataValidationConfig):
         self.config = config
 
+    def _new_checks(self) -> dict:
+        names = ["dtypes", "missing_values", "invalid_datetime", "non_positive_prices", "high_below_low",
+                 "duplicate_datetime", "non_monotonic_datetime", "calendar_gaps"]
+        return {name: {"severity": "warning" if name in WARNING_CHECKS else "error", "count": 0, "examples": []}
+                for name in names}
+
+    @staticmethod
+    def _record(check, count, examples):
+        check["count"] += int(count)
+        room = MAX_EXAMPLES - len(check["examples"])
+        if room > 0:
+            check["examples"].extend(examples[:room])
+
+    def _check_chunk(self, chunk, checks, last_timestamp):
+        """Runs every check on one chunk. Returns the chunk's last valid timestamp."""
+        schema = self.config.all_schemas
+
+        for column in chunk.columns:
+            actual = str(chunk[column].dtype)
+            # A chunk with missing values turns an int column into float, that is reported as missing values
+            if not _dtype_matches(actual, schema[column]) and not chunk[column].isna().any():
+                self._record(checks["dtypes"], 1, [f"{column}: {actual} (expected {schema[column]}) at row {chunk.index[0]}"])
+
+        missing = chunk.isna()
+        missing_rows = missing.any(axis=1)
+        self._record(checks["missing_values"], missing.to_numpy().sum(),
+                     [f"row {row}: {', '.join(missing.columns[missing.loc[row].to_numpy()])}" for row in chunk.index[missing_rows][:MAX_EXAMPLES]])
+
+        prices = [column for column in PRICE_COLUMNS if column in chunk.columns]
+        if prices:
+            non_positive = (chunk[prices] <= 0).any(axis=1)
+            self._record(checks["non_positive_prices"], non_positive.sum(),
+                         [f"row {row}" for row in chunk.index[non_positive][:MAX_EXAMPLES]])
+        if "High" in chunk.columns and "Low" in chunk.columns:
+            inverted = chunk["High"] < chunk["Low"]
+            self._record(checks["high_below_low"], inverted.sum(),
+                         [f"row {row}: High {chunk.at[row, 'High']} < Low {chunk.at[row, 'Low']}"
+                          for row in chunk.index[inverted][:MAX_EXAMPLES]])
+
+        if "Datetime" not in chunk.columns:
+            return last_timestamp
+        timestamps = pd.to_datetime(chunk["Datetime"], errors="coerce", utc=True, format="mixed")
+        invalid = timestamps.isna() & chunk["Datetime"].notna()
+        self._record(checks["invalid_datetime"], invalid.sum(),
+                     [f"row {row}: {chunk.at[row, 'Datetime']}" for row in chunk.index[invalid][:MAX_EXAMPLES]])
+
+        timestamps = timestamps.dropna()
+        if timestamps.empty:
+            return last_timestamp
+        previous = timestamps.shift(1)
+        if last_timestamp is not None:
+            previous.iloc[0] = last_timestamp
+        steps = timestamps - previous
+
+        for name, mask in [("duplicate_datetime", steps == pd.Timedelta(0)),
+                           ("non_monotonic_datetime", steps < pd.Timedelta(0))]:
+            self._record(checks[name], mask.sum(),
+                         [f"row {row}: {timestamps[row]} after {previous[row]}" for row in timestamps.index[mask][:MAX_EXAMPLES]])
+        gaps = steps > pd.Timedelta(days=self.config.max_gap_days)
+        self._record(checks["calendar_gaps"], gaps.sum(),
+                     [f"row {row}: {steps[row].days} days after {previous[row].date()}" for row in timestamps.index[gaps][:MAX_EXAMPLES]])
+        return timestamps.iloc[-1]
+
+    def validate(self) -> dict:
+        """Validates the data and writes the JSON report and the status file.
+
+        Returns:
+            dict: the report, 'status' is False if a column is missing or an error check failed
+        """
+        schema = self.config.all_schemas
+        header = column_names(self.config.data)
+        missing_columns = [column for column in schema if column not in header]
+        unexpected_columns = [column for column in header if column not in schema]
+
+        checks = self._new_checks()
+        rows = 0
+        last_timestamp = None
+        usecols = [column for column in header if column in schema]
+        for chunk in iter_frames(self.config.data, self.config.chunk_size, columns=usecols):
+            rows += len(chunk)
+            last_timestamp = self._check_chunk(chunk, checks, last_timestamp)
+
+        failed = [name for name, check in checks.items() if check["count"] and check["severity"] == "error"]
+        warnings = [name for name, check in checks.items() if check["count"] and check["severity"] == "warning"]
+        status = not missing_columns and not failed and rows > 0
+        report = {
+            "status": status,
+            "data": str(self.config.data),
+            "rows": rows,
+            "missing_columns": missing_columns,
+            "unexpected_columns": unexpected_columns,
+            "failed_checks": failed,
+            "warnings": warnings,
+            "checks": checks,
+        }
+
+        create_directories([Path(self.config.STATUS_FILE).parent, Path(self.config.REPORT_FILE).parent])
+        with open(self.config.STATUS_FILE, 'w') as f:
+            f.write(f"Validation status: {status}")
+        save_json(path=Path(self.config.REPORT_FILE), data=report)
+
+        if status:
+            logger.info(f"Validated {rows} rows of {self.config.data}" + (f", warnings: {warnings}" if warnings else ""))
+        else:
+            logger.warning(f"Validation of {self.config.data} failed: {describe_failures(report)}")
+        return report
+
     def validate_all_columns(self) -> bool:
-        try:
-            validation_status = True
-            data = pd.read_csv(self.config.data)
-            all_cols = list(data.columns)
-            all_schema = self.config.all_schemas
-
-            for col in all_schema:
-                if col not in all_cols: 
-                    validation_status = False
-                    break
-
-         
-            for col, expected_type in all_schema.items():
-                if col in data.columns:
-                    actual_type = str(data[col].dtype)
-                    if actual_type != expected_type:
-                        validation_status = False
-                        break
-
-            with open(self.config.STATUS_FILE, 'w') as f:
-                f.write(f"Validation status: {validation_status}")
-
-            return validation_status
-        except Exception as e:
-            raise e
\ No newline at end of file
+        return self.validate()["status"]
+
+
+def describe_failures(report) -> str:
+    problems = [f"missing columns {report['missing_columns']}"] if report["missing_columns"] else []
+    if not report["rows"]:
+        problems.append("no rows")
+    for name in report["failed_checks"]:
+        check = report["checks"][name]
+        problems.append(f"{name} ({check['count']}, e.g. {check['examples'][0]})")
+    return "; ".join(problems)
+
+
+def require_valid_data(config: DataValidationConfig):
+    """Raises DataValidationError unless the validation report of the run says the data is valid.
+
+    Stages that consume the raw data call this first, so bad data stops the run
+    before any training time is spent on it.
+    """
+    if not os.path.exists(config.REPORT_FILE):
+        raise DataValidationError(f"No validation report at {config.REPORT_FILE}, run the validation stage first")
+    report = load_json(Path(config.REPORT_FILE))
+    if not report.status:
+        raise DataValidationError(f"Data failed validation: {describe_failures(report)}")
@@ -0,0 +1,69 @@
+import weakref
+
+import numpy as np
+
+# Compiled rollouts per model and horizon, dropped together with the model
+_compiled_rollouts = weakref.WeakKeyDictionary()
+
+
+def _next_window(window, y_scaled):
+    """Slides a (n, lookback, features) window one step, appending the predicted target.
+
+    Only the target (column 0) is predicted, so the other features of the new
+    row are carried forward from the last known row.
+    """
+    new_row = np.concatenate([y_scaled.reshape(-1, 1), window[:, -1, 1:]], axis=1)
+    return np.concatenate([window[:, 1:, :], new_row[:, np.newaxis, :]], axis=1)
+
+
+def rollout_loop(model, window, horizon) -> np.ndarray:
+    """Reference implementation: one model.predict call per step from Python.
+
+    Args:
+        window (np.ndarray): scaled input windows of shape (n, lookback, features)
+
+    Returns:
+        np.ndarray: scaled target path of shape (n, horizon)
+    """
+    window = np.asarray(window, dtype=np.float32)
+    path = []
+    for _ in range(horizon):
+        y_scaled = np.asarray(model.predict(window, verbose=0)).reshape(len(window), -1)[:, 0]
+        path.append(y_scaled)
+        window = _next_window(window, y_scaled)
+    return np.stack(path, axis=1)
+
+
+def compile_rollout(model, horizon):
+    """Builds a tf.function that rolls the window forward horizon steps in a single graph call."""
+    import tensorflow as tf
+
+    @tf.function(reduce_retracing=True)
+    def rollout(window):
+        path = tf.TensorArray(tf.float32, size=horizon)
+        for step in tf.range(horizon):
+            y_scaled = tf.cast(model(window, training=False)[:, :1], tf.float32)
+            new_row = tf.concat([y_scaled, window[:, -1, 1:]], axis=1)
+            window = tf.concat([window[:, 1:, :], new_row[:, tf.newaxis, :]], axis=1)
+            path = path.write(step, y_scaled[:, 0])
+        return tf.transpose(path.stack())
+
+    return rollout
+
+
+def rollout(model, window, horizon) -> np.ndarray:
+    """Scaled target path of shape (n, horizon), computed by a cached compiled rollout of the model.
+
+    Models that are not Keras models (e.g. test stubs) fall back to rollout_loop.
+    """
+    if horizon == 1 or not hasattr(model, "trainable_variables"):
+        return rollout_loop(model, window, horizon)
+
+    try:
+        per_model = _compiled_rollouts.setdefault(model, {})
+    except TypeError:
+        # Not weak-referenceable, compile without caching
+        per_model = {}
+    if horizon not in per_model:
+        per_model[horizon] = compile_rollout(model, horizon)
+    return per_model[horizon](np.asarray(window, dtype=np.float32)).numpy()
@@ -0,0 +1,141 @@
+import dataclasses
+import itertools
+import math
+import random
+from dataclasses import dataclass
+
+from finance_ml.entity.config_entity import ModelTrainingParams
+
+
+def sample_configurations(search_space, num_trials, seed=None) -> list:
+    """Draws num_trials distinct configurations from the grid spanned by search_space.
+
+    Args:
+        search_space (dict): parameter name -> list of candidate values
+
+    Returns:
+        list: dicts of parameter name -> value, the whole grid in random order if it is not larger than num_trials
+    """
+    names = list(search_space)
+    grid = list(itertools.product(*(search_space[name] for name in names)))
+    rng = random.Random(seed)
+    chosen = rng.sample(grid, min(num_trials, len(grid)))
+    return [dict(zip(names, values)) for values in chosen]
+
+
+def grid_size(search_space) -> int:
+    return math.prod(len(values) for values in search_space.values())
+
+
+def successive_halving_rungs(min_epochs, max_epochs, reduction_factor) -> list:
+    """Epoch budgets of the rungs, e.g. [2, 6, 20] for 2, 20 and 3: every rung trains reduction_factor times longer."""
+    rungs = []
+    epochs = max_epochs
+    while epochs >= min_epochs:
+        rungs.insert(0, epochs)
+        epochs //= reduction_factor
+    return rungs or [max_epochs]
+
+
+class AshaScheduler:
+    """Asynchronous successive halving (ASHA) over a fixed list of configurations.
+
+    Every trial first trains for the epochs of the lowest rung. A trial moves up
+    to the next rung as soon as it is among the best 1/reduction_factor of the
+    trials that finished its rung; the others stop there. Promotions never wait
+    for a rung to fill up, so a worker is only idle when nothing is left to run.
+    """
+
+    def __init__(self, n_trials, rungs, reduction_factor):
+        self.n_trials = n_trials
+        self.rungs = rungs
+        self.reduction_factor = reduction_factor
+        self.losses = [{} for _ in rungs] # rung -> {trial_id: loss}
+        self._promoted = [set() for _ in rungs]
+        self._started = 0
+
+    def next_job(self):
+        """Returns the (trial_id, rung) to train next, or None if nothing can start now.
+
+        Promotions to the highest rung come first, then new trials.
+        """
+        for rung in reversed(range(len(self.rungs) - 1)):
+            finished = sorted(self.losses[rung].items(), key=lambda item: item[1])
+            for trial_id, _ in finished[:len(finished) // self.reduction_factor]:
+                if trial_id not in self._promoted[rung]:
+                    self._promoted[rung].add(trial_id)
+                    return trial_id, rung + 1
+        if self._started < self.n_trials:
+            self._started += 1
+            return self._started - 1, 0
+        return None
+
+    def report(self, trial_id, rung, loss):
+        """Records the validation loss of a trial after the rung's epochs. Failed trials report inf."""
+        self.losses[rung][trial_id] = loss if loss is not None and math.isfinite(loss) else math.inf
+
+    def best(self):
+        """Returns (trial_id, rung, loss) of the lowest loss on the highest rung any trial reached."""
+        for rung in reversed(range(len(self.rungs))):
+            if self.losses[rung]:
+                trial_id, loss = min(self.losses[rung].items(), key=lambda item: item[1])
+                return trial_id, rung, loss
+        return None
+
+
+@dataclass(frozen=True)
+class TrialJob:
+    """One rung of one trial, run by run_trial in a worker process."""
+    trial_id: int
+    params: ModelTrainingParams
+    X_train_path: str
+    y_train_path: str
+    checkpoint_path: str
+    initial_epoch: int # Epochs already trained in lower rungs, resumed from the checkpoint
+    epochs: int
+    validation_split: float
+    tracking_uri: str
+    experiment_name: str
+    mlflow_run_id: str = None
+
+
+def run_trial(job: TrialJob) -> dict:
+    """Trains a trial up to job.epochs and returns its validation loss.
+
+    The last validation_split of the training windows is held out, in time
+    order. A promoted trial continues from the checkpoint of its previous rung
+    and logs into the same MLflow run.
+
+    Returns:
+        dict: 'loss' (validation MAE) and 'mlflow_run_id'
+    """
+    import os
+    import numpy as np
+    import mlflow
+    from tensorflow import keras
+    from finance_ml.components.model_training import build_model
+    from finance_ml.components.training_input import configure_tensorflow, make_dataset
+
+    configure_tensorflow(job.params)
+    X = np.load(job.X_train_path, mmap_mode="r")
+    y = np.load(job.y_train_path, mmap_mode="r")
+    split = len(X) - max(1, int(len(X) * job.validation_split))
+    train_dataset = make_dataset(X[:split], y[:split], job.params)
+    validation_dataset = make_dataset(X[split:], y[split:], dataclasses.replace(job.params, shuffle_buffer=0))
+
+    if job.initial_epoch and os.path.exists(job.checkpoint_path):
+        model = keras.models.load_model(job.checkpoint_path)
+    else:
+        model = build_model(job.params, input_shape=X.shape[1:])
+
+    mlflow.set_tracking_uri(job.tracking_uri)
+    mlflow.set_experiment(job.experiment_name)
+    with mlflow.start_run(run_id=job.mlflow_run_id, run_name=None if job.mlflow_run_id else f"trial-{job.trial_id}") as run:
+        if job.mlflow_run_id is None:
+            mlflow.log_params({"trial_id": job.trial_id, **dataclasses.asdict(job.params)})
+        history = model.fit(train_dataset, validation_data=validation_dataset,
+                            initial_epoch=job.initial_epoch, epochs=job.epochs, verbose=0)
+        for epoch, loss in enumerate(history.history["val_loss"], start=job.initial_epoch + 1):
+            mlflow.log_metric("val_loss", loss, step=epoch)
+        model.save(job.checkpoint_path)
+        return {"loss": float(history.history["val_loss"][-1]), "mlflow_run_id": run.info.run_id}
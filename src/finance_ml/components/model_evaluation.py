@@ -10,7 +10,8 @@ import matplotlib.pyplot as plt
 from sklearn.metrics import mean_absolute_error, mean_squared_error
 
 from finance_ml.entity.config_entity import ModelEvaluationConfig
-from finance_ml.utils.common import save_json
+from finance_ml.utils.common import create_directories, save_json
+from finance_ml.utils.handoff import Handoff
 
 
 def mean_absolute_percentage_error(y_true, y_pred):
@@ -31,8 +32,9 @@ def directional_accuracy(y_true, y_pred):
 
 
 class ModelEvaluation:
-    def __init__(self, config: ModelEvaluationConfig):
+    def __init__(self, config: ModelEvaluationConfig, handoff: Handoff = None):
         self.config = config
+        self.handoff = handoff or Handoff()
 
     def _inverse_transform(self, y_scaled, scaler):
         """Helper to inverse transform data."""
@@ -83,11 +85,11 @@ class ModelEvaluation:
         if not all(p.exists() for p in [model_path, X_test_path, y_test_path, scaler_path]):
             raise FileNotFoundError(f"Model, test data, or scaler not found. Checked paths:\n- {model_path}\n- {X_test_path}\n- {y_test_path}\n- {scaler_path}")
 
-        # Load model, data, and scaler
-        model = keras.models.load_model(model_path)
-        X_test = np.load(X_test_path)
-        y_test_scaled = np.load(y_test_path)
-        scaler = joblib.load(scaler_path)
+        # Load model, data, and scaler, unless the stages before handed them over in memory
+        model = self.handoff.get(model_path, keras.models.load_model)
+        X_test = self.handoff.get(X_test_path, np.load)
+        y_test_scaled = self.handoff.get(y_test_path, np.load)
+        scaler = self.handoff.get(scaler_path, joblib.load)
 
         # Set the MLflow experiment
         mlflow.set_experiment("FinSight_Stock_Prediction")
@@ -130,6 +132,7 @@ class ModelEvaluation:
             self._create_and_log_visualization(y_test_rupees, y_pred_rupees)
 
             # Save metrics to a local JSON file
+            create_directories([Path(self.config.metrics_file_name).parent])
             save_json(path=Path(self.config.metrics_file_name), data=metrics)
             
             print("Model evaluation complete. Metrics and visualization logged to MLflow and saved locally.")
\ No newline at end of file
@@ -0,0 +1,127 @@
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from finance_ml import logger
+
+
+def artifact_fingerprint(*paths) -> tuple:
+    """Identifies the current version of a set of artifact files by path, mtime and size.
+
+    Retraining rewrites the files, which changes the fingerprint.
+    """
+    fingerprint = []
+    for path in paths:
+        stat = os.stat(path)
+        fingerprint.append((str(Path(path).resolve()), stat.st_mtime_ns, stat.st_size))
+    return tuple(fingerprint)
+
+
+def _load_keras_model(path):
+    from tensorflow import keras
+    return keras.models.load_model(path)
+
+
+def _load_scaler(path):
+    from joblib import load
+    return load(path)
+
+
+def _load_numpy_model(path):
+    from finance_ml.components.numpy_lstm import load_numpy_model
+    return load_numpy_model(path)
+
+
+def _load_numpy_scaler(path):
+    from finance_ml.components.numpy_lstm import load_numpy_scaler
+    return load_numpy_scaler(path)
+
+
+# Model and scaler loaders of each inference engine
+ENGINE_LOADERS = {
+    'keras': (_load_keras_model, _load_scaler),
+    'numpy': (_load_numpy_model, _load_numpy_scaler),
+}
+
+
+def estimate_model_bytes(model) -> int:
+    """Approximate memory held by a model: the size of its weights."""
+    try:
+        return int(sum(weight.nbytes for weight in model.get_weights()))
+    except Exception:
+        return 0
+
+
+class ModelRegistry:
+    """In-process LRU cache of loaded models and their scalers.
+
+    Entries are keyed by ticker and artifact fingerprint, so a retrained model
+    is loaded again and the stale entry for that ticker is dropped. The cache
+    is bounded both by number of entries and by the estimated weight memory.
+    """
+
+    def __init__(self, max_models=8, max_memory_mb=512, load_model=None, load_scaler=None):
+        self.max_models = max_models
+        self.max_bytes = max_memory_mb * 1024 * 1024
+        self._load_model = load_model or _load_keras_model
+        self._load_scaler = load_scaler or _load_scaler
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, ticker, model_path, scaler_path):
+        """Returns (model, scaler) for a ticker, loading them only when not cached or changed on disk."""
+        key = (ticker, artifact_fingerprint(model_path, scaler_path))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry['model'], entry['scaler']
+            self.misses += 1
+
+        logger.info(f"Loading model for {ticker} from {model_path}")
+        model = self._load_model(model_path)
+        scaler = self._load_scaler(scaler_path)
+
+        with self._lock:
+            # Older versions of this ticker's model are stale once it has been retrained
+            for stale_key in [k for k in self._entries if k[0] == ticker and k != key]:
+                del self._entries[stale_key]
+            self._entries[key] = {'model': model, 'scaler': scaler, 'bytes': estimate_model_bytes(model)}
+            self._evict()
+        return model, scaler
+
+    def _evict(self):
+        """Drops least recently used entries until the cache is within its bounds (keeping at least one)."""
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_models or self.memory_bytes() > self.max_bytes
+        ):
+            evicted_key, _ = self._entries.popitem(last=False)
+            logger.info(f"Evicted model for {evicted_key[0]} from the model registry")
+
+    def memory_bytes(self) -> int:
+        return sum(entry['bytes'] for entry in self._entries.values())
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_registries = {}
+_registry_lock = threading.Lock()
+
+
+def get_model_registry(max_models=8, max_memory_mb=512, engine='keras') -> ModelRegistry:
+    """Returns the process-wide registry of an inference engine, creating it with the given bounds on first use."""
+    with _registry_lock:
+        if engine not in _registries:
+            load_model, load_scaler = ENGINE_LOADERS[engine]
+            _registries[engine] = ModelRegistry(max_models=max_models, max_memory_mb=max_memory_mb,
+                                                load_model=load_model, load_scaler=load_scaler)
+        return _registries[engine]
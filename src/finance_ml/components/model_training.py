@@ -2,49 +2,90 @@ from finance_ml.entity.config_entity import ModelTrainingConfig, ModelTrainingPa
 from tensorflow import keras
 import numpy as np
 import os
-import tensorflow as tf
 import mlflow.keras  # Added for autologging
+from joblib import load
+from finance_ml import logger
+from finance_ml.components.numpy_lstm import export_numpy_model
+from finance_ml.components.training_input import configure_tensorflow, make_dataset, EpochThroughput
+from finance_ml.utils.common import create_directories
+from finance_ml.utils.handoff import Handoff
+from finance_ml.utils.spans import span
+
+
+def _log_throughput_metric(epoch, samples_per_sec):
+    if mlflow.active_run() is not None:
+        mlflow.log_metric("samples_per_sec", samples_per_sec, step=epoch)
+
+
+def build_model(params: ModelTrainingParams, input_shape) -> keras.Model:
+    """Compiled LSTM model for windows of shape input_shape = (lookback, features)."""
+    model = keras.models.Sequential()
+
+    model.add(keras.layers.LSTM(params.lstm_units_1, return_sequences=True, input_shape=input_shape))
+    model.add(keras.layers.LSTM(params.lstm_units_2, return_sequences=False))
+    model.add(keras.layers.Dense(params.dense_units_1, activation="relu"))
+    model.add(keras.layers.Dropout(params.dropout_rate))
+    model.add(keras.layers.Dense(1))
+
+    model.compile(optimizer="adam",
+                  loss="mae",
+                  metrics=[keras.metrics.RootMeanSquaredError()])
+    return model
+
 
 class ModelTraining:
-    def __init__(self, config: ModelTrainingConfig, params: ModelTrainingParams): 
+    def __init__(self, config: ModelTrainingConfig, params: ModelTrainingParams, handoff: Handoff = None):
         self.config = config
         self.params = params
+        self.handoff = handoff or Handoff()
 
     def train_model(self):
+        # Must run before TensorFlow executes anything
+        configure_tensorflow(self.params)
+
         # Enable MLflow autologging
         mlflow.keras.autolog()
-        # Load the transformed data
-        X_train = np.load(os.path.join("artifacts", "data_transformation", "X_train.npy"))
-        y_train = np.load(os.path.join("artifacts", "data_transformation", "y_train.npy"))
+        # Open the transformed data without reading it all into memory
+        X_train = self.handoff.get(self.config.X_train_path, lambda path: np.load(path, mmap_mode="r"))
+        y_train = self.handoff.get(self.config.y_train_path, lambda path: np.load(path, mmap_mode="r"))
+        train_dataset = make_dataset(X_train, y_train, self.params)
 
 
         # Build the Model using parameters
-        model = keras.models.Sequential()
-
-        model.add(keras.layers.LSTM(self.params.lstm_units_1, return_sequences=True, input_shape=(X_train.shape[1], 1)))
-        model.add(keras.layers.LSTM(self.params.lstm_units_2, return_sequences=False))
-        model.add(keras.layers.Dense(self.params.dense_units_1, activation="relu"))
-        model.add(keras.layers.Dropout(self.params.dropout_rate))
-        model.add(keras.layers.Dense(1))
-
-        model.compile(optimizer="adam",
-                      loss="mae",
-                      metrics=[keras.metrics.RootMeanSquaredError()])
+        model = build_model(self.params, input_shape=(X_train.shape[1], X_train.shape[2]))
 
         # Add early stopping
         early_stopping = keras.callbacks.EarlyStopping(
             monitor='loss', patience=5, restore_best_weights=True
         )
+        throughput = EpochThroughput(len(X_train), on_epoch_end=_log_throughput_metric)
 
-        # Train the model using parameters
-        model.fit(
-            X_train, y_train, 
-            epochs=self.params.epochs, 
-            batch_size=self.params.batch_size,
-            callbacks=[early_stopping]
-        )
+        # Train the model using parameters, batching is done by the dataset
+        with span("fit", samples=len(X_train), epochs=self.params.epochs) as record:
+            history = model.fit(
+                train_dataset,
+                epochs=self.params.epochs,
+                callbacks=[early_stopping, throughput]
+            )
+            record["epochs_run"] = len(history.epoch)
+        if throughput.samples_per_sec:
+            logger.info(f"Mean training throughput: {np.mean(throughput.samples_per_sec):.0f} samples/sec "
+                        f"over {len(throughput.samples_per_sec)} epochs")
 
         # Save the trained model
-        model.save(os.path.join(self.config.root_dir, self.config.trained_model_name))
+        create_directories([self.config.root_dir])
+        model_path = os.path.join(self.config.root_dir, self.config.trained_model_name)
+        model.save(model_path)
+        self.handoff.put(model_path, model)
+
+        # Export the weights and scaler so prediction can run without TensorFlow
+        numpy_model_path = os.path.join(self.config.root_dir, self.config.numpy_model_name)
+        try:
+            export_numpy_model(model, self.handoff.get(self.config.scaler_path, load), numpy_model_path)
+        except Exception as e:
+            # An export from the run this one was seeded from belongs to another model
+            if os.path.exists(numpy_model_path):
+                os.remove(numpy_model_path)
+            logger.warning(f"NumPy export skipped, prediction will use the Keras model: {e}")
 
         return model
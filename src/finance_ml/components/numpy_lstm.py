@@ -0,0 +1,157 @@
+import numpy as np
+
+# Bump when the layout of the exported .npz changes
+EXPORT_FORMAT_VERSION = 1
+
+_ACTIVATIONS = {
+    "linear": lambda x: x,
+    "relu": lambda x: np.maximum(x, 0),
+    "tanh": np.tanh,
+    "sigmoid": lambda x: 1.0 / (1.0 + np.exp(-x)),
+    "hard_sigmoid": lambda x: np.clip(x / 6.0 + 0.5, 0.0, 1.0),
+}
+
+
+def _activation_name(activation) -> str:
+    name = activation if isinstance(activation, str) else getattr(activation, "__name__", str(activation))
+    if name not in _ACTIVATIONS:
+        raise ValueError(f"Unsupported activation for NumPy inference: {name}")
+    return name
+
+
+def _scaler_affine(scaler):
+    """Expresses a fitted StandardScaler or MinMaxScaler as x_scaled = x * scale + offset."""
+    if hasattr(scaler, "mean_") and hasattr(scaler, "scale_"):
+        scale = 1.0 / scaler.scale_ if getattr(scaler, "with_std", True) else np.ones_like(scaler.mean_)
+        mean = scaler.mean_ if getattr(scaler, "with_mean", True) else np.zeros_like(scaler.mean_)
+        return scale, -mean * scale
+    if hasattr(scaler, "min_") and hasattr(scaler, "scale_"):
+        return scaler.scale_, scaler.min_
+    raise ValueError(f"Unsupported scaler for NumPy inference: {type(scaler).__name__}")
+
+
+def export_numpy_model(model, scaler, path):
+    """Writes the weights of a Sequential LSTM/Dense Keras model and its scaler to a .npz file.
+
+    Dropout layers are left out, they do nothing at inference time.
+    """
+    arrays = {"format_version": np.array(EXPORT_FORMAT_VERSION)}
+    layer_types = []
+    for layer in model.layers:
+        kind = type(layer).__name__
+        if kind in ("Dropout", "InputLayer"):
+            continue
+        i = len(layer_types)
+        if kind == "LSTM":
+            kernel, recurrent_kernel, bias = layer.get_weights()
+            arrays[f"layer{i}_recurrent_kernel"] = recurrent_kernel
+            arrays[f"layer{i}_recurrent_activation"] = np.array(_activation_name(layer.recurrent_activation))
+            arrays[f"layer{i}_return_sequences"] = np.array(layer.return_sequences)
+        elif kind == "Dense":
+            kernel, bias = layer.get_weights()
+        else:
+            raise ValueError(f"Unsupported layer for NumPy inference: {kind}")
+        arrays[f"layer{i}_kernel"] = kernel
+        arrays[f"layer{i}_bias"] = bias
+        arrays[f"layer{i}_activation"] = np.array(_activation_name(layer.activation))
+        layer_types.append(kind)
+    arrays["layer_types"] = np.array(layer_types)
+
+    scale, offset = _scaler_affine(scaler)
+    arrays["scaler_scale"] = np.asarray(scale, dtype=np.float64)
+    arrays["scaler_offset"] = np.asarray(offset, dtype=np.float64)
+
+    with open(path, "wb") as f:
+        np.savez_compressed(f, **arrays)
+
+
+class AffineScaler:
+    """Exported scaler with the parts of the scikit-learn API used by prediction."""
+
+    def __init__(self, scale, offset):
+        self.scale = np.asarray(scale, dtype=np.float64)
+        self.offset = np.asarray(offset, dtype=np.float64)
+        self.n_features_in_ = len(self.scale)
+
+    def transform(self, X):
+        return np.asarray(X, dtype=np.float64) * self.scale + self.offset
+
+    def inverse_transform(self, X):
+        return (np.asarray(X, dtype=np.float64) - self.offset) / self.scale
+
+
+class NumpyLSTMModel:
+    """Forward pass of an exported LSTM/Dense model using only NumPy.
+
+    Follows the Keras LSTM equations with gates ordered input, forget, cell,
+    output. Input projections of all time steps are computed in one matmul,
+    only the recurrent part runs step by step.
+    """
+
+    def __init__(self, layers):
+        self.layers = layers
+
+    @classmethod
+    def from_npz(cls, arrays) -> "NumpyLSTMModel":
+        if int(arrays["format_version"]) != EXPORT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported NumPy model format {int(arrays['format_version'])}")
+        layers = []
+        for i, kind in enumerate(arrays["layer_types"]):
+            layer = {
+                "type": str(kind),
+                "kernel": arrays[f"layer{i}_kernel"].astype(np.float32),
+                "bias": arrays[f"layer{i}_bias"].astype(np.float32),
+                "activation": _ACTIVATIONS[str(arrays[f"layer{i}_activation"])],
+            }
+            if kind == "LSTM":
+                layer["recurrent_kernel"] = arrays[f"layer{i}_recurrent_kernel"].astype(np.float32)
+                layer["recurrent_activation"] = _ACTIVATIONS[str(arrays[f"layer{i}_recurrent_activation"])]
+                layer["return_sequences"] = bool(arrays[f"layer{i}_return_sequences"])
+            layers.append(layer)
+        return cls(layers)
+
+    @staticmethod
+    def _lstm(x, layer):
+        n, steps, _ = x.shape
+        units = layer["recurrent_kernel"].shape[0]
+        activation, recurrent_activation = layer["activation"], layer["recurrent_activation"]
+
+        projected = x @ layer["kernel"] + layer["bias"] # (n, steps, 4 * units)
+        h = np.zeros((n, units), dtype=np.float32)
+        c = np.zeros((n, units), dtype=np.float32)
+        outputs = np.empty((n, steps, units), dtype=np.float32) if layer["return_sequences"] else None
+        for t in range(steps):
+            z = projected[:, t] + h @ layer["recurrent_kernel"]
+            i = recurrent_activation(z[:, :units])
+            f = recurrent_activation(z[:, units:2 * units])
+            c = f * c + i * activation(z[:, 2 * units:3 * units])
+            h = recurrent_activation(z[:, 3 * units:]) * activation(c)
+            if outputs is not None:
+                outputs[:, t] = h
+        return outputs if outputs is not None else h
+
+    def predict(self, X, verbose=0):
+        x = np.asarray(X, dtype=np.float32)
+        for layer in self.layers:
+            if layer["type"] == "LSTM":
+                x = self._lstm(x, layer)
+            else:
+                x = layer["activation"](x @ layer["kernel"] + layer["bias"])
+        return x
+
+    def predict_on_batch(self, X):
+        return self.predict(X)
+
+    def get_weights(self):
+        return [array for layer in self.layers for array in layer.values() if isinstance(array, np.ndarray)]
+
+
+def load_numpy_model(path) -> NumpyLSTMModel:
+    with np.load(path) as arrays:
+        return NumpyLSTMModel.from_npz(arrays)
+
+
+def load_numpy_scaler(path) -> AffineScaler:
+    # np.load reads .npz members lazily, so the weights are not read here
+    with np.load(path) as arrays:
+        return AffineScaler(arrays["scaler_scale"], arrays["scaler_offset"])
@@ -0,0 +1,127 @@
+import json
+import os
+import re
+import uuid
+from pathlib import Path
+
+import pandas as pd
+
+from finance_ml import logger
+from finance_ml.components.data_providers import OHLCV_COLUMNS, MarketDataProvider, period_start
+
+
+class OHLCVStore:
+    """Persistent local store of OHLCV bars, one Parquet partition per ticker and interval.
+
+    Layout: <root_dir>/ticker=<TICKER>/interval=<INTERVAL>/bars.parquet plus a
+    meta.json recording how far back history has been requested. update()
+    only downloads bars from the last stored timestamp onwards.
+    """
+
+    def __init__(self, root_dir):
+        self.root_dir = Path(root_dir)
+
+    def _partition_dir(self, ticker, interval) -> Path:
+        safe_ticker = re.sub(r"[^A-Za-z0-9._-]", "_", ticker)
+        return self.root_dir / f"ticker={safe_ticker}" / f"interval={interval}"
+
+    def _read_meta(self, partition_dir: Path) -> dict:
+        meta_path = partition_dir / "meta.json"
+        if not meta_path.exists():
+            return {}
+        with open(meta_path) as f:
+            return json.load(f)
+
+    def _atomic_write(self, partition_dir: Path, df: pd.DataFrame, meta: dict):
+        """Writes the partition to temp files and swaps them in, so readers never see a partial file."""
+        partition_dir.mkdir(parents=True, exist_ok=True)
+        suffix = uuid.uuid4().hex[:8]
+
+        tmp_bars = partition_dir / f".bars.{suffix}.tmp"
+        df.to_parquet(tmp_bars, index=False)
+        os.replace(tmp_bars, partition_dir / "bars.parquet")
+
+        tmp_meta = partition_dir / f".meta.{suffix}.tmp"
+        with open(tmp_meta, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_meta, partition_dir / "meta.json")
+
+    def read(self, ticker, interval, period=None, columns=None) -> pd.DataFrame:
+        """Returns the stored bars of a ticker, optionally only the last period of them."""
+        bars_path = self._partition_dir(ticker, interval) / "bars.parquet"
+        if not bars_path.exists():
+            return pd.DataFrame(columns=columns or OHLCV_COLUMNS)
+
+        df = pd.read_parquet(bars_path)
+        if period is not None and not df.empty:
+            first = period_start(df['Datetime'].iloc[-1], period)
+            if first is not None:
+                df = df[df['Datetime'] >= first]
+        if columns is not None:
+            df = df[columns]
+        return df.reset_index(drop=True)
+
+    def last_timestamp(self, ticker, interval):
+        df = self.read(ticker, interval, columns=['Datetime'])
+        return None if df.empty else df['Datetime'].iloc[-1]
+
+    def append(self, ticker, interval, new_bars: pd.DataFrame, meta=None) -> pd.DataFrame:
+        """Merges new bars into the partition. Bars with an existing timestamp replace the stored ones."""
+        partition_dir = self._partition_dir(ticker, interval)
+        stored = self.read(ticker, interval)
+        frames = [df for df in (stored, new_bars[OHLCV_COLUMNS]) if not df.empty]
+        if not frames:
+            return stored
+
+        merged = (
+            pd.concat(frames, ignore_index=True)
+            .drop_duplicates(subset='Datetime', keep='last')
+            .sort_values('Datetime')
+            .reset_index(drop=True)
+        )
+        self._atomic_write(partition_dir, merged, meta if meta is not None else self._read_meta(partition_dir))
+        return merged
+
+    def plan_update(self, ticker, period, interval):
+        """Works out what update() has to download for a ticker.
+
+        An empty partition, or one whose requested history does not reach back
+        to the start of period, needs a full period download (start is None).
+        Otherwise only bars from the last stored timestamp onwards are needed;
+        the last stored bar is fetched again because it may have been incomplete.
+
+        Returns:
+            tuple: (start, meta) where meta is the partition metadata to store with the new bars
+        """
+        meta = self._read_meta(self._partition_dir(ticker, interval))
+        last_ts = self.last_timestamp(ticker, interval)
+
+        requested_start = period_start(pd.Timestamp.now(), period)
+        covered_start = meta.get('history_start')
+        needs_backfill = (
+            last_ts is None
+            or covered_start is None
+            or (requested_start is None and covered_start != 'max')
+            or (requested_start is not None and covered_start != 'max'
+                and requested_start < pd.Timestamp(covered_start))
+        )
+
+        if needs_backfill:
+            meta['history_start'] = 'max' if requested_start is None else requested_start.isoformat()
+            return None, meta
+        return last_ts, meta
+
+    def update(self, ticker, provider: MarketDataProvider, period, interval) -> int:
+        """Brings the partition up to date and returns the number of bars fetched."""
+        start, meta = self.plan_update(ticker, period, interval)
+
+        if start is None:
+            logger.info(f"Downloading full {period} history of {ticker} into the OHLCV store")
+            new_bars = provider.fetch(ticker, interval, period=period)
+        else:
+            logger.info(f"Downloading {ticker} bars since {start} into the OHLCV store")
+            new_bars = provider.fetch(ticker, interval, start=start)
+
+        self.append(ticker, interval, new_bars, meta=meta)
+        logger.info(f"Fetched {len(new_bars)} bars for {ticker} ({interval})")
+        return len(new_bars)
@@ -1,23 +1,84 @@
 import os
 import numpy as np
 import pandas as pd
-from tensorflow import keras
 from pathlib import Path
-from joblib import load
 
 from finance_ml.entity.config_entity import ModelPredictionConfig
+from finance_ml.components.model_registry import artifact_fingerprint, get_model_registry
+from finance_ml.components.prediction_history import PredictionHistoryStore
+from finance_ml.components.forecasting import rollout
+from finance_ml.utils.columnar import read_frame
+from finance_ml.utils.common import create_directories
+from finance_ml.utils.handoff import Handoff
+from finance_ml.utils.spans import span
+from finance_ml.utils.tail_cache import read_tail
+from finance_ml import logger
 
 class ModelPrediction:
-    def __init__(self, config: ModelPredictionConfig):
+    def __init__(self, config: ModelPredictionConfig, handoff: Handoff = None):
         self.config = config
+        self.handoff = handoff or Handoff()
+
+    @staticmethod
+    def _inverse_transform(y_scaled, scaler):
+        """Inverse transforms target predictions; the target is the scaler's first feature."""
+        dummy_array = np.zeros((len(y_scaled), scaler.n_features_in_))
+        dummy_array[:, 0] = np.asarray(y_scaled).flatten()
+        return scaler.inverse_transform(dummy_array)[:, 0]
+
+    @staticmethod
+    def _numpy_export_is_current(config) -> bool:
+        """True if the NumPy export exists and is not older than the Keras model it was exported from.
+
+        A failed export in a run seeded from an earlier one leaves that run's export behind.
+        """
+        if not config.numpy_model_path or not Path(config.numpy_model_path).exists():
+            return False
+        if not Path(config.trained_model_path).exists():
+            return True
+        if os.stat(config.numpy_model_path).st_mtime_ns < os.stat(config.trained_model_path).st_mtime_ns:
+            logger.warning(f"{config.numpy_model_path} is older than {config.trained_model_path}, "
+                           f"predicting with the Keras model")
+            return False
+        return True
+
+    @staticmethod
+    def _load_model(config, ticker):
+        """Returns (model, scaler, model_path): the NumPy export when configured and current, else the Keras model.
+
+        The registry keeps them loaded between predictions until the model is retrained.
+        """
+        with span("load_model", ticker=ticker, engine=config.engine):
+            if config.engine == 'numpy' and ModelPrediction._numpy_export_is_current(config):
+                registry = get_model_registry(config.model_cache_size, config.model_cache_memory_mb, engine='numpy')
+                model, scaler = registry.get(ticker, config.numpy_model_path, config.numpy_model_path)
+                return model, scaler, config.numpy_model_path
+            registry = get_model_registry(config.model_cache_size, config.model_cache_memory_mb)
+            model, scaler = registry.get(ticker, config.trained_model_path, config.scaler_path)
+            return model, scaler, config.trained_model_path
+
+    @staticmethod
+    def _prediction_window(scaled_data, time_steps):
+        """The last time_steps rows as a (time_steps, features) window, zero-padded at the start if there are fewer."""
+        if len(scaled_data) < time_steps:
+            padding_needed = time_steps - len(scaled_data)
+            print(f"Warning: Not enough data points. Need {time_steps}, but only have {len(scaled_data)}")
+            print(f"Data padded with {padding_needed} zeros to allow prediction")
+            return np.vstack([np.zeros((padding_needed, scaled_data.shape[1])), scaled_data])
+        return scaled_data[-time_steps:]
 
-    def predict(self):
-        # Load the trained model
-        model = keras.models.load_model(self.config.trained_model_path)
+    @staticmethod
+    def _prediction_dates(last_date, horizon):
+        """The horizon trading days after last_date as YYYY-MM-DD strings; weekends are skipped."""
+        last_date = pd.to_datetime(last_date)
+        return [(last_date + pd.offsets.BDay(step)).strftime('%Y-%m-%d') for step in range(1, horizon + 1)]
 
+    def predict(self):
         try:
-            # Load the input data for prediction
-            data = pd.read_csv(self.config.input_data_path)
+            # Load the columns of the input data the prediction uses
+            features = list(self.config.features)
+            columns = list(dict.fromkeys(['Ticker', 'Datetime', 'Close'] + features))
+            data = self.handoff.get(self.config.input_data_path, lambda path: read_frame(path, columns=columns))
             
             # Print some info about the data
             print(f"Loaded data with {len(data)} rows for prediction")
@@ -27,14 +88,14 @@ class ModelPrediction:
                 print("Warning: Very limited data available for prediction")
 
             # --- Data Preprocessing for Prediction ---
-            # Select the 'close' column
-            stock_close = data.filter(["Close"])
-            dataset = stock_close.values # Convert to numpy array
+            # Select the feature columns the model was trained on (the target comes first)
+            dataset = data[features].values # Convert to numpy array
             
-            print(f"Extracted Close price data with {len(dataset)} values")
+            print(f"Extracted {features} data with {len(dataset)} values")
 
-            # Load the fitted scaler
-            scaler = load("artifacts/data_transformation/scaler.joblib")
+            # Get the trained model and fitted scaler
+            ticker = data['Ticker'].iloc[-1] if 'Ticker' in data.columns else 'UNKNOWN'
+            model, scaler, _ = self._load_model(self.config, ticker)
 
             # Use the loaded scaler to transform your prediction data
             scaled_data = scaler.transform(dataset) 
@@ -47,31 +108,22 @@ class ModelPrediction:
             print(f"Error during data preparation: {str(e)}")
             raise
 
-        # Check if we have enough data points
-        if len(scaled_data) < time_steps:
-            print(f"Warning: Not enough data points. Need {time_steps}, but only have {len(scaled_data)}")
-            # Pad the data with zeros at the beginning to reach required time_steps
-            padding_needed = time_steps - len(scaled_data)
-            padded_data = np.vstack([np.zeros((padding_needed, 1)), scaled_data])
-            X_predict = padded_data.reshape(1, time_steps, 1)
-            print(f"Data padded with {padding_needed} zeros to allow prediction")
-        else:
-            # Use the last 'time_steps' data points from the scaled data
-            X_predict = scaled_data[-time_steps:].reshape(1, time_steps, 1) # Reshape for LSTM: (samples, time_steps, features)
+        # Use the last 'time_steps' data points, reshaped for LSTM: (samples, time_steps, features)
+        X_predict = self._prediction_window(scaled_data, time_steps)[np.newaxis]
 
-        # Make the prediction
-        predicted_price_scaled = model.predict(X_predict)
+        # Make the prediction; horizons beyond one day roll the window forward in a single compiled call
+        horizon = self.config.horizon
+        with span("predict", ticker=ticker, horizon=horizon):
+            predicted_path_scaled = rollout(model, X_predict, horizon)[0]
 
         # Inverse transform the prediction to get the actual price
-        predicted_price = scaler.inverse_transform(predicted_price_scaled)
+        predicted_prices = self._inverse_transform(predicted_path_scaled, scaler)
 
 
 
         # ---Save the Prediction with Date ---
-        # Get the last date from the input data
-        last_date = pd.to_datetime(data['Datetime'].iloc[-1])
-        # Predict for the next day (adjust if your data is not daily)
-        predicted_date = last_date + pd.Timedelta(days=1)
+        # Predict for the trading days after the last date of the input data
+        predicted_dates = self._prediction_dates(data['Datetime'].iloc[-1], horizon)
         
         # Extract ticker from input data
         if 'Ticker' in data.columns:
@@ -79,46 +131,93 @@ class ModelPrediction:
         else:
             ticker = 'UNKNOWN'
             
-        # Save ticker, date and predicted price
+        # Save ticker, date and predicted price, one row per forecast day
         predictions_df = pd.DataFrame({
-            'predicted_date': [predicted_date.strftime('%Y-%m-%d')],
-            'predicted_close_price': [predicted_price[0][0]],
-            'ticker': [ticker]
+            'predicted_date': predicted_dates,
+            'predicted_close_price': predicted_prices,
+            'ticker': ticker
         })
 
+        create_directories([self.config.root_dir])
         predictions_file_path = Path(self.config.root_dir) / self.config.predictions_file_name
         predictions_df.to_csv(predictions_file_path, index=False)  # Use pandas directly
 
         # --- Append to Prediction History ---
-        # Extract ticker from input data
-        if 'Ticker' in data.columns:
-            ticker = data['Ticker'].iloc[-1]
-        else:
-            ticker = 'UNKNOWN'
-        history_file_path = Path(self.config.root_dir) / 'prediction_history.csv'
-        # Prepare historical record
-        historical_record = pd.DataFrame({
-            'ticker': [ticker],
-            'prediction_generated_on': [pd.Timestamp.now().strftime('%Y-%m-%d')],
-            'predicted_for_date': [predicted_date.strftime('%Y-%m-%d')],
-            'predicted_close_price': [predicted_price[0][0]]
-        })
-        # Append or create
-        if history_file_path.exists():
-            history_df = pd.read_csv(history_file_path)
-            updated_history = pd.concat([history_df, historical_record], ignore_index=True)
-        else:
-            updated_history = historical_record
-        updated_history.to_csv(history_file_path, index=False)
+        history = PredictionHistoryStore(self.config.history_db, legacy_csv_path=self.config.legacy_history_csv)
+        generated_on = pd.Timestamp.now().strftime('%Y-%m-%d')
+        history.append_many([
+            (ticker, generated_on, predicted_date, price)
+            for predicted_date, price in zip(predicted_dates, predicted_prices)
+        ])
+        # Earlier predictions for this ticker can now be scored against the actual closes
+        closes_by_date = dict(zip(pd.to_datetime(data['Datetime']).dt.strftime('%Y-%m-%d'), data['Close']))
+        history.update_actuals(ticker, closes_by_date)
         
-        # --- Clean, final output for parsing ---
-        # The web app will look for this exact line.
-        print(f"Predicted Close Price for {ticker}: {predicted_price[0][0]:.2f}")
+        logger.info(f"Predicted Close Price for {ticker}: {predicted_prices[0]:.2f}")
         
         # Return the prediction for potential use by calling code
-        return {
+        result = {
             'ticker': ticker,
-            'predicted_date': predicted_date.strftime('%Y-%m-%d'),
-            'predicted_close_price': float(predicted_price[0][0])
+            'predicted_date': predicted_dates[0],
+            'predicted_close_price': float(predicted_prices[0])
         }
-
+        if horizon > 1:
+            result['forecast'] = [
+                {'predicted_date': predicted_date, 'predicted_close_price': float(price)}
+                for predicted_date, price in zip(predicted_dates, predicted_prices)
+            ]
+        return result
+
+    @classmethod
+    def predict_many(cls, configs: dict):
+        """Predicts the next close of many tickers, skipping predict()'s per-call setup.
+
+        Only the last lookback rows of each ticker's input data are read. Every
+        run trains its own model, so each ticker normally gets its own
+        predict_on_batch call; only tickers whose runs share a model file (e.g.
+        copies of the same run) are stacked into one batch.
+
+        Args:
+            configs (dict): ticker -> ModelPredictionConfig of the run to predict from
+
+        Returns:
+            tuple: DataFrame with ticker, predicted_date and predicted_close_price,
+                   and a dict of ticker -> error message for tickers that failed
+        """
+        groups = {}
+        failed = {}
+        for ticker, config in configs.items():
+            try:
+                features = list(config.features)
+                data = read_tail(config.input_data_path, config.lookback, usecols=['Datetime'] + features)
+                if data.empty:
+                    raise ValueError("No input data")
+                model, scaler, model_path = cls._load_model(config, ticker)
+                window = cls._prediction_window(scaler.transform(data[features].values), config.lookback)
+                predicted_date = cls._prediction_dates(data['Datetime'].iloc[-1], 1)[0]
+            except Exception as e:
+                logger.warning(f"Skipping {ticker} in batch prediction: {e}")
+                failed[ticker] = str(e)
+                continue
+
+            # Tickers predicting with the same model file share a forward pass
+            group = groups.setdefault(artifact_fingerprint(model_path), {'model': model, 'rows': []})
+            group['rows'].append((ticker, window, scaler, predicted_date))
+
+        predictions = []
+        for group in groups.values():
+            rows = group['rows']
+            X_predict = np.stack([window for _, window, _, _ in rows]).astype(np.float32)
+            # predict_on_batch skips the per-call dataset setup of predict()
+            with span("predict", batch=len(rows)):
+                y_scaled = np.asarray(group['model'].predict_on_batch(X_predict)).reshape(len(rows), -1)[:, 0]
+            for (ticker, _, scaler, predicted_date), value in zip(rows, y_scaled):
+                predictions.append({
+                    'ticker': ticker,
+                    'predicted_date': predicted_date,
+                    'predicted_close_price': float(cls._inverse_transform([value], scaler)[0])
+                })
+
+        logger.info(f"Batch prediction: {len(predictions)} tickers with {len(groups)} models, {len(failed)} failed")
+        predictions_df = pd.DataFrame(predictions, columns=['ticker', 'predicted_date', 'predicted_close_price'])
+        return predictions_df, failed
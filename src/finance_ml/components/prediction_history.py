@@ -0,0 +1,133 @@
+import os
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+import pandas as pd
+
+from finance_ml import logger
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS predictions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ticker TEXT NOT NULL,
+    prediction_generated_on TEXT NOT NULL,
+    predicted_for_date TEXT NOT NULL,
+    predicted_close_price REAL NOT NULL,
+    actual_close_price REAL
+);
+CREATE INDEX IF NOT EXISTS idx_predictions_ticker_date ON predictions (ticker, predicted_for_date);
+CREATE INDEX IF NOT EXISTS idx_predictions_date ON predictions (predicted_for_date);
+CREATE INDEX IF NOT EXISTS idx_predictions_error ON predictions (ABS(predicted_close_price - actual_close_price))
+    WHERE actual_close_price IS NOT NULL;
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class PredictionHistoryStore:
+    """Append-only prediction history in an embedded SQLite database.
+
+    Appends are single-row inserts, so their cost does not grow with the
+    history, and SQLite's locking makes them safe for concurrent runs.
+    The legacy prediction_history.csv is imported once, on first open.
+    """
+
+    def __init__(self, db_path, legacy_csv_path=None):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.executescript(SCHEMA)
+        if legacy_csv_path is not None and Path(legacy_csv_path).exists():
+            self.migrate_csv(legacy_csv_path)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def append(self, ticker, prediction_generated_on, predicted_for_date, predicted_close_price):
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT INTO predictions (ticker, prediction_generated_on, predicted_for_date, predicted_close_price) "
+                "VALUES (?, ?, ?, ?)",
+                (ticker, prediction_generated_on, predicted_for_date, float(predicted_close_price)),
+            )
+
+    def append_many(self, rows):
+        """Inserts (ticker, prediction_generated_on, predicted_for_date, predicted_close_price) rows in one transaction."""
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT INTO predictions (ticker, prediction_generated_on, predicted_for_date, predicted_close_price) "
+                "VALUES (?, ?, ?, ?)",
+                [(ticker, generated_on, for_date, float(price)) for ticker, generated_on, for_date, price in rows],
+            )
+
+    def update_actuals(self, ticker, closes_by_date: dict) -> int:
+        """Fills in actual close prices of past predictions. closes_by_date maps 'YYYY-MM-DD' to the close."""
+        with closing(self._connect()) as conn, conn:
+            pending = conn.execute(
+                "SELECT id, predicted_for_date FROM predictions "
+                "WHERE ticker = ? AND actual_close_price IS NULL",
+                (ticker,),
+            ).fetchall()
+            updates = [
+                (float(closes_by_date[row["predicted_for_date"]]), row["id"])
+                for row in pending if row["predicted_for_date"] in closes_by_date
+            ]
+            conn.executemany("UPDATE predictions SET actual_close_price = ? WHERE id = ?", updates)
+        return len(updates)
+
+    def top_k_by_error(self, k=3) -> list:
+        """The k predictions closest to the actual close, most accurate first."""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT ticker AS Ticker, predicted_for_date AS Date, actual_close_price AS Actual, "
+                "predicted_close_price AS Predicted, "
+                "ABS(predicted_close_price - actual_close_price) AS Error "
+                "FROM predictions WHERE actual_close_price IS NOT NULL "
+                "ORDER BY ABS(predicted_close_price - actual_close_price) ASC LIMIT ?",
+                (k,),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def latest_per_ticker(self) -> list:
+        """The most recent prediction of every ticker."""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT p.ticker, p.prediction_generated_on, p.predicted_for_date, "
+                "p.predicted_close_price, p.actual_close_price FROM predictions p "
+                "WHERE p.id = (SELECT MAX(id) FROM predictions WHERE ticker = p.ticker) "
+                "ORDER BY p.ticker"
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def migrate_csv(self, csv_path):
+        """Imports the legacy CSV history once. The meta row makes concurrent migrations insert it only once."""
+        csv_path = Path(csv_path)
+        migrated = 0
+        with closing(self._connect()) as conn, conn:
+            conn.execute("BEGIN IMMEDIATE")
+            if not conn.execute("SELECT 1 FROM meta WHERE key = 'csv_migrated'").fetchone():
+                history_df = pd.read_csv(csv_path)
+                records = [
+                    (row.ticker, row.prediction_generated_on, row.predicted_for_date, float(row.predicted_close_price))
+                    for row in history_df.itertuples(index=False)
+                ]
+                conn.executemany(
+                    "INSERT INTO predictions (ticker, prediction_generated_on, predicted_for_date, predicted_close_price) "
+                    "VALUES (?, ?, ?, ?)",
+                    records,
+                )
+                conn.execute("INSERT INTO meta (key, value) VALUES ('csv_migrated', ?)", (str(csv_path),))
+                migrated = len(records)
+
+        try:
+            os.replace(csv_path, csv_path.with_name(csv_path.name + ".migrated"))
+        except FileNotFoundError:
+            pass # Renamed by a concurrent migration
+        if migrated:
+            logger.info(f"Migrated {migrated} predictions from {csv_path} into {self.db_path}")
@@ -0,0 +1,251 @@
+import bisect
+import difflib
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from pathlib import Path
+
+import pandas as pd
+
+from finance_ml import logger
+from finance_ml.components.data_providers import yfinance_history
+from finance_ml.entity.config_entity import TickerResolutionConfig
+
+NSE_SUFFIX = ".NS"
+
+# Words that say nothing about which company is meant
+_NAME_STOPWORDS = {"limited", "ltd", "the"}
+
+
+def normalize_company_name(name) -> str:
+    """Lowercases a company name, spells out '&' and drops punctuation and legal suffixes."""
+    name = str(name).lower().replace("&", " and ")
+    words = re.sub(r"[^a-z0-9 ]", " ", name).split()
+    return " ".join(word for word in words if word not in _NAME_STOPWORDS)
+
+
+def _download_check(ticker) -> bool:
+    """Asks yfinance for a day of data. Returns False if Yahoo has no such ticker.
+
+    Network errors and rate limits are raised (see yfinance_history), and
+    is_valid does not cache them.
+    """
+    return not yfinance_history(ticker, "1d", period="1d").empty
+
+
+class SymbolIndex:
+    """Offline index of NSE symbols and company names.
+
+    Names are kept in a sorted list together with the suffix starting at each
+    later word ("tata motors" is also found as "motors"), so prefix lookups
+    are a binary search instead of a scan. Close misspellings fall back to
+    difflib.
+    """
+
+    def __init__(self, names: dict):
+        # names maps company names and aliases to tickers
+        self.symbols = {ticker.upper() for ticker in names.values()}
+        self.names = {}
+        for name, ticker in names.items():
+            key = normalize_company_name(name)
+            if key:
+                self.names.setdefault(key, ticker.upper())
+
+        # (key, rank, ticker): rank 0 matches from the start of the name, rank 1 from a later word
+        entries = []
+        for key, ticker in self.names.items():
+            words = key.split()
+            entries.append((key, 0, ticker))
+            entries.extend((" ".join(words[i:]), 1, ticker) for i in range(1, len(words)))
+        entries.sort()
+        self._entries = entries
+        self._keys = [entry[0] for entry in entries]
+
+    @classmethod
+    def from_listing(cls, listing_path, aliases=None) -> "SymbolIndex":
+        """Builds the index from an NSE equity listing (SYMBOL and NAME OF COMPANY columns, as in EQUITY_L.csv)."""
+        names = {}
+        listing_path = Path(listing_path)
+        if listing_path.exists():
+            listing = pd.read_csv(listing_path, dtype=str)
+            listing.columns = [column.strip() for column in listing.columns]
+            if "SERIES" in listing.columns:
+                listing = listing[listing["SERIES"].str.strip() == "EQ"]
+            for symbol, company in zip(listing["SYMBOL"], listing["NAME OF COMPANY"]):
+                ticker = f"{symbol.strip().upper()}{NSE_SUFFIX}"
+                names[company] = ticker
+                names[symbol] = ticker
+        else:
+            logger.warning(f"NSE listing not found at {listing_path}, resolving tickers from aliases only")
+
+        # Hand-picked aliases win over names derived from the listing
+        names.update(aliases or {})
+        return cls(names)
+
+    def lookup_symbol(self, text):
+        """Returns the ticker if text is a listed symbol, with or without the .NS suffix."""
+        symbol = text.strip().upper()
+        if not symbol.endswith(NSE_SUFFIX):
+            symbol += NSE_SUFFIX
+        return symbol if symbol in self.symbols else None
+
+    def match(self, text, min_prefix=3, fuzzy_cutoff=0.8):
+        """Returns the ticker of the company best matching text, or None.
+
+        Tries an exact name, then the shortest name starting with text (from
+        its first word before later ones), then the closest spelling.
+        """
+        key = normalize_company_name(text)
+        if not key:
+            return None
+        if key in self.names:
+            return self.names[key]
+
+        if len(key) >= min_prefix:
+            best = None
+            i = bisect.bisect_left(self._keys, key)
+            while i < len(self._entries) and self._keys[i].startswith(key):
+                entry_key, rank, ticker = self._entries[i]
+                if best is None or (rank, len(entry_key)) < best[0]:
+                    best = ((rank, len(entry_key)), ticker)
+                i += 1
+            if best is not None:
+                return best[1]
+
+        close = difflib.get_close_matches(key, list(self.names), n=1, cutoff=fuzzy_cutoff)
+        return self.names[close[0]] if close else None
+
+
+class TickerValidationCache:
+    """Persistent cache of ticker validation results with separate TTLs for valid and invalid tickers.
+
+    Stored as a JSON file, rewritten atomically so concurrent pipeline
+    processes never read a partial file.
+    """
+
+    def __init__(self, cache_file, positive_ttl_hours=168, negative_ttl_hours=24):
+        self.cache_file = Path(cache_file)
+        self.positive_ttl = positive_ttl_hours * 3600
+        self.negative_ttl = negative_ttl_hours * 3600
+        self._lock = threading.Lock()
+        self._entries = self._load()
+
+    def _load(self) -> dict:
+        try:
+            with open(self.cache_file) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def get(self, ticker):
+        """Returns the cached result for a ticker, or None if it is unknown or expired."""
+        with self._lock:
+            entry = self._entries.get(ticker)
+        if entry is None:
+            return None
+        valid, checked_at = entry
+        ttl = self.positive_ttl if valid else self.negative_ttl
+        if time.time() - checked_at > ttl:
+            return None
+        return valid
+
+    def set(self, ticker, valid: bool):
+        with self._lock:
+            # Merge with what other processes have written since we loaded the file
+            self._entries = {**self._load(), **self._entries, ticker: [bool(valid), time.time()]}
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_file.with_name(f".{self.cache_file.name}.{uuid.uuid4().hex[:8]}.tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, self.cache_file)
+
+
+class TickerResolver:
+    """Turns user input into a yfinance ticker, touching the network only for unknown symbols."""
+
+    def __init__(self, index: SymbolIndex, cache: TickerValidationCache, validator=None):
+        self.index = index
+        self.cache = cache
+        self._validator = validator or _download_check
+
+    def is_valid(self, ticker):
+        """Listed symbols are valid without a download; other tickers are checked once per TTL.
+
+        Returns None if the check itself failed, e.g. during a network outage.
+        That result is not cached.
+        """
+        if not ticker:
+            return False
+        ticker = ticker.strip().upper()
+        if ticker in self.index.symbols:
+            return True
+
+        cached = self.cache.get(ticker)
+        if cached is not None:
+            return cached
+        try:
+            valid = self._validator(ticker)
+        except Exception as e:
+            # A network failure says nothing about the ticker, so it is not cached
+            logger.warning(f"Could not validate {ticker}: {e}")
+            return None
+        self.cache.set(ticker, valid)
+        return valid
+
+    def resolve(self, input_text):
+        """Returns the ticker for a company name or symbol, or None for empty input."""
+        if not input_text or not input_text.strip():
+            return None
+        input_text = input_text.strip()
+
+        # Exact names and aliases, then symbols already carrying the .NS suffix
+        key = normalize_company_name(input_text)
+        if key in self.index.names:
+            return self.index.names[key]
+        if re.match(r"^[A-Za-z0-9&-]+\.NS$", input_text, re.IGNORECASE):
+            return input_text.upper()
+
+        listed = self.index.lookup_symbol(input_text)
+        if listed:
+            return listed
+
+        ticker_candidate = f"{input_text.upper()}{NSE_SUFFIX}"
+        if " " not in input_text:
+            # Possibly a ticker outside the listing, e.g. a non-Indian one
+            for ticker in (input_text.upper(), ticker_candidate):
+                if self.is_valid(ticker):
+                    return ticker
+
+        matched = self.index.match(input_text)
+        if matched:
+            return matched
+
+        # If all else fails, return the input with .NS suffix as best guess
+        return ticker_candidate
+
+
+_resolver = None
+_resolver_lock = threading.Lock()
+
+
+def get_ticker_resolver(config: TickerResolutionConfig = None) -> TickerResolver:
+    """Returns the process-wide resolver, building the symbol index on first use."""
+    global _resolver
+    with _resolver_lock:
+        if _resolver is None:
+            if config is None:
+                from finance_ml.config.configuration import ConfigurationManager
+                config = ConfigurationManager().get_ticker_resolution_config()
+            from finance_ml.utils.common import INDIAN_COMPANIES
+
+            index = SymbolIndex.from_listing(config.symbol_list, aliases=INDIAN_COMPANIES)
+            cache = TickerValidationCache(
+                config.cache_file,
+                positive_ttl_hours=config.positive_ttl_hours,
+                negative_ttl_hours=config.negative_ttl_hours,
+            )
+            _resolver = TickerResolver(index, cache)
+    return _resolver
@@ -0,0 +1,100 @@
+import time
+
+import numpy as np
+import tensorflow as tf
+from tensorflow import keras
+
+from finance_ml import logger
+from finance_ml.entity.config_entity import ModelTrainingParams
+
+# Rows read from the memory mapped arrays and cast to float32 at a time
+READ_CHUNK_ROWS = 4096
+
+# Most TensorFlow threads this process may use, set by limit_threads()
+_thread_limit = None
+
+
+def limit_threads(max_threads):
+    """Caps this process at max_threads TensorFlow threads, whatever params.yaml asks for.
+
+    Used by processes that share the machine with other trainings, e.g. the
+    watchlist training workers. Ops run one at a time on the capped pool.
+    """
+    global _thread_limit
+    _thread_limit = max_threads
+    tf.config.threading.set_intra_op_parallelism_threads(max_threads)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+
+def configure_tensorflow(params: ModelTrainingParams):
+    """Applies the thread pool sizes and determinism settings from params.yaml.
+
+    Thread pools can only be sized before TensorFlow runs its first op, so in a
+    worker that already ran TensorFlow the old sizes stay and a warning is logged.
+    A limit set with limit_threads() is never exceeded.
+    """
+    intra_op_threads, inter_op_threads = params.intra_op_threads, params.inter_op_threads
+    if _thread_limit:
+        intra_op_threads = min(intra_op_threads or _thread_limit, _thread_limit)
+        inter_op_threads = 1
+    try:
+        if intra_op_threads:
+            tf.config.threading.set_intra_op_parallelism_threads(intra_op_threads)
+        if inter_op_threads:
+            tf.config.threading.set_inter_op_parallelism_threads(inter_op_threads)
+    except RuntimeError as e:
+        logger.warning(f"TensorFlow thread settings not applied, the runtime is already initialized: {e}")
+
+    if params.deterministic:
+        keras.utils.set_random_seed(params.seed)
+        tf.config.experimental.enable_op_determinism()
+
+
+def make_dataset(X, y, params: ModelTrainingParams) -> tf.data.Dataset:
+    """Streams (X, y) as shuffled float32 batches.
+
+    X and y may be memory mapped: rows are read and cast in chunks, so the
+    float64 arrays are never held in memory as a whole. With cache_dataset the
+    float32 rows are kept in memory after the first epoch.
+    """
+    def chunks():
+        for start in range(0, len(X), READ_CHUNK_ROWS):
+            yield (np.asarray(X[start:start + READ_CHUNK_ROWS], dtype=np.float32),
+                   np.asarray(y[start:start + READ_CHUNK_ROWS], dtype=np.float32))
+
+    dataset = tf.data.Dataset.from_generator(chunks, output_signature=(
+        tf.TensorSpec(shape=(None, *X.shape[1:]), dtype=tf.float32),
+        tf.TensorSpec(shape=(None, *y.shape[1:]), dtype=tf.float32),
+    )).unbatch()
+
+    if params.cache_dataset:
+        dataset = dataset.cache()
+    if params.shuffle_buffer:
+        dataset = dataset.shuffle(params.shuffle_buffer, seed=params.seed, reshuffle_each_iteration=True)
+    # Keep the sample count known to Keras, the generator hides it
+    dataset = dataset.apply(tf.data.experimental.assert_cardinality(len(X)))
+    return dataset.batch(params.batch_size).prefetch(tf.data.AUTOTUNE)
+
+
+class EpochThroughput(keras.callbacks.Callback):
+    """Logs the training throughput of every epoch in samples/sec.
+
+    on_epoch_end(epoch, samples_per_sec), if given, is called after every epoch.
+    """
+
+    def __init__(self, n_samples, on_epoch_end=None):
+        super().__init__()
+        self.n_samples = n_samples
+        self.callback = on_epoch_end
+        self.samples_per_sec = []
+        self._epoch_start = None
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._epoch_start = time.perf_counter()
+
+    def on_epoch_end(self, epoch, logs=None):
+        samples_per_sec = self.n_samples / max(time.perf_counter() - self._epoch_start, 1e-9)
+        self.samples_per_sec.append(samples_per_sec)
+        logger.info(f"Epoch {epoch + 1}: {samples_per_sec:.0f} samples/sec")
+        if self.callback is not None:
+            self.callback(epoch, samples_per_sec)
@@ -1,8 +1,21 @@
 import os
+import re
+import copy
+import json
+import shutil
+import uuid
+from datetime import datetime
 
 from finance_ml.constants import *
-from finance_ml.utils.common import read_yaml, create_directories
+from finance_ml.utils.common import read_yaml
 from finance_ml.entity.config_entity import (DataIngestionConfig,
+                                             BulkIngestionConfig,
+                                             TickerResolutionConfig,
+                                             LLMTickerConfig,
+                                             WatchlistTrainingConfig,
+                                             InstrumentationConfig,
+                                             HyperparameterSearchConfig,
+                                             BacktestConfig,
                                              DataValidationConfig,
                                              DataTransformationConfig,
                                              ModelTrainingConfig,
@@ -10,72 +23,297 @@ from finance_ml.entity.config_entity import (DataIngestionConfig,
                                              ModelEvaluationConfig,
                                              ModelPredictionConfig)
 
+# Format of the ids made by ConfigurationManager.new_run_id()
+RUN_ID_PATTERN = re.compile(r"\d{8}-\d{6}-[0-9a-f]{8}")
+# Marks a run directory as published; never copied into the runs seeded from it
+PUBLISHED_MARKER = ".published"
+
+
 class ConfigurationManager:
+    """Builds the stage configs from config.yaml, params.yaml and schema.yaml.
+
+    Without a ticker and run id every stage uses the fixed paths from config.yaml.
+    With both, every artifact path under artifacts_root is moved into
+    runs_root/<ticker>/<run_id>, so several pipeline runs can work side by side.
+    A finished run only becomes visible to readers once publish_run() is called.
+
+    Getting a config never creates directories, so readers such as the web
+    app leave no trace on disk; the components create the directories they
+    write to.
+    """
     def __init__(
         self,
         config_filepath=CONFIG_FILE_PATH,
         params_filepath=PARAMS_FILE_PATH,
-        schema_filepath=SCHEMA_FILE_PATH
+        schema_filepath=SCHEMA_FILE_PATH,
+        ticker=None,
+        run_id=None
     ):
         self.config = read_yaml(config_filepath)
         self.params = read_yaml(params_filepath)
         self.schema = read_yaml(schema_filepath)
 
-        create_directories([self.config.artifacts_root])
+        self.ticker = ticker
+        self.run_id = run_id
+        self.run_root = None
+        if ticker is not None and run_id is not None:
+            self.run_root = self.get_ticker_root(ticker) / run_id
+
+    def for_run(self, ticker, run_id) -> "ConfigurationManager":
+        """Returns a manager scoped to another run, reusing the already loaded YAML files."""
+        scoped = copy.copy(self)
+        scoped.ticker = ticker
+        scoped.run_id = run_id
+        scoped.run_root = self.get_ticker_root(ticker) / run_id
+        return scoped
+
+    @staticmethod
+    def new_run_id() -> str:
+        """Returns a sortable, unique id for a pipeline run."""
+        return f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+    def get_ticker_root(self, ticker) -> Path:
+        """Directory holding every run of a ticker. Characters that are not safe in paths are replaced."""
+        safe_ticker = re.sub(r"[^A-Za-z0-9._-]", "_", ticker)
+        # A leading dot would allow '.' and '..'
+        safe_ticker = re.sub(r"^\.", "_", safe_ticker) or "_"
+        return Path(self.config.runs_root) / safe_ticker
+
+    def run_exists(self, ticker, run_id) -> bool:
+        """True if run_id has the format of new_run_id() and the ticker has a run with that id."""
+        return (isinstance(run_id, str) and RUN_ID_PATTERN.fullmatch(run_id) is not None
+                and (self.get_ticker_root(ticker) / run_id).is_dir())
+
+    def _run_path(self, path) -> Path:
+        """Maps a path from config.yaml into the current run's namespace."""
+        if self.run_root is None:
+            return Path(path)
+        return self.run_root / Path(path).relative_to(self.config.artifacts_root)
+
+    def publish_run(self):
+        """Atomically marks the current run as the latest finished run of its ticker."""
+        if self.run_root is None:
+            return
+
+        ticker_root = self.get_ticker_root(self.ticker)
+        self.run_root.mkdir(parents=True, exist_ok=True)
+        # The run that was latest until now is marked too, it may have been published before runs were marked
+        previous_run_id = self.get_latest_run_id(self.ticker)
+        for run_id in (previous_run_id, self.run_id):
+            if run_id is not None and (ticker_root / run_id).is_dir():
+                (ticker_root / run_id / PUBLISHED_MARKER).touch()
+
+        latest_path = ticker_root / "latest.json"
+        tmp_path = ticker_root / f".latest.{self.run_id}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"run_id": self.run_id, "published_at": datetime.now().isoformat()}, f)
+        os.replace(tmp_path, latest_path)
+
+        self._prune_runs(ticker_root)
+
+    def _prune_runs(self, ticker_root: Path):
+        """Deletes the oldest published runs of a ticker, keeping runs_to_keep of them.
+
+        Only runs published and started no later than the current run are
+        candidates. Unpublished runs may still be writing and are never
+        deleted, whatever their age.
+        """
+        runs = sorted(
+            p for p in ticker_root.iterdir()
+            if p.is_dir() and p.name <= self.run_id and (p / PUBLISHED_MARKER).exists()
+        )
+        for old_run in runs[:max(0, len(runs) - self.config.runs_to_keep)]:
+            shutil.rmtree(old_run, ignore_errors=True)
+
+    def get_latest_run_id(self, ticker):
+        """Returns the id of the latest published run of a ticker, or None."""
+        latest_path = self.get_ticker_root(ticker) / "latest.json"
+        if not latest_path.exists():
+            return None
+        with open(latest_path) as f:
+            return json.load(f).get("run_id")
+
+    def seed_from_run(self, run_id) -> bool:
+        """Copies the artifacts of an earlier run of the ticker into the current run.
+
+        Used when only some stages run, so the skipped stages' outputs come from
+        the earlier run. Returns False if there is nothing to copy from.
+        """
+        if self.run_root is None or run_id is None:
+            return False
+        source = self.get_ticker_root(self.ticker) / run_id
+        if not source.is_dir():
+            return False
+        shutil.copytree(source, self.run_root, dirs_exist_ok=True, ignore=shutil.ignore_patterns(PUBLISHED_MARKER))
+        return True
 
     def get_data_ingestion_config(self) -> DataIngestionConfig:
         config = self.config.data_ingestion
         params = self.params.data_ingestion # Access data_ingestion params from params.yaml
 
-        create_directories([config.root_dir])
+        root_dir = self._run_path(config.root_dir)
 
         data_ingestion_config = DataIngestionConfig(
-            root_dir= Path(config.root_dir),
-            raw_data_file=os.path.join(config.root_dir, config.raw_data_file), 
-            period=params.period,     
-            interval=params.interval  
+            root_dir=root_dir,
+            raw_data_file=os.path.join(root_dir, config.raw_data_file),
+            period=params.period,
+            interval=params.interval,
+            store_dir=Path(config.store_dir),
+            provider=config.provider,
+            local_data_dir=Path(config.local_data_dir),
+            all_schemas=self.schema.COLUMNS
         )
 
         return data_ingestion_config
-    
+
+    def get_bulk_ingestion_config(self) -> BulkIngestionConfig:
+        config = self.config.data_ingestion
+        params = self.params.bulk_ingestion
+
+        bulk_ingestion_config = BulkIngestionConfig(
+            store_dir=Path(config.store_dir),
+            provider=config.provider,
+            local_data_dir=Path(config.local_data_dir),
+            period=self.params.data_ingestion.period,
+            interval=self.params.data_ingestion.interval,
+            batch_size=params.batch_size,
+            max_workers=params.max_workers,
+            max_retries=params.max_retries,
+            backoff_seconds=params.backoff_seconds
+        )
+
+        return bulk_ingestion_config
+
+    def get_ticker_resolution_config(self) -> TickerResolutionConfig:
+        config = self.config.ticker_resolution
+        params = self.params.ticker_resolution
+
+        ticker_resolution_config = TickerResolutionConfig(
+            symbol_list=Path(config.symbol_list),
+            cache_file=Path(config.cache_file),
+            positive_ttl_hours=params.positive_ttl_hours,
+            negative_ttl_hours=params.negative_ttl_hours
+        )
+
+        return ticker_resolution_config
+
+    def get_llm_ticker_config(self) -> LLMTickerConfig:
+        config = self.config.llm_ticker
+        params = self.params.llm_ticker
+
+        llm_ticker_config = LLMTickerConfig(
+            backend=config.backend,
+            pick_cache_file=Path(config.pick_cache_file),
+            pick_ttl_hours=params.pick_ttl_hours,
+            max_retries=params.max_retries,
+            retry_delay_seconds=params.retry_delay_seconds
+        )
+
+        return llm_ticker_config
+
+    def get_watchlist_training_config(self) -> WatchlistTrainingConfig:
+        config = self.config.watchlist_training
+        params = self.params.watchlist_training
+
+        watchlist_training_config = WatchlistTrainingConfig(
+            summary_file=Path(config.summary_file),
+            max_workers=params.max_workers,
+            threads_per_worker=params.threads_per_worker
+        )
+
+        return watchlist_training_config
+
+    def get_instrumentation_config(self) -> InstrumentationConfig:
+        config = self.config.instrumentation
+
+        instrumentation_config = InstrumentationConfig(
+            spans_file=Path(config.spans_file)
+        )
+
+        return instrumentation_config
+
+    def get_hyperparameter_search_config(self) -> HyperparameterSearchConfig:
+        config = self.config.hyperparameter_search
+        params = self.params.hyperparameter_search
+
+        hyperparameter_search_config = HyperparameterSearchConfig(
+            root_dir=Path(config.root_dir),
+            tracking_uri=Path(config.tracking_uri).resolve().as_uri(),
+            search_space={name: list(values) for name, values in params.search_space.items()},
+            num_trials=params.num_trials,
+            min_epochs=params.min_epochs,
+            max_epochs=params.max_epochs,
+            reduction_factor=params.reduction_factor,
+            max_workers=params.max_workers,
+            validation_split=params.validation_split
+        )
+
+        return hyperparameter_search_config
+
+    def get_backtest_config(self) -> BacktestConfig:
+        config = self.config.backtest
+        params = self.params.backtest
+
+        backtest_config = BacktestConfig(
+            root_dir=Path(config.root_dir),
+            n_folds=params.n_folds,
+            test_days=params.test_days,
+            train_window=params.train_window,
+            mode=params.mode,
+            epochs=params.epochs,
+            refit_epochs=params.refit_epochs,
+            max_workers=params.max_workers,
+            transaction_cost_bps=params.transaction_cost_bps
+        )
+
+        return backtest_config
+
     def get_data_validation_config(self) -> DataValidationConfig:
         config = self.config.data_Validation
         schema = self.schema.COLUMNS
 
-        create_directories([config.root_dir])
+        root_dir = self._run_path(config.root_dir)
 
         data_Validation_config = DataValidationConfig(
-            root_dir= Path(config.root_dir),
-            STATUS_FILE= config.STATUS_FILE,
-            data= Path(config.data),
-            all_schemas= schema  
+            root_dir=root_dir,
+            STATUS_FILE=str(self._run_path(config.STATUS_FILE)),
+            data=self._run_path(config.data),
+            all_schemas= schema,
+            REPORT_FILE=str(self._run_path(config.REPORT_FILE)),
+            chunk_size=self.params.data_validation.chunk_size,
+            max_gap_days=self.params.data_validation.max_gap_days
         )
 
         return data_Validation_config
-    
+
     def get_data_transformation_config(self) -> DataTransformationConfig: # Add this method
         config = self.config.data_transformation
         params = self.params.data_transformation
 
-        create_directories([config.root_dir])
+        root_dir = self._run_path(config.root_dir)
 
         data_transformation_config = DataTransformationConfig(
-            root_dir=Path(config.root_dir),
-            raw_data_file=Path(config.raw_data_file),
-            lookback=params.lookback
+            root_dir=root_dir,
+            raw_data_file=self._run_path(config.raw_data_file),
+            lookback=params.lookback,
+            features=list(params.features)
         )
 
         return data_transformation_config
-    
+
     def get_model_training_config(self) -> tuple[ModelTrainingConfig, ModelTrainingParams]: # Modify return type
         config = self.config.model_training
         params = self.params.model_training # Access parameters from params.yaml
 
-        create_directories([config.root_dir])
+        root_dir = self._run_path(config.root_dir)
 
         model_training_config = ModelTrainingConfig(
-            root_dir=config.root_dir,
-            trained_model_name=config.trained_model_name
+            root_dir=root_dir,
+            trained_model_name=config.trained_model_name,
+            X_train_path=self._run_path(config.X_train_path),
+            y_train_path=self._run_path(config.y_train_path),
+            scaler_path=self._run_path(config.scaler_path),
+            numpy_model_name=config.numpy_model_name
         )
 
         model_training_params = ModelTrainingParams(
@@ -84,38 +322,51 @@ class ConfigurationManager:
             lstm_units_1=params.lstm_units_1,
             lstm_units_2=params.lstm_units_2,
             dense_units_1=params.dense_units_1,
-            dropout_rate=params.dropout_rate
+            dropout_rate=params.dropout_rate,
+            shuffle_buffer=params.shuffle_buffer,
+            cache_dataset=params.cache_dataset,
+            intra_op_threads=params.intra_op_threads,
+            inter_op_threads=params.inter_op_threads,
+            deterministic=params.deterministic,
+            seed=params.seed
         )
 
-        return model_training_config, model_training_params # Return both 
-    
+        return model_training_config, model_training_params # Return both
+
     def get_model_evaluation_config(self) -> ModelEvaluationConfig:
         config = self.config.model_evaluation
 
-        create_directories([config.root_dir])
-    
         evaluation_config = ModelEvaluationConfig(
-            root_dir=config.root_dir,
-            metrics_file_name=config.metrics_file_name,
-            model_path=config.model_path,
-            X_test_path=config.X_test_path,
-            y_test_path=config.y_test_path
+            root_dir=self._run_path(config.root_dir),
+            metrics_file_name=str(self._run_path(config.metrics_file_name)),
+            model_path=str(self._run_path(config.model_path)),
+            X_test_path=str(self._run_path(config.X_test_path)),
+            y_test_path=str(self._run_path(config.y_test_path))
             )
 
         return evaluation_config
-    
+
     def get_model_prediction_config(self) -> ModelPredictionConfig: # Add the new method
         config = self.config.model_prediction
         params = self.params.data_transformation
 
-        create_directories([config.root_dir])
+        root_dir = self._run_path(config.root_dir)
 
         model_prediction_config = ModelPredictionConfig(
-            root_dir=config.root_dir,
-            trained_model_path=Path(config.trained_model_path), # Ensure Path type
-            input_data_path=Path(config.input_data_path), # Ensure Path type
+            root_dir=root_dir,
+            trained_model_path=self._run_path(config.trained_model_path), # Ensure Path type
+            input_data_path=self._run_path(config.input_data_path), # Ensure Path type
+            scaler_path=self._run_path(config.scaler_path),
             predictions_file_name=config.predictions_file_name,
-            lookback=params.lookback
+            history_db=Path(config.history_db),
+            legacy_history_csv=Path(config.legacy_history_csv),
+            lookback=params.lookback,
+            features=list(params.features),
+            model_cache_size=self.params.model_prediction.model_cache_size,
+            model_cache_memory_mb=self.params.model_prediction.model_cache_memory_mb,
+            horizon=self.params.model_prediction.horizon,
+            numpy_model_path=self._run_path(config.numpy_model_path),
+            engine=self.params.model_prediction.engine
         )
 
-        return model_prediction_config
\ No newline at end of file
+        return model_prediction_config
@@ -7,6 +7,78 @@ class DataIngestionConfig:
     raw_data_file: Path
     period: str
     interval: str
+    store_dir: Path
+    provider: str
+    local_data_dir: Path
+    all_schemas: dict = None # schema.yaml COLUMNS, the types raw_data_file is written with
+
+
+@dataclass(frozen=True)
+class BulkIngestionConfig:
+    store_dir: Path
+    provider: str
+    local_data_dir: Path
+    period: str
+    interval: str
+    batch_size: int
+    max_workers: int
+    max_retries: int
+    backoff_seconds: float
+
+
+@dataclass(frozen=True)
+class TickerResolutionConfig:
+    symbol_list: Path
+    cache_file: Path
+    positive_ttl_hours: float
+    negative_ttl_hours: float
+
+
+@dataclass(frozen=True)
+class LLMTickerConfig:
+    backend: str
+    pick_cache_file: Path
+    pick_ttl_hours: float
+    max_retries: int
+    retry_delay_seconds: float
+
+
+@dataclass(frozen=True)
+class HyperparameterSearchConfig:
+    root_dir: Path
+    tracking_uri: str
+    search_space: dict
+    num_trials: int
+    min_epochs: int
+    max_epochs: int
+    reduction_factor: int
+    max_workers: int
+    validation_split: float
+
+
+@dataclass(frozen=True)
+class BacktestConfig:
+    root_dir: Path
+    n_folds: int
+    test_days: int
+    train_window: int
+    mode: str
+    epochs: int
+    refit_epochs: int
+    max_workers: int
+    transaction_cost_bps: float
+
+
+@dataclass(frozen=True)
+class WatchlistTrainingConfig:
+    summary_file: Path
+    max_workers: int
+    threads_per_worker: int
+
+
+@dataclass(frozen=True)
+class InstrumentationConfig:
+    spans_file: Path
 
 
 @dataclass(frozen=True)
@@ -15,6 +87,9 @@ class DataValidationConfig:
     STATUS_FILE: str
     data: Path
     all_schemas: dict
+    REPORT_FILE: str = None
+    chunk_size: int = 50_000
+    max_gap_days: int = 5
 
 
 @dataclass(frozen=True)
@@ -22,11 +97,16 @@ class DataTransformationConfig:
     root_dir: Path
     raw_data_file: Path
     lookback: int
+    features: list
     
 @dataclass(frozen=True)
 class ModelTrainingConfig:
     root_dir: Path
     trained_model_name: str
+    X_train_path: Path
+    y_train_path: Path
+    scaler_path: Path
+    numpy_model_name: str
 
 @dataclass(frozen=True)
 class ModelTrainingParams: # Added a data class for model parameters
@@ -35,7 +115,13 @@ class ModelTrainingParams: # Added a data class for model parameters
     lstm_units_1: int
     lstm_units_2: int
     dense_units_1: int
-    dropout_rate: float    
+    dropout_rate: float
+    shuffle_buffer: int = 1024
+    cache_dataset: bool = True
+    intra_op_threads: int = 0
+    inter_op_threads: int = 0
+    deterministic: bool = False
+    seed: int = 42
 
 @dataclass(frozen=True)
 class ModelEvaluationConfig:
@@ -50,5 +136,14 @@ class ModelPredictionConfig:
     root_dir: Path
     trained_model_path: Path
     input_data_path: Path
+    scaler_path: Path
     predictions_file_name: str
-    lookback: int
\ No newline at end of file
+    history_db: Path
+    legacy_history_csv: Path
+    lookback: int
+    features: list
+    model_cache_size: int
+    model_cache_memory_mb: int
+    horizon: int = 1
+    numpy_model_path: Path = None
+    engine: str = "keras"
\ No newline at end of file
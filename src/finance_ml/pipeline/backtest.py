@@ -0,0 +1,158 @@
+import argparse
+import dataclasses
+import multiprocessing
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from finance_ml.config.configuration import ConfigurationManager
+from finance_ml.components.backtest import (FoldJob, regression_metrics, run_fold, strategy_metrics,
+                                            walk_forward_folds)
+from finance_ml.pipeline.bulk_data_ingestion import read_watchlist
+from finance_ml.pipeline.watchlist_training import _init_training_worker, available_cores, plan_workers
+from finance_ml.utils.columnar import read_frame
+from finance_ml.utils.common import save_json
+from finance_ml import logger
+
+STAGE_NAME = "Walk-forward Backtest stage"
+
+BACKTEST_MODES = ("retrain", "refit")
+
+
+class BacktestPipeline:
+    """Walk-forward backtest of the model on the data of each ticker's latest published run.
+
+    In 'retrain' mode every fold trains a new model and the folds run in
+    parallel. In 'refit' mode each fold continues training the model of the
+    fold before it on the newer rows, so the folds run one after another.
+    """
+    def __init__(self, tickers, mode=None, max_workers=None):
+        self.tickers = list(dict.fromkeys(t.strip().upper() for t in tickers if t.strip()))
+        self.mode = mode
+        self.max_workers = max_workers
+
+    def main(self):
+        """
+        Returns:
+            dict: 'reports' (ticker -> report, see backtest_ticker) and 'missing' (tickers without a published run)
+        """
+        config_manager = ConfigurationManager()
+        config = config_manager.get_backtest_config()
+        mode = self.mode or config.mode
+        if mode not in BACKTEST_MODES:
+            raise ValueError(f"Unknown backtest mode '{mode}', expected one of {BACKTEST_MODES}")
+        workers, threads = plan_workers(config.n_folds if mode == "retrain" else 1,
+                                        self.max_workers if self.max_workers is not None else config.max_workers,
+                                        0, available_cores())
+
+        reports, missing = {}, []
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=_init_training_worker, initargs=(threads,)) as executor:
+            for ticker in self.tickers:
+                run_id = config_manager.get_latest_run_id(ticker)
+                if run_id is None:
+                    missing.append(ticker)
+                    continue
+                run_config = config_manager.for_run(ticker, run_id)
+                reports[ticker] = self.backtest_ticker(executor, config, mode, ticker, run_id,
+                                                       run_config.get_data_transformation_config(),
+                                                       run_config.get_model_training_config()[1])
+        return {'reports': reports, 'missing': missing}
+
+    @staticmethod
+    def backtest_ticker(executor, config, mode, ticker, run_id, transformation_config, training_params) -> dict:
+        """Runs the folds of one ticker and saves <root_dir>/<ticker>/backtest_report.json.
+
+        Returns:
+            dict: metrics and strategy PnL of every fold, and of all folds' predictions together
+        """
+        ticker_dir = config.root_dir / re.sub(r"[^A-Za-z0-9._-]", "_", ticker)
+        ticker_dir.mkdir(parents=True, exist_ok=True)
+
+        features = list(transformation_config.features)
+        df = read_frame(transformation_config.raw_data_file, columns=list(dict.fromkeys(['Datetime'] + features)))
+        values = df[features].to_numpy(dtype=np.float64)
+        dates = df['Datetime'].dt.strftime('%Y-%m-%d').to_numpy()
+        folds = walk_forward_folds(len(values), transformation_config.lookback, config.n_folds,
+                                   config.test_days, config.train_window)
+        logger.info(f"Backtesting {ticker} on {len(folds)} folds of {config.test_days} rows ({mode})")
+
+        jobs = [FoldJob(
+            fold=fold,
+            values=values,
+            train_start=train_start,
+            test_start=test_start,
+            test_end=test_end,
+            lookback=transformation_config.lookback,
+            params=dataclasses.replace(training_params,
+                                       epochs=config.refit_epochs if mode == "refit" and fold else config.epochs),
+            checkpoint_path=str(ticker_dir / f"fold_{fold}.keras"),
+            init_model_path=str(ticker_dir / f"fold_{fold - 1}.keras") if mode == "refit" and fold else None,
+        ) for fold, (train_start, test_start, test_end) in enumerate(folds)]
+
+        if mode == "retrain":
+            results = list(executor.map(run_fold, jobs))
+        else:
+            results = [executor.submit(run_fold, job).result() for job in jobs]
+
+        fold_reports = []
+        for job, result in zip(jobs, results):
+            fold_reports.append({
+                'fold': job.fold,
+                'train_rows': job.test_start - job.train_start,
+                'test_start': dates[job.test_start],
+                'test_end': dates[job.test_end - 1],
+                **regression_metrics(result['y_true'], result['y_pred']),
+                **strategy_metrics(result['y_true'], result['y_pred'], result['previous_close'],
+                                   config.transaction_cost_bps),
+            })
+
+        y_true, y_pred, previous_close = (np.concatenate([result[key] for result in results])
+                                          for key in ('y_true', 'y_pred', 'previous_close'))
+        report = {
+            'ticker': ticker,
+            'run_id': run_id,
+            'mode': mode,
+            'overall': {**regression_metrics(y_true, y_pred),
+                        **strategy_metrics(y_true, y_pred, previous_close, config.transaction_cost_bps)},
+            'folds': fold_reports,
+        }
+        save_json(path=ticker_dir / "backtest_report.json", data=report)
+        return report
+
+
+def run_backtest(tickers, mode=None, max_workers=None) -> dict:
+    return BacktestPipeline(tickers, mode, max_workers).main()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Walk-forward backtest of the model of each ticker')
+    parser.add_argument('--tickers', type=str, help='Comma-separated tickers, e.g. RELIANCE.NS,TCS.NS')
+    parser.add_argument('--watchlist', type=str, help='File with one ticker per line')
+    parser.add_argument('--mode', choices=BACKTEST_MODES, help='Retrain every fold or refit the previous one (default: params.yaml)')
+    parser.add_argument('--workers', type=int, help='Folds trained at the same time (default: params.yaml)')
+    args = parser.parse_args()
+
+    tickers = []
+    if args.watchlist:
+        tickers.extend(read_watchlist(args.watchlist))
+    if args.tickers:
+        tickers.extend(t.strip() for t in args.tickers.split(',') if t.strip())
+    if not tickers:
+        parser.error('Provide --tickers or --watchlist')
+
+    try:
+        logger.info(f">>>>>> stage {STAGE_NAME} started <<<<<<")
+        result = run_backtest(tickers, args.mode, args.workers)
+        for ticker in result['missing']:
+            print(f"{ticker:<16} no published run to backtest, run the pipeline first")
+        for ticker, report in result['reports'].items():
+            overall = report['overall']
+            print(f"{ticker:<16} MAE {overall['mae_in_rupees']:.2f}  MAPE {overall['mape_percentage']:.2f}%  "
+                  f"directional accuracy {overall['directional_accuracy_percentage']:.1f}%  "
+                  f"strategy {overall['strategy_return_percentage']:+.1f}% vs buy and hold {overall['buy_and_hold_return_percentage']:+.1f}%")
+        logger.info(f">>>>>> stage {STAGE_NAME} completed <<<<<<\n\nx==========x")
+    except Exception as e:
+        logger.exception(e)
+        raise e
@@ -0,0 +1,67 @@
+import argparse
+
+from finance_ml.config.configuration import ConfigurationManager
+from finance_ml.components.prediction import ModelPrediction
+from finance_ml.pipeline.bulk_data_ingestion import read_watchlist
+from finance_ml.utils.spans import configure_spans, span
+from finance_ml import logger
+
+STAGE_NAME = "Batch Prediction stage"
+
+class BatchPredictionPipeline:
+    """Scores many tickers with the models of their latest published runs, without retraining."""
+    def __init__(self, tickers):
+        self.tickers = list(dict.fromkeys(t.strip().upper() for t in tickers if t.strip()))
+
+    def main(self):
+        """
+        Returns:
+            dict: 'predictions' (list of ticker, predicted_date, predicted_close_price),
+                  'missing' (tickers without a published run) and 'failed' (ticker -> error)
+        """
+        config_manager = ConfigurationManager()
+        configure_spans(config_manager.get_instrumentation_config().spans_file)
+        configs, missing = {}, []
+        for ticker in self.tickers:
+            run_id = config_manager.get_latest_run_id(ticker)
+            if run_id is None:
+                missing.append(ticker)
+                continue
+            configs[ticker] = config_manager.for_run(ticker, run_id).get_model_prediction_config()
+
+        with span("batch_prediction", tickers=len(configs)):
+            predictions_df, failed = ModelPrediction.predict_many(configs)
+        return {
+            'predictions': predictions_df.to_dict(orient='records'),
+            'missing': missing,
+            'failed': failed,
+        }
+
+
+def run_batch_prediction(tickers) -> dict:
+    return BatchPredictionPipeline(tickers=tickers).main()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Predict the next close of a watchlist with the already trained models')
+    parser.add_argument('--tickers', type=str, help='Comma-separated tickers, e.g. RELIANCE.NS,TCS.NS')
+    parser.add_argument('--watchlist', type=str, help='File with one ticker per line')
+    args = parser.parse_args()
+
+    tickers = []
+    if args.watchlist:
+        tickers.extend(read_watchlist(args.watchlist))
+    if args.tickers:
+        tickers.extend(t.strip() for t in args.tickers.split(',') if t.strip())
+    if not tickers:
+        parser.error('Provide --tickers or --watchlist')
+
+    try:
+        logger.info(f">>>>>> stage {STAGE_NAME} started <<<<<<")
+        result = run_batch_prediction(tickers)
+        for row in result['predictions']:
+            print(f"{row['ticker']:<16} {row['predicted_date']}  {row['predicted_close_price']:.2f}")
+        logger.info(f">>>>>> stage {STAGE_NAME} completed <<<<<<\n\nx==========x")
+    except Exception as e:
+        logger.exception(e)
+        raise e
@@ -0,0 +1,50 @@
+import argparse
+from pathlib import Path
+
+from finance_ml.config.configuration import ConfigurationManager
+from finance_ml.components.bulk_ingestion import BulkDataIngestion
+from finance_ml import logger
+
+STAGE_NAME = "Bulk Data Ingestion stage"
+
+class BulkDataIngestionPipeline:
+    def __init__(self, tickers):
+        self.tickers = tickers
+
+    def main(self):
+        config = ConfigurationManager()
+        bulk_ingestion_config = config.get_bulk_ingestion_config()
+
+        bulk_ingestion = BulkDataIngestion(config=bulk_ingestion_config)
+        return bulk_ingestion.ingest(self.tickers)
+
+
+def read_watchlist(path):
+    """Reads one ticker per line, ignoring blank lines and '#' comments."""
+    with open(Path(path)) as f:
+        lines = [line.split('#')[0].strip() for line in f]
+    return [line for line in lines if line]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Update the OHLCV store for a watchlist of tickers')
+    parser.add_argument('--tickers', type=str, help='Comma-separated tickers, e.g. RELIANCE.NS,TCS.NS')
+    parser.add_argument('--watchlist', type=str, help='File with one ticker per line')
+    args = parser.parse_args()
+
+    tickers = []
+    if args.watchlist:
+        tickers.extend(read_watchlist(args.watchlist))
+    if args.tickers:
+        tickers.extend(t.strip() for t in args.tickers.split(',') if t.strip())
+    if not tickers:
+        parser.error('Provide --tickers or --watchlist')
+
+    try:
+        logger.info(f">>>>>> stage {STAGE_NAME} started <<<<<<")
+        obj = BulkDataIngestionPipeline(tickers=tickers)
+        obj.main()
+        logger.info(f">>>>>> stage {STAGE_NAME} completed <<<<<<\n\nx==========x")
+    except Exception as e:
+        logger.exception(e)
+        raise e
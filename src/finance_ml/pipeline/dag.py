@@ -0,0 +1,79 @@
+import contextvars
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable
+
+from finance_ml import logger
+
+
+@dataclass
+class StageTask:
+    """A stage of a run with the artifact paths it reads and writes."""
+    key: str
+    run: Callable[[], object]
+    inputs: list = field(default_factory=list)
+    outputs: list = field(default_factory=list)
+
+
+def stage_dependencies(tasks) -> dict:
+    """Works out which tasks each task waits for.
+
+    A task depends on every earlier task that writes one of its inputs. Inputs
+    no task writes are taken from disk as they are, e.g. from the run the
+    current one was seeded from.
+
+    Returns:
+        dict: task key -> set of the keys of the tasks it depends on
+    """
+    writers = {}
+    dependencies = {}
+    for task in tasks:
+        dependencies[task.key] = {writers[path] for path in map(os.path.abspath, task.inputs) if path in writers}
+        for path in task.outputs:
+            writers[os.path.abspath(path)] = task.key
+    return dependencies
+
+
+class DagExecutor:
+    """Runs stage tasks on a thread pool, each as soon as the tasks it depends on have finished.
+
+    Tasks share the process, so they can hand values to each other in memory
+    (see Handoff). Independent tasks run at the same time, e.g. evaluation and
+    prediction, which both only wait for training. After a failure no new task
+    starts; the running ones finish and the first error is raised.
+    """
+
+    def __init__(self, tasks, max_workers=None):
+        self.tasks = {task.key: task for task in tasks}
+        self.dependencies = stage_dependencies(tasks)
+        self.max_workers = max_workers or len(self.tasks) or 1
+
+    def run(self) -> dict:
+        """
+        Returns:
+            dict: task key -> return value of its run()
+        """
+        results, pending, running = {}, dict(self.tasks), {}
+        error = None
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="stage") as executor:
+            while pending or running:
+                if error is None:
+                    for key in [key for key in pending if self.dependencies[key] <= results.keys()]:
+                        # A copy of the context per task keeps the open span as the parent of the task's spans
+                        running[executor.submit(contextvars.copy_context().run, pending.pop(key).run)] = key
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key = running.pop(future)
+                    try:
+                        results[key] = future.result()
+                    except Exception as e:
+                        error = error or e
+        if error is not None:
+            if pending:
+                logger.warning(f"Not running {', '.join(pending)} after a failed stage")
+            raise error
+        return results
@@ -0,0 +1,161 @@
+import argparse
+import dataclasses
+import multiprocessing
+import re
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from finance_ml.config.configuration import ConfigurationManager
+from finance_ml.components.hyperparameter_search import (AshaScheduler, TrialJob, grid_size, run_trial,
+                                                         sample_configurations, successive_halving_rungs)
+from finance_ml.pipeline.bulk_data_ingestion import read_watchlist
+from finance_ml.pipeline.watchlist_training import _init_training_worker, available_cores, plan_workers
+from finance_ml.utils.common import save_json
+from finance_ml import logger
+
+STAGE_NAME = "Hyperparameter Search stage"
+
+
+class HyperparameterSearchPipeline:
+    """Searches the model_training params of every ticker with ASHA on a pool of worker processes.
+
+    Trials train on the X_train/y_train of the ticker's latest published run and
+    are ranked on its most recent windows. Every trial is an MLflow run in the
+    local file store of hyperparameter_search.tracking_uri.
+    """
+    def __init__(self, tickers, max_workers=None):
+        self.tickers = list(dict.fromkeys(t.strip().upper() for t in tickers if t.strip()))
+        self.max_workers = max_workers
+
+    def main(self):
+        """
+        Returns:
+            dict: 'searches' (ticker -> summary, see search_ticker) and 'missing' (tickers without a published run)
+        """
+        config_manager = ConfigurationManager()
+        config = config_manager.get_hyperparameter_search_config()
+        workers, threads = plan_workers(config.num_trials,
+                                        self.max_workers if self.max_workers is not None else config.max_workers,
+                                        0, available_cores())
+        logger.info(f"Running trials on {workers} workers with {threads} threads each")
+
+        summaries, missing = {}, []
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=_init_training_worker, initargs=(threads,)) as executor:
+            for ticker in self.tickers:
+                run_id = config_manager.get_latest_run_id(ticker)
+                if run_id is None:
+                    missing.append(ticker)
+                    continue
+                training_config, base_params = config_manager.for_run(ticker, run_id).get_model_training_config()
+                summaries[ticker] = self.search_ticker(executor, workers, config, ticker, training_config, base_params)
+        return {'searches': summaries, 'missing': missing}
+
+    @staticmethod
+    def search_ticker(executor, workers, config, ticker, training_config, base_params) -> dict:
+        """Runs the ASHA search of one ticker and saves <root_dir>/<ticker>/best_params.json.
+
+        Returns:
+            dict: best 'model_training' params and their 'val_loss', every trial, and the epochs
+                  trained against the epochs an exhaustive grid search would have trained
+        """
+        ticker_dir = config.root_dir / re.sub(r"[^A-Za-z0-9._-]", "_", ticker)
+        (ticker_dir / "trials").mkdir(parents=True, exist_ok=True)
+
+        configurations = sample_configurations(config.search_space, config.num_trials, seed=base_params.seed)
+        trial_params = [dataclasses.replace(base_params, **values, epochs=config.max_epochs) for values in configurations]
+        rungs = successive_halving_rungs(config.min_epochs, config.max_epochs, config.reduction_factor)
+        scheduler = AshaScheduler(len(configurations), rungs, config.reduction_factor)
+        logger.info(f"Searching {len(configurations)} configurations for {ticker}, rungs at {rungs} epochs")
+
+        mlflow_run_ids, epochs_done = {}, {}
+        in_flight = {}
+        while True:
+            while len(in_flight) < workers:
+                job = scheduler.next_job()
+                if job is None:
+                    break
+                trial_id, rung = job
+                trial_job = TrialJob(
+                    trial_id=trial_id,
+                    params=trial_params[trial_id],
+                    X_train_path=str(training_config.X_train_path),
+                    y_train_path=str(training_config.y_train_path),
+                    checkpoint_path=str(ticker_dir / "trials" / f"trial_{trial_id}.keras"),
+                    initial_epoch=epochs_done.get(trial_id, 0),
+                    epochs=rungs[rung],
+                    validation_split=config.validation_split,
+                    tracking_uri=config.tracking_uri,
+                    experiment_name=f"FinSight_Hyperparameter_Search_{ticker}",
+                    mlflow_run_id=mlflow_run_ids.get(trial_id),
+                )
+                in_flight[executor.submit(run_trial, trial_job)] = trial_job, rung
+            if not in_flight:
+                break
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                trial_job, rung = in_flight.pop(future)
+                try:
+                    result = future.result()
+                    mlflow_run_ids[trial_job.trial_id] = result['mlflow_run_id']
+                    loss = result['loss']
+                except Exception as e:
+                    logger.exception(e)
+                    loss = None
+                epochs_done[trial_job.trial_id] = trial_job.epochs
+                scheduler.report(trial_job.trial_id, rung, loss)
+                logger.info(f"{ticker} trial {trial_job.trial_id}: val_loss {loss} after {trial_job.epochs} epochs")
+
+        best = scheduler.best()
+        epochs_trained = sum(epochs_done.values())
+        exhaustive_epochs = grid_size(config.search_space) * config.max_epochs
+        summary = {
+            'ticker': ticker,
+            'val_loss': best[2] if best else None,
+            'best_trial': best[0] if best else None,
+            'model_training': dataclasses.asdict(trial_params[best[0]]) if best else None,
+            'epochs_trained': epochs_trained,
+            'exhaustive_grid_epochs': exhaustive_epochs,
+            'compute_fraction': round(epochs_trained / exhaustive_epochs, 3),
+            'trials': [{'trial_id': trial_id, **configurations[trial_id], 'epochs': epochs_done.get(trial_id, 0),
+                        'val_loss': scheduler.losses[rungs.index(epochs_done[trial_id])].get(trial_id)
+                        if trial_id in epochs_done else None}
+                       for trial_id in range(len(configurations))],
+        }
+        save_json(path=ticker_dir / "best_params.json", data=summary)
+        return summary
+
+
+def run_hyperparameter_search(tickers, max_workers=None) -> dict:
+    return HyperparameterSearchPipeline(tickers, max_workers).main()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Search the model_training params of each ticker with ASHA early stopping')
+    parser.add_argument('--tickers', type=str, help='Comma-separated tickers, e.g. RELIANCE.NS,TCS.NS')
+    parser.add_argument('--watchlist', type=str, help='File with one ticker per line')
+    parser.add_argument('--workers', type=int, help='Trials trained at the same time (default: params.yaml)')
+    args = parser.parse_args()
+
+    tickers = []
+    if args.watchlist:
+        tickers.extend(read_watchlist(args.watchlist))
+    if args.tickers:
+        tickers.extend(t.strip() for t in args.tickers.split(',') if t.strip())
+    if not tickers:
+        parser.error('Provide --tickers or --watchlist')
+
+    try:
+        logger.info(f">>>>>> stage {STAGE_NAME} started <<<<<<")
+        result = run_hyperparameter_search(tickers, args.workers)
+        for ticker in result['missing']:
+            print(f"{ticker:<16} no published run to search on, run the pipeline first")
+        for ticker, summary in result['searches'].items():
+            best = summary['model_training']
+            print(f"{ticker:<16} val_loss {summary['val_loss']:.4f}  {best}")
+            print(f"{'':<16} {summary['epochs_trained']} epochs trained, "
+                  f"{summary['compute_fraction']:.0%} of an exhaustive grid ({summary['exhaustive_grid_epochs']})")
+        logger.info(f">>>>>> stage {STAGE_NAME} completed <<<<<<\n\nx==========x")
+    except Exception as e:
+        logger.exception(e)
+        raise e
@@ -0,0 +1,139 @@
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional
+
+from finance_ml import logger
+from finance_ml.utils.exceptions import JobQueueFullError
+
+
+@dataclass
+class PipelineJob:
+    job_id: str
+    choice: str
+    ticker: Optional[str]
+    submitted_at: datetime
+    future: Future = field(repr=False)
+    finished_at: Optional[datetime] = None
+
+    @property
+    def status(self) -> str:
+        if self.future.cancelled():
+            return "cancelled"
+        if self.future.done():
+            return "failed" if self.future.exception() is not None else "completed"
+        if self.future.running():
+            return "running"
+        return "queued"
+
+    @property
+    def done(self) -> bool:
+        return self.future.done()
+
+    def to_dict(self) -> dict:
+        """JSON-serializable view of the job used by the status endpoint."""
+        data = {
+            "job_id": self.job_id,
+            "status": self.status,
+            "choice": self.choice,
+            "ticker": self.ticker,
+            "submitted_at": self.submitted_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+        if data["status"] == "completed":
+            data["result"] = self.future.result()
+        elif data["status"] == "failed":
+            data["error"] = str(self.future.exception())
+        return data
+
+
+class JobManager:
+    """Tracks pipeline jobs submitted to a PipelineRunner.
+
+    The runner's worker pool is the concurrency limit; the manager only bounds
+    how many jobs may wait in front of it and how many finished jobs are kept
+    around for status polling.
+    """
+
+    def __init__(self, runner, max_pending: int = 16, max_finished: int = 256, on_job_done=None):
+        self.runner = runner
+        self.max_pending = max_pending
+        self.max_finished = max_finished
+        # Called with every job once it has finished, e.g. to record its duration
+        self.on_job_done = on_job_done
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, choice, ticker=None) -> PipelineJob:
+        """Queues a pipeline run and returns its job.
+
+        Raises:
+            JobQueueFullError: if max_pending jobs are already queued or running
+        """
+        return self._queue(choice, ticker, lambda: self.runner.submit(choice, ticker))
+
+    def submit_batch(self, tickers) -> PipelineJob:
+        """Queues a batch prediction of tickers from their latest runs and returns its job.
+
+        Raises:
+            JobQueueFullError: if max_pending jobs are already queued or running
+        """
+        tickers = list(tickers)
+        return self._queue("predict_batch", ",".join(tickers), lambda: self.runner.submit_batch(tickers))
+
+    def _queue(self, choice, ticker, submit) -> PipelineJob:
+        with self._lock:
+            if self.pending_count() >= self.max_pending:
+                raise JobQueueFullError(f"{self.max_pending} pipeline jobs are already pending")
+            self._evict_finished()
+
+            job_id = uuid.uuid4().hex
+            future = submit()
+            job = PipelineJob(
+                job_id=job_id,
+                choice=choice,
+                ticker=ticker,
+                submitted_at=datetime.now(),
+                future=future,
+            )
+            self._jobs[job_id] = job
+
+        future.add_done_callback(lambda f: self._on_job_done(job))
+        logger.info(f"Pipeline job {job_id} queued (choice={choice}, ticker={ticker})")
+        return job
+
+    def get(self, job_id) -> Optional[PipelineJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def pending_count(self) -> int:
+        return sum(1 for job in self._jobs.values() if not job.done)
+
+    def status_counts(self) -> dict:
+        """Number of jobs per status, e.g. {'queued': 2, 'running': 1}."""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        counts = {}
+        for job in jobs:
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return counts
+
+    def _on_job_done(self, job: PipelineJob):
+        job.finished_at = datetime.now()
+        if job.status == "failed":
+            logger.error(f"Pipeline job {job.job_id} failed: {job.future.exception()}")
+        else:
+            logger.info(f"Pipeline job {job.job_id} {job.status}")
+        if self.on_job_done is not None:
+            try:
+                self.on_job_done(job)
+            except Exception as e:
+                logger.warning(f"on_job_done failed for pipeline job {job.job_id}: {e}")
+
+    def _evict_finished(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[:max(0, len(finished) - self.max_finished + 1)]:
+            del self._jobs[job_id]
@@ -0,0 +1,384 @@
+import multiprocessing
+import os
+import signal
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from finance_ml import logger
+from finance_ml.utils.exceptions import PipelineTimeoutError
+
+# Queue the worker processes report job starts on, set by _init_worker
+_job_events = None
+
+
+def _warm_up_worker():
+    """Imports the stage modules once per worker so TensorFlow, MLflow and
+    yfinance are already loaded when the first pipeline request arrives.
+    The LLM agents are only built when a run first asks for them."""
+    from finance_ml.pipeline.stage_registry import STAGES
+    for stage in STAGES:
+        try:
+            stage.load()
+        except ImportError as e:
+            # e.g. a serving-only install without TensorFlow can still predict with the NumPy engine
+            logger.warning(f"{stage.name} is not available in this worker: {e}")
+    logger.info("Pipeline worker warmed up")
+
+
+def _init_worker(job_events):
+    global _job_events
+    _job_events = job_events
+    _warm_up_worker()
+
+
+def _ping():
+    return True
+
+
+def _run_job(job_key, func, args):
+    """Runs func(*args) in a worker, first telling the runner the job has left the queue."""
+    _job_events.put((job_key, os.getpid()))
+    return func(*args)
+
+
+def _stage_io(config_manager) -> dict:
+    """Artifact paths each stage reads and writes, and the params its stage cache entry depends on.
+
+    Returns:
+        dict: stage key -> (inputs, outputs, params, cached); stages with cached False always run
+    """
+    ingestion_config = config_manager.get_data_ingestion_config()
+    validation_config = config_manager.get_data_validation_config()
+    transformation_config = config_manager.get_data_transformation_config()
+    training_config, _ = config_manager.get_model_training_config()
+    evaluation_config = config_manager.get_model_evaluation_config()
+    prediction_config = config_manager.get_model_prediction_config()
+    return {
+        "ingest": ([], [ingestion_config.raw_data_file], None, False),
+        "validate": ([validation_config.data],
+                     [validation_config.STATUS_FILE, validation_config.REPORT_FILE],
+                     {"schema": config_manager.schema, "params": config_manager.params.data_validation}, True),
+        "transform": ([transformation_config.raw_data_file, validation_config.REPORT_FILE],
+                      [training_config.X_train_path, training_config.y_train_path,
+                       evaluation_config.X_test_path, evaluation_config.y_test_path,
+                       prediction_config.scaler_path],
+                      config_manager.params.data_transformation, True),
+        "train": ([training_config.X_train_path, training_config.y_train_path, training_config.scaler_path],
+                  [evaluation_config.model_path, prediction_config.numpy_model_path],
+                  config_manager.params.model_training, True),
+        "evaluate": ([evaluation_config.model_path, evaluation_config.X_test_path,
+                      evaluation_config.y_test_path, prediction_config.scaler_path],
+                     [evaluation_config.metrics_file_name,
+                      Path(evaluation_config.metrics_file_name).parent / "visualizations" / "prediction_visualization.png"],
+                     None, True),
+        "predict": ([prediction_config.input_data_path, validation_config.REPORT_FILE,
+                     prediction_config.trained_model_path, prediction_config.numpy_model_path,
+                     prediction_config.scaler_path],
+                    [], None, False),
+    }
+
+
+def _validate_legacy_runs(config_manager, selected, stage_io) -> list:
+    """Adds the validate stage if a selected stage needs the run's validation report and it has none.
+
+    Runs published before the validation report existed only have status.txt,
+    so a run seeded from one validates its data again first.
+    """
+    from finance_ml.pipeline.stage_registry import parse_stages
+
+    report_file = config_manager.get_data_validation_config().REPORT_FILE
+    if "validate" in selected or Path(report_file).exists():
+        return selected
+    if not any(report_file in stage_io[key][0] for key in selected):
+        return selected
+    logger.info(f"No validation report at {report_file}, validating the run's data first")
+    return parse_stages(selected + ["validate"])
+
+
+def _run_stage(stage, pipeline, stage_cache, handoff, stage_seconds, inputs, outputs, params, cached):
+    """Runs one stage in a span, through the stage cache if it is cached.
+
+    Records the stage's wall time in stage_seconds and returns what the stage's main() returns.
+    """
+    from finance_ml.utils.spans import span
+
+    try:
+        logger.info(f">>>>>> {stage.name} started <<<<<<")
+        with span("stage", stage=stage.key) as record:
+            # Values from an earlier attempt at these outputs must not outlive the files they came from
+            handoff.discard(outputs)
+            if cached:
+                record["restored_from_cache"] = stage_cache.run(
+                    stage.name, pipeline.main, inputs=inputs, outputs=outputs, params=params,
+                    code=stage.load_code_modules())
+                result = None
+            else:
+                result = pipeline.main()
+        stage_seconds[stage.key] = record["wall_seconds"]
+        logger.info(f">>>>>> {stage.name} completed in {record['wall_seconds']:.1f}s <<<<<<\n\nx==========x")
+        return result
+    except Exception as e:
+        logger.exception(e)
+        raise e
+
+
+def run_pipeline_stages(choice, ticker=None, force=False, stages=None) -> dict:
+    """Runs the pipeline stages in the current process.
+
+    Every stage writes into its own run namespace (see ConfigurationManager),
+    so several runs may execute at the same time. The run is published as the
+    ticker's latest run only after its last stage succeeds.
+
+    The stages form a DAG: each stage waits only for the selected stages that
+    write its inputs (see _stage_io), so evaluation and prediction run at the
+    same time once training is done. Stages share one ConfigurationManager and
+    hand DataFrames, arrays and the trained model to each other in memory,
+    every artifact is still written to the run directory.
+
+    Validation, transformation, training and evaluation go through the stage
+    cache: when their input data, params and code are unchanged since an
+    earlier run, their outputs are reused instead of being recomputed.
+
+    Stage modules are imported from the stage registry only when they run, so
+    a subset of stages does not pay for TensorFlow or MLflow unless it needs
+    them. When only some stages run, the new run starts from a copy of the
+    ticker's latest published run.
+
+    Args:
+        choice (str): '1' for a manual ticker, '2' for the LLM agent
+        ticker (str, optional): company name or ticker symbol for choice '1'
+        force (bool, optional): run every stage even if its outputs are cached
+        stages (str or list, optional): stage keys to run, e.g. 'ingest,predict'. Defaults to all
+
+    Every stage and its main steps are recorded as spans in the
+    instrumentation spans_file (see finance_ml.utils.spans).
+
+    Returns:
+        dict: prediction returned by ModelPrediction.predict (if the predict stage ran), plus the run_id
+              and the wall time of every stage that ran in 'stage_seconds'
+    """
+    from finance_ml.config.configuration import ConfigurationManager
+    from finance_ml.pipeline.dag import DagExecutor, StageTask
+    from finance_ml.pipeline.stage_cache import StageCache
+    from finance_ml.pipeline.stage_registry import get_stage, parse_stages
+    from finance_ml.utils.handoff import Handoff
+    from finance_ml.utils.spans import configure_spans, span
+
+    selected = parse_stages(stages)
+
+    stage = get_stage("ticker")
+    try:
+        logger.info(f">>>>>> {stage.name} started <<<<<<")
+        ticker_pipeline = stage.load()()
+        if choice == '1':
+            if ticker is None:
+                ticker = ticker_pipeline.main(choice=choice)
+            else:
+                ticker = ticker_pipeline.main(choice=choice, ticker=ticker)
+        else:
+            ticker = ticker_pipeline.main(choice=choice)
+        logger.info(f">>>>>> {stage.name} completed <<<<<<\n\nx==========x")
+    except Exception as e:
+        logger.exception(e)
+        raise e
+
+    run_id = ConfigurationManager.new_run_id()
+    logger.info(f"Pipeline run {run_id} started for {ticker}: {', '.join(selected)}")
+    config_manager = ConfigurationManager(ticker=ticker, run_id=run_id)
+    configure_spans(config_manager.get_instrumentation_config().spans_file)
+    if len(selected) < len(parse_stages()):
+        previous_run_id = config_manager.get_latest_run_id(ticker)
+        if not config_manager.seed_from_run(previous_run_id):
+            logger.warning(f"No published run of {ticker} to take the skipped stages' outputs from")
+
+    stage_io = _stage_io(config_manager)
+    selected = _validate_legacy_runs(config_manager, selected, stage_io)
+
+    stage_cache = StageCache(config_manager.config.stage_cache_dir, force=force,
+                             max_entries=config_manager.config.stage_cache_entries_per_stage)
+    handoff = Handoff()
+    stage_seconds = {}
+    tasks = []
+    for key in selected:
+        stage = get_stage(key)
+        inputs, outputs, params, cached = stage_io[key]
+        pipeline = stage.load()(ticker=ticker, run_id=run_id, config_manager=config_manager, handoff=handoff)
+        tasks.append(StageTask(
+            key=key,
+            run=partial(_run_stage, stage, pipeline, stage_cache, handoff, stage_seconds,
+                        inputs, outputs, params, cached),
+            inputs=inputs,
+            outputs=outputs,
+        ))
+    with span("pipeline", ticker=ticker, run_id=run_id, stages=selected):
+        results = DagExecutor(tasks).run()
+
+    config_manager.publish_run()
+    logger.info(f"Pipeline run {run_id} published for {ticker}")
+
+    result = results.get("predict") or {}
+    result['run_id'] = run_id
+    result['stage_seconds'] = stage_seconds
+    return result
+
+
+@dataclass
+class _RunnerJob:
+    func: object
+    args: tuple
+    future: Future = field(default_factory=Future)
+    pid: int = None
+    started_at: float = None
+    timed_out: bool = False
+
+
+class PipelineRunner:
+    """Long-lived pool of warm worker processes that run the full pipeline.
+
+    Workers are started with the 'spawn' method (TensorFlow is not fork-safe)
+    and import every stage module once, so each request only pays for the
+    actual ingestion, training and prediction work.
+
+    submit() returns a Future of the runner, not of the pool: a pool also
+    reports jobs that only wait in its call queue as running, so the
+    runner's futures turn running when a worker reports that it has started
+    the job.
+
+    A job running longer than job_timeout seconds has its worker killed and
+    fails with PipelineTimeoutError. A dead worker breaks the whole pool, so
+    the runner then starts a new one: jobs that had not started yet are run
+    on it, jobs that were running on the old pool fail.
+    """
+
+    def __init__(self, max_workers: int = 1, job_timeout: float = None):
+        self.max_workers = max_workers
+        self.job_timeout = job_timeout
+        self._context = multiprocessing.get_context("spawn")
+        self._job_events = self._context.Queue()
+        self._jobs = {}
+        self._lock = threading.RLock()
+        self._executor = self._new_executor()
+        self._stopped = threading.Event()
+        self._listener = threading.Thread(target=self._listen, name="pipeline-job-events", daemon=True)
+        self._listener.start()
+        if job_timeout:
+            threading.Thread(target=self._watch_timeouts, name="pipeline-job-timeouts", daemon=True).start()
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=self._context,
+            initializer=_init_worker,
+            initargs=(self._job_events,),
+        )
+
+    def _replace_broken_executor(self, executor):
+        """Starts a new pool in place of executor, unless that already happened."""
+        if executor is self._executor:
+            logger.error("A pipeline worker died, starting a new worker pool")
+            self._executor = self._new_executor()
+            executor.shutdown(wait=False)
+
+    def warm_up(self):
+        """Starts every worker ahead of the first request."""
+        futures = [self._executor.submit(_ping) for _ in range(self.max_workers)]
+        for future in futures:
+            future.result()
+
+    def _submit(self, func, *args) -> Future:
+        key = uuid.uuid4().hex
+        job = _RunnerJob(func, args)
+        with self._lock:
+            self._jobs[key] = job
+            self._dispatch(key, job)
+        return job.future
+
+    def _dispatch(self, key, job):
+        executor = self._executor
+        try:
+            pool_future = executor.submit(_run_job, key, job.func, job.args)
+        except BrokenProcessPool:
+            # The pool broke and its futures have not been failed yet
+            self._replace_broken_executor(executor)
+            executor = self._executor
+            pool_future = executor.submit(_run_job, key, job.func, job.args)
+        pool_future.add_done_callback(partial(self._on_pool_future_done, key, executor))
+
+    def _listen(self):
+        """Marks jobs as running when their worker reports the start."""
+        while True:
+            event = self._job_events.get()
+            if event is None:
+                return
+            key, pid = event
+            with self._lock:
+                job = self._jobs.get(key)
+                if job is not None and not job.future.done():
+                    job.pid, job.started_at = pid, time.monotonic()
+                    job.future.set_running_or_notify_cancel()
+
+    def _watch_timeouts(self):
+        """Kills the worker of every job that has been running for longer than job_timeout."""
+        while not self._stopped.wait(min(self.job_timeout, 1.0)):
+            now = time.monotonic()
+            with self._lock:
+                expired = [job for job in self._jobs.values()
+                           if job.started_at is not None and not job.timed_out and now - job.started_at > self.job_timeout]
+                for job in expired:
+                    job.timed_out = True
+                    logger.error(f"Pipeline job on worker {job.pid} exceeded {self.job_timeout}s, killing the worker")
+                    try:
+                        # Windows has no SIGKILL; os.kill terminates the process there for any signal
+                        os.kill(job.pid, getattr(signal, "SIGKILL", signal.SIGTERM))
+                    except ProcessLookupError:
+                        pass
+
+    def _on_pool_future_done(self, key, executor, pool_future):
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is None or job.future.done():
+                self._jobs.pop(key, None)
+                return
+            error = None if pool_future.cancelled() else pool_future.exception()
+            if isinstance(error, BrokenProcessPool):
+                self._replace_broken_executor(executor)
+                if job.started_at is None:
+                    # The job never reached a worker, so it can run on the new pool
+                    self._dispatch(key, job)
+                    return
+                if job.timed_out:
+                    error = PipelineTimeoutError(f"Pipeline job did not finish within {self.job_timeout}s")
+            self._jobs.pop(key)
+            if pool_future.cancelled():
+                if not job.future.cancel():
+                    job.future.set_exception(CancelledError())
+            elif error is not None:
+                job.future.set_exception(error)
+            else:
+                job.future.set_result(pool_future.result())
+
+    def submit(self, choice, ticker=None, force=False, stages=None) -> Future:
+        """Queues a pipeline run and returns its Future."""
+        logger.info(f"Submitting pipeline run: choice={choice}, ticker={ticker}, force={force}, stages={stages}")
+        return self._submit(run_pipeline_stages, choice, ticker, force, stages)
+
+    def run(self, choice, ticker=None, timeout=None, force=False, stages=None) -> dict:
+        """Runs the pipeline on a warm worker and waits for its prediction."""
+        return self.submit(choice, ticker, force=force, stages=stages).result(timeout=timeout)
+
+    def submit_batch(self, tickers) -> Future:
+        """Queues the scoring of a list of tickers, see BatchPredictionPipeline, and returns its Future."""
+        from finance_ml.pipeline.batch_prediction import run_batch_prediction
+        logger.info(f"Submitting batch prediction of {len(tickers)} tickers")
+        return self._submit(run_batch_prediction, list(tickers))
+
+    def shutdown(self, wait: bool = True):
+        self._stopped.set()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+        self._job_events.put(None)
@@ -5,14 +5,17 @@ from src.finance_ml import logger
 STAGE_NAME = "Data Ingestion stage"
 
 class DataIngestionTrainingPipeline:
-    def __init__(self, ticker: str):
+    def __init__(self, ticker: str, run_id=None, config_manager=None, handoff=None):
         self.ticker = ticker
+        self.run_id = run_id
+        self.config_manager = config_manager
+        self.handoff = handoff
 
     def main(self):
-        config = ConfigurationManager()
+        config = self.config_manager or ConfigurationManager(ticker=self.ticker, run_id=self.run_id)
         data_config = config.get_data_ingestion_config()
 
-        data_ingestor = DataIngestion(config=data_config, ticker=self.ticker)
+        data_ingestor = DataIngestion(config=data_config, ticker=self.ticker, handoff=self.handoff)
         data_ingestor.download_data()
 
 
@@ -5,11 +5,15 @@ from finance_ml import logger
 STAGE_NAME = "Data Validation stage"
 
 class DataValidationTrainingPipeline:
-    def __init__(self):
-        pass
+    def __init__(self, ticker=None, run_id=None, config_manager=None, handoff=None):
+        self.ticker = ticker
+        self.run_id = run_id
+        self.config_manager = config_manager
+        # Validation always reads the file, so it checks what later runs will find on disk
+        self.handoff = handoff
 
     def main(self):
-        config = ConfigurationManager()
+        config = self.config_manager or ConfigurationManager(ticker=self.ticker, run_id=self.run_id)
         data_validation_config = config.get_data_validation_config()
         data_validation = DataValidation(config=data_validation_config)
         data_validation.validate_all_columns()
@@ -1,5 +1,6 @@
 from finance_ml.config.configuration import ConfigurationManager
 from finance_ml.components.data_transformation import DataTransformation
+from finance_ml.components.data_validation import require_valid_data
 from finance_ml import logger
 import os # Keep os for potentially joining paths if needed within the component
 from pathlib import Path
@@ -7,24 +8,24 @@ from pathlib import Path
 STAGE_NAME = "Data Transformation stage"
 
 class DataTransformationTrainingPipeline:
-    def __init__(self):
-        pass
+    def __init__(self, ticker=None, run_id=None, config_manager=None, handoff=None):
+        self.ticker = ticker
+        self.run_id = run_id
+        self.config_manager = config_manager
+        self.handoff = handoff
 
     def main(self):
-        try:
-            with open(Path("artifacts/data_validation/status.txt"), "r")as f:
-                status = f.read().split(" ")[-1]
-
-            if status == "True":
-                config = ConfigurationManager()
-                data_transformation_config = config.get_data_transformation_config()
-                data_transformation = DataTransformation(config=data_transformation_config)
-                data_transformation.transform_and_save_data() # Call a dedicated method in the component
+        config = self.config_manager or ConfigurationManager(ticker=self.ticker, run_id=self.run_id)
+        # Refuse data that failed validation before any transformation or training time is spent on it
+        require_valid_data(config.get_data_validation_config())
 
-            else:
-                raise Exception("Data schema is not valid")
+        try:
+            data_transformation_config = config.get_data_transformation_config()
+            data_transformation = DataTransformation(config=data_transformation_config, handoff=self.handoff)
+            data_transformation.transform_and_save_data() # Call a dedicated method in the component
         except Exception as e:
-            print (e)
+            logger.exception(e)
+            raise e
 
 # Example of how to run this stage
 if __name__ == '__main__':
@@ -7,16 +7,20 @@ import os
 STAGE_NAME = "Model Training stage"
 
 class ModelTrainingPipeline:
-    def __init__(self):
-        pass
+    def __init__(self, ticker=None, run_id=None, config_manager=None, handoff=None):
+        self.ticker = ticker
+        self.run_id = run_id
+        self.config_manager = config_manager
+        self.handoff = handoff
 
     def main(self):
         try:
             # Get configuration and parameters
-            config_manager = ConfigurationManager()
+            config_manager = self.config_manager or ConfigurationManager(ticker=self.ticker, run_id=self.run_id)
             model_training_config, model_training_params = config_manager.get_model_training_config()
 
-            model_training = ModelTraining(config=model_training_config, params=model_training_params)
+            model_training = ModelTraining(config=model_training_config, params=model_training_params,
+                                           handoff=self.handoff)
             model_training.train_model()
 
             logger.info("Model training completed successfully.")
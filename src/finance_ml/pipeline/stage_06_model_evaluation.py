@@ -5,15 +5,18 @@ from finance_ml import logger
 STAGE_NAME= "Model Evaluation stage"
 
 class ModelEvaluationPipeline:
-    def __init__(self):
-        pass
+    def __init__(self, ticker=None, run_id=None, config_manager=None, handoff=None):
+        self.ticker = ticker
+        self.run_id = run_id
+        self.config_manager = config_manager
+        self.handoff = handoff
 
     def main(self):
         try:
-            config_manager = ConfigurationManager()
+            config_manager = self.config_manager or ConfigurationManager(ticker=self.ticker, run_id=self.run_id)
             evaluation_config = config_manager.get_model_evaluation_config()
             
-            model_evaluation = ModelEvaluation(config = evaluation_config)
+            model_evaluation = ModelEvaluation(config = evaluation_config, handoff=self.handoff)
             model_evaluation.evaluate()
 
             logger.info (f"{STAGE_NAME} Completed successfully")
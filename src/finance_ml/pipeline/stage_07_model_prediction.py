@@ -1,22 +1,28 @@
 from src.finance_ml.config.configuration import ConfigurationManager
 from src.finance_ml.components.prediction import ModelPrediction
 from src.finance_ml import logger
+from finance_ml.components.data_validation import require_valid_data
 
 STAGE_NAME = "Model Prediction stage"
 
 class ModelPredictionPipeline:
-    def __init__(self):
-        pass
+    def __init__(self, ticker=None, run_id=None, config_manager=None, handoff=None):
+        self.ticker = ticker
+        self.run_id = run_id
+        self.config_manager = config_manager
+        self.handoff = handoff
 
     def main(self):
         try:
             logger.info(f">>>>>> {STAGE_NAME} started <<<<<<")
             # Get configuration
-            config_manager = ConfigurationManager()
+            config_manager = self.config_manager or ConfigurationManager(ticker=self.ticker, run_id=self.run_id)
+            # Predict only from data that passed validation, like the transformation stage
+            require_valid_data(config_manager.get_data_validation_config())
             model_prediction_config = config_manager.get_model_prediction_config()
 
             # Perform model prediction
-            model_prediction = ModelPrediction(config=model_prediction_config)
+            model_prediction = ModelPrediction(config=model_prediction_config, handoff=self.handoff)
             result = model_prediction.predict()
             return result
 
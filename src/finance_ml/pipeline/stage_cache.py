@@ -0,0 +1,143 @@
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import uuid
+from pathlib import Path
+
+from finance_ml import logger
+from finance_ml.utils.columnar import resolve
+
+# Bump to invalidate every cached stage output after an incompatible change
+CACHE_FORMAT_VERSION = 1
+
+
+def hash_file(path, chunk_size=1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _to_plain(value):
+    """Converts ConfigBox/Path values into something json.dumps can hash deterministically."""
+    if hasattr(value, "to_dict"):
+        value = value.to_dict()
+    if isinstance(value, dict):
+        return {str(k): _to_plain(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_plain(v) for v in value]
+    if isinstance(value, Path):
+        return str(value)
+    return value
+
+
+class StageCache:
+    """DVC-style cache of stage outputs keyed by a fingerprint of the stage's inputs.
+
+    The fingerprint covers the content of the stage's input files, the
+    params.yaml section it reads and the source code of the modules that
+    implement it. When a stage runs again with the same fingerprint its
+    cached outputs are copied into the run's namespace instead.
+
+    With max_entries, every stage keeps at most that many entries: after a
+    save the least recently used ones are deleted. Restoring an entry counts
+    as a use.
+    """
+
+    def __init__(self, cache_dir, force=False, max_entries=None):
+        self.cache_dir = Path(cache_dir)
+        self.force = force
+        self.max_entries = max_entries
+
+    def fingerprint(self, stage_name, inputs, params=None, code=()) -> str:
+        payload = {
+            "format": CACHE_FORMAT_VERSION,
+            "stage": stage_name,
+            # Runs from before the Parquet hand-off only have the .csv sibling of a data file
+            "inputs": [hash_file(resolve(path)) for path in inputs],
+            "params": _to_plain(params),
+            "code": [hash_file(inspect.getsourcefile(module)) for module in code],
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def _stage_dir(self, stage_name) -> Path:
+        return self.cache_dir / stage_name.lower().replace(" ", "_")
+
+    def _entry_dir(self, stage_name, fingerprint) -> Path:
+        return self._stage_dir(stage_name) / fingerprint
+
+    def restore(self, stage_name, fingerprint, outputs) -> bool:
+        """Copies cached outputs into place. Returns False if the stage is not cached."""
+        entry_dir = self._entry_dir(stage_name, fingerprint)
+        cached = [entry_dir / Path(path).name for path in outputs]
+        if not all(path.exists() for path in cached):
+            return False
+
+        try:
+            for cached_path, path in zip(cached, outputs):
+                Path(path).parent.mkdir(parents=True, exist_ok=True)
+                # Copy rather than link: later writes to the run's file must not alter the cache
+                shutil.copy2(cached_path, path)
+            # The entry's mtime is its last use, for eviction
+            os.utime(entry_dir)
+        except FileNotFoundError:
+            # Another run evicted the entry while it was being copied
+            return False
+        return True
+
+    def save(self, stage_name, fingerprint, outputs):
+        """Stores a stage's outputs. The entry appears atomically, or not at all."""
+        missing = [str(path) for path in outputs if not Path(path).exists()]
+        if missing:
+            logger.warning(f"Not caching {stage_name}, outputs are missing: {missing}")
+            return
+
+        entry_dir = self._entry_dir(stage_name, fingerprint)
+        tmp_dir = entry_dir.parent / f".{fingerprint}.{uuid.uuid4().hex[:8]}.tmp"
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        for path in outputs:
+            shutil.copy2(path, tmp_dir / Path(path).name)
+        try:
+            os.replace(tmp_dir, entry_dir)
+        except OSError:
+            # Another run cached the same fingerprint first
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        self.evict(stage_name)
+
+    def evict(self, stage_name):
+        """Deletes the least recently used entries of a stage beyond max_entries."""
+        stage_dir = self._stage_dir(stage_name)
+        if self.max_entries is None or not stage_dir.is_dir():
+            return
+        entries = []
+        for entry_dir in stage_dir.iterdir():
+            try:
+                if entry_dir.is_dir() and not entry_dir.name.startswith("."):
+                    entries.append((entry_dir.stat().st_mtime, entry_dir))
+            except FileNotFoundError:
+                continue
+        entries.sort()
+        for _, entry_dir in entries[:max(0, len(entries) - self.max_entries)]:
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            logger.info(f"Evicted {entry_dir.name[:12]} from the {stage_name} cache")
+
+    def run(self, stage_name, func, inputs, outputs, params=None, code=()):
+        """Runs func() unless outputs for the same inputs, params and code are cached.
+
+        Returns:
+            bool: True if the stage was skipped and its outputs restored from the cache
+        """
+        fingerprint = self.fingerprint(stage_name, inputs, params, code)
+        if not self.force and self.restore(stage_name, fingerprint, outputs):
+            logger.info(f"{stage_name} skipped, outputs restored from cache ({fingerprint[:12]})")
+            return True
+
+        # Outputs left by the run this one was seeded from must not be cached if func() does not rewrite them
+        for path in outputs:
+            Path(path).unlink(missing_ok=True)
+        func()
+        self.save(stage_name, fingerprint, outputs)
+        return False
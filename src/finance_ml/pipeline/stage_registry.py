@@ -0,0 +1,66 @@
+import importlib
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class StageSpec:
+    """A pipeline stage, referenced by module path so its dependencies are imported only when it runs."""
+    key: str
+    name: str
+    module: str
+    class_name: str
+    code_modules: tuple = () # Modules whose source is part of the stage cache fingerprint
+
+    def load(self):
+        """Imports the stage module and returns its pipeline class."""
+        return getattr(importlib.import_module(self.module), self.class_name)
+
+    def load_code_modules(self) -> list:
+        return [importlib.import_module(name) for name in self.code_modules]
+
+
+# In pipeline order
+STAGES = (
+    StageSpec("ticker", "Ticker Finder Stage", "finance_ml.pipeline.stage_01_LLMticker", "TickerFinderPipeline"),
+    StageSpec("ingest", "Data Ingestion Stage", "finance_ml.pipeline.stage_02_data_ingestion",
+              "DataIngestionTrainingPipeline"),
+    StageSpec("validate", "Data Validation stage", "finance_ml.pipeline.stage_03_data_validation",
+              "DataValidationTrainingPipeline", ("finance_ml.components.data_validation", "finance_ml.utils.columnar")),
+    StageSpec("transform", "Data Transformation stage", "finance_ml.pipeline.stage_04_data_transformation",
+              "DataTransformationTrainingPipeline",
+              ("finance_ml.components.data_transformation", "finance_ml.utils.columnar",
+               "finance_ml.utils.windowing")),
+    StageSpec("train", "Model Training stage", "finance_ml.pipeline.stage_05_model_training",
+              "ModelTrainingPipeline", ("finance_ml.components.model_training",
+                                         "finance_ml.components.training_input")),
+    StageSpec("evaluate", "Model Evaluation stage", "finance_ml.pipeline.stage_06_model_evaluation",
+              "ModelEvaluationPipeline", ("finance_ml.components.model_evaluation",)),
+    StageSpec("predict", "Final Prediction stage", "finance_ml.pipeline.stage_07_model_prediction",
+              "ModelPredictionPipeline"),
+)
+
+STAGE_REGISTRY = {stage.key: stage for stage in STAGES}
+
+# Every run needs a ticker, so the ticker finder cannot be deselected
+SELECTABLE_STAGES = tuple(stage.key for stage in STAGES if stage.key != "ticker")
+
+
+def get_stage(key) -> StageSpec:
+    try:
+        return STAGE_REGISTRY[key]
+    except KeyError:
+        raise ValueError(f"Unknown stage '{key}'. Choose from: {', '.join(SELECTABLE_STAGES)}") from None
+
+
+def parse_stages(stages=None) -> list:
+    """Turns 'ingest,predict' (or a list of keys) into stage keys in pipeline order. None or 'all' selects every stage."""
+    if stages is None or stages == "all":
+        return list(SELECTABLE_STAGES)
+    if isinstance(stages, str):
+        stages = [key.strip() for key in stages.split(",") if key.strip()]
+
+    selected = {get_stage(key).key for key in stages}
+    selected.discard("ticker")
+    if not selected:
+        raise ValueError("No pipeline stages selected")
+    return [key for key in SELECTABLE_STAGES if key in selected]
@@ -0,0 +1,186 @@
+import argparse
+import multiprocessing
+import os
+import time
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from finance_ml.config.configuration import ConfigurationManager
+from finance_ml.pipeline.bulk_data_ingestion import read_watchlist
+from finance_ml.utils.common import create_directories, save_json
+from finance_ml import logger
+
+STAGE_NAME = "Watchlist Training stage"
+
+# Stages retrained for every ticker; tickers without a published run are ingested and validated first
+TRAINING_STAGES = ["transform", "train", "evaluate"]
+FIRST_RUN_STAGES = ["ingest", "validate"] + TRAINING_STAGES
+
+
+def available_cores() -> int:
+    """Cores this process may run on, which can be fewer than the machine has."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def plan_workers(n_tickers, max_workers, threads_per_worker, cores) -> tuple:
+    """Chooses how many tickers to train at once and the TensorFlow threads of each.
+
+    workers * threads never exceeds cores.
+
+    Returns:
+        tuple: (workers, threads_per_worker)
+    """
+    workers = max(1, min(max_workers or cores, n_tickers, cores))
+    threads = cores // workers
+    if threads_per_worker:
+        threads = min(threads_per_worker, threads)
+    return workers, max(1, threads)
+
+
+def _init_training_worker(threads):
+    from finance_ml.components.training_input import limit_threads
+    limit_threads(threads)
+
+
+def train_ticker(ticker, force=False) -> dict:
+    """Retrains and evaluates one ticker in a new run and publishes it.
+
+    Returns:
+        dict: ticker, run_id, seconds and the evaluation metrics of the run
+    """
+    from finance_ml.pipeline.pipeline_runner import run_pipeline_stages
+    from finance_ml.utils.common import load_json, normalize_input_to_ticker
+
+    start = time.perf_counter()
+    ticker = normalize_input_to_ticker(ticker) or ticker
+    config_manager = ConfigurationManager()
+    stages = TRAINING_STAGES if config_manager.get_latest_run_id(ticker) else FIRST_RUN_STAGES
+    run_id = run_pipeline_stages('1', ticker, force=force, stages=stages)['run_id']
+
+    evaluation_config = config_manager.for_run(ticker, run_id).get_model_evaluation_config()
+    return {
+        'ticker': ticker,
+        'run_id': run_id,
+        'seconds': round(time.perf_counter() - start, 2),
+        'metrics': dict(load_json(Path(evaluation_config.metrics_file_name))),
+    }
+
+
+class WatchlistTrainingPipeline:
+    """Trains and evaluates a model for every ticker of a watchlist on a pool of processes.
+
+    Every worker is capped at threads_per_worker TensorFlow threads, so the
+    trainings running side by side do not oversubscribe the cores.
+    """
+    def __init__(self, tickers, max_workers=None, threads_per_worker=None, force=False):
+        self.tickers = list(dict.fromkeys(t.strip().upper() for t in tickers if t.strip()))
+        self.max_workers = max_workers
+        self.threads_per_worker = threads_per_worker
+        self.force = force
+
+    def main(self, sequential_baseline_seconds=None):
+        """
+        Args:
+            sequential_baseline_seconds (float, optional): measured wall-clock time of training
+                the same watchlist one ticker at a time, stored in the summary for comparison
+
+        Returns:
+            dict: per-ticker 'results', 'failed' (ticker -> error), the total 'wall_seconds' and
+                  'sequential_seconds', the sum of the per-ticker times, i.e. the time one after
+                  the other would have taken at the same thread count
+        """
+        config = ConfigurationManager().get_watchlist_training_config()
+        workers, threads = plan_workers(
+            len(self.tickers),
+            self.max_workers if self.max_workers is not None else config.max_workers,
+            self.threads_per_worker if self.threads_per_worker is not None else config.threads_per_worker,
+            available_cores(),
+        )
+        logger.info(f"Training {len(self.tickers)} tickers on {workers} workers with {threads} threads each")
+
+        results, failed = [], {}
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=_init_training_worker, initargs=(threads,)) as executor:
+            futures = {executor.submit(train_ticker, ticker, self.force): ticker for ticker in self.tickers}
+            for future in as_completed(futures):
+                ticker = futures[future]
+                try:
+                    results.append(future.result())
+                    logger.info(f"Trained {ticker} in {results[-1]['seconds']}s")
+                except Exception as e:
+                    logger.exception(e)
+                    failed[ticker] = str(e)
+        wall_seconds = time.perf_counter() - start
+
+        summary = {
+            'workers': workers,
+            'threads_per_worker': threads,
+            'wall_seconds': round(wall_seconds, 2),
+            'sequential_seconds': round(sum(result['seconds'] for result in results), 2),
+            'results': sorted(results, key=lambda result: result['ticker']),
+            'failed': failed,
+        }
+        if sequential_baseline_seconds is not None:
+            summary['sequential_baseline_seconds'] = round(sequential_baseline_seconds, 2)
+            summary['speedup'] = round(sequential_baseline_seconds / max(wall_seconds, 1e-9), 2)
+        create_directories([config.summary_file.parent])
+        save_json(path=config.summary_file, data=summary)
+        return summary
+
+
+def run_watchlist_training(tickers, max_workers=None, threads_per_worker=None, force=False,
+                           compare_sequential=False) -> dict:
+    """Trains the watchlist, optionally after a sequential baseline run on every core.
+
+    The baseline retrains everything, so both runs are forced past the stage cache.
+    """
+    baseline_seconds = None
+    if compare_sequential:
+        logger.info("Training the watchlist one ticker at a time for the sequential baseline")
+        baseline_seconds = WatchlistTrainingPipeline(tickers, max_workers=1, threads_per_worker=0, force=True).main()['wall_seconds']
+        force = True
+    return WatchlistTrainingPipeline(tickers, max_workers, threads_per_worker, force).main(baseline_seconds)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Retrain and evaluate the model of every ticker in a watchlist')
+    parser.add_argument('--tickers', type=str, help='Comma-separated tickers, e.g. RELIANCE.NS,TCS.NS')
+    parser.add_argument('--watchlist', type=str, help='File with one ticker per line')
+    parser.add_argument('--workers', type=int, help='Tickers trained at the same time (default: params.yaml)')
+    parser.add_argument('--threads', type=int, help='TensorFlow threads per worker (default: params.yaml)')
+    parser.add_argument('--force', action='store_true', help='Retrain even if the stage cache has the outputs')
+    parser.add_argument('--compare-sequential', action='store_true',
+                        help='First train the watchlist one ticker at a time on every core, and report both wall-clock times. Implies --force')
+    args = parser.parse_args()
+
+    tickers = []
+    if args.watchlist:
+        tickers.extend(read_watchlist(args.watchlist))
+    if args.tickers:
+        tickers.extend(t.strip() for t in args.tickers.split(',') if t.strip())
+    if not tickers:
+        parser.error('Provide --tickers or --watchlist')
+
+    try:
+        logger.info(f">>>>>> stage {STAGE_NAME} started <<<<<<")
+        summary = run_watchlist_training(tickers, args.workers, args.threads, force=args.force,
+                                         compare_sequential=args.compare_sequential)
+
+        for result in summary['results']:
+            metrics = result['metrics']
+            print(f"{result['ticker']:<16} {result['seconds']:>8.1f}s  MAE {metrics.get('mae_in_rupees', float('nan')):.2f}  "
+                  f"directional accuracy {metrics.get('directional_accuracy_percentage', float('nan')):.1f}%")
+        for ticker, error in summary['failed'].items():
+            print(f"{ticker:<16} failed: {error}")
+        print(f"Wall clock {summary['wall_seconds']:.1f}s on {summary['workers']} workers x {summary['threads_per_worker']} threads, "
+              f"{summary['sequential_seconds']:.1f}s of training in total")
+        if 'speedup' in summary:
+            print(f"Sequential baseline {summary['sequential_baseline_seconds']:.1f}s, speedup {summary['speedup']:.2f}x")
+        logger.info(f">>>>>> stage {STAGE_NAME} completed <<<<<<\n\nx==========x")
+    except Exception as e:
+        logger.exception(e)
+        raise e
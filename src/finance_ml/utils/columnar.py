@@ -0,0 +1,141 @@
+import os
+import uuid
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Arrow types of the schema.yaml dtypes
+ARROW_TYPES = {
+    "object": pa.string(),
+    "str": pa.string(),
+    "string": pa.string(),
+    "float64": pa.float64(),
+    "int64": pa.int64(),
+    "datetime64[ns]": pa.timestamp("ns"),
+}
+# Small enough that a tail read only decodes the last groups of a long intraday history
+ROW_GROUP_SIZE = 10_000
+
+
+def resolve(path) -> Path:
+    """Returns path, or its .csv sibling if only that exists.
+
+    Runs published before the ingestion wrote Parquet only have raw_data.csv,
+    they stay readable through every function of this module.
+    """
+    path = Path(path)
+    if not path.exists() and path.with_suffix(".csv").exists():
+        return path.with_suffix(".csv")
+    return path
+
+
+def _is_csv(path: Path) -> bool:
+    return path.suffix == ".csv"
+
+
+def arrow_schema(columns: dict, df: pd.DataFrame = None) -> pa.Schema:
+    """Arrow schema of schema.yaml COLUMNS, in that order.
+
+    Timestamps keep the time zone of the matching column of df, if it has one.
+
+    Raises:
+        ValueError: for a dtype without an Arrow type
+    """
+    fields = []
+    for name, dtype in columns.items():
+        if dtype not in ARROW_TYPES:
+            raise ValueError(f"No Arrow type for dtype '{dtype}' of column {name}")
+        arrow_type = ARROW_TYPES[dtype]
+        if pa.types.is_timestamp(arrow_type) and df is not None and name in df.columns:
+            if getattr(df[name].dtype, "tz", None) is not None:
+                # Arrow's own name of the zone: str() of a fixed offset gives 'UTC+05:30', which Arrow cannot read back
+                tz = pa.array(df[name].iloc[:0]).type.tz
+                arrow_type = pa.timestamp(arrow_type.unit, tz=tz)
+        fields.append(pa.field(name, arrow_type))
+    return pa.schema(fields)
+
+
+def write_frame(df: pd.DataFrame, path, columns: dict = None):
+    """Writes df to a Parquet file, typed by the schema.yaml COLUMNS if they are given.
+
+    The file is written next to path and moved into place, so readers never
+    see a partial file.
+
+    Raises:
+        ValueError: if df lacks a column of the schema or a value cannot be converted to its type
+    """
+    path = Path(path)
+    if columns is None:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    else:
+        missing = [name for name in columns if name not in df.columns]
+        if missing:
+            raise ValueError(f"Columns {missing} of the schema are missing from the data")
+        table = pa.Table.from_pandas(df[list(columns)], schema=arrow_schema(columns, df), preserve_index=False)
+
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        pq.write_table(table, tmp_path, row_group_size=ROW_GROUP_SIZE)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def column_names(path) -> list:
+    """Column names of the file, read from the Parquet footer or the CSV header."""
+    path = resolve(path)
+    if _is_csv(path):
+        return list(pd.read_csv(path, nrows=0).columns)
+    return pq.read_schema(path).names
+
+
+def read_frame(path, columns=None) -> pd.DataFrame:
+    """Reads the given columns of the file, all of them if columns is None.
+
+    Only the requested columns are decoded from a Parquet file. Datetime comes
+    back as a timestamp column for CSV files as well.
+    """
+    path = resolve(path)
+    if _is_csv(path):
+        df = pd.read_csv(path, usecols=columns)
+        if "Datetime" in df.columns:
+            df["Datetime"] = pd.to_datetime(df["Datetime"])
+        return df
+    return pq.read_table(path, columns=columns).to_pandas()
+
+
+def iter_frames(path, chunk_size, columns=None):
+    """Yields the file as DataFrames of at most chunk_size rows, with a running row index.
+
+    Datetime is left as stored, so CSV files yield it as text.
+    """
+    path = resolve(path)
+    if _is_csv(path):
+        yield from pd.read_csv(path, usecols=columns, chunksize=chunk_size)
+        return
+    start = 0
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size, columns=columns):
+        chunk = batch.to_pandas()
+        chunk.index = pd.RangeIndex(start, start + len(chunk))
+        start += len(chunk)
+        yield chunk
+
+
+def read_parquet_tail(path, n, columns=None) -> pd.DataFrame:
+    """Reads the last n rows of a Parquet file, decoding only the row groups that hold them."""
+    parquet_file = pq.ParquetFile(path)
+    metadata = parquet_file.metadata
+    row_groups, rows = [], 0
+    for group in reversed(range(metadata.num_row_groups)):
+        if rows >= n:
+            break
+        row_groups.insert(0, group)
+        rows += metadata.row_group(group).num_rows
+
+    if n <= 0 or not row_groups:
+        return parquet_file.schema_arrow.empty_table().select(columns or parquet_file.schema_arrow.names).to_pandas()
+    df = parquet_file.read_row_groups(row_groups, columns=columns).to_pandas()
+    return df.tail(n).reset_index(drop=True)
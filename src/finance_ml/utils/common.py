@@ -8,8 +8,6 @@ from ensure import ensure_annotations
 from box import ConfigBox
 from pathlib import Path
 from typing import Any
-import yfinance as yf
-import re
 
 
 @ensure_annotations
@@ -189,56 +187,18 @@ def normalize_input_to_ticker(input_text: str) -> str:
     """Converts user input to a valid yfinance ticker.
     
     This function handles:
-    1. Company names -> ticker
+    1. Company names -> ticker, including prefixes and close misspellings
     2. Tickers without .NS suffix
     3. Already valid tickers
     
+    Names and listed symbols are resolved from the bundled NSE listing. Other
+    symbols are checked on yfinance at most once per cache TTL.
+    
     Args:
         input_text (str): User input for company name or ticker
         
     Returns:
         str: Valid yfinance ticker or None if no match
     """
-    if not input_text:
-        return None
-        
-    # Remove extra spaces and convert to lowercase for comparison
-    normalized_input = input_text.strip().lower()
-    
-    # Case 1: Direct match with company name
-    if normalized_input in INDIAN_COMPANIES:
-        return INDIAN_COMPANIES[normalized_input]
-    
-    # Case 2: Already a valid ticker with .NS suffix
-    if re.match(r"^[A-Za-z0-9]+\.NS$", input_text):
-        return input_text.upper()
-    
-    # Case 3: Valid ticker without .NS suffix
-    ticker_candidate = f"{input_text.upper()}.NS"
-    
-    # Try all possible tickers (original and with .NS suffix)
-    possible_tickers = [
-        input_text.upper(),          # As is (could be non-Indian ticker)
-        ticker_candidate             # With .NS suffix for NSE
-    ]
-    
-    for ticker in possible_tickers:
-        try:
-            data = yf.download(ticker, period="1d", interval="1d", progress=False)
-            if not data.empty:
-                return ticker
-        except Exception:
-            continue
-    
-    # If no match found, try partial name matching
-    for company, ticker in INDIAN_COMPANIES.items():
-        if normalized_input in company or company in normalized_input:
-            return ticker
-    
-    # If all else fails, return the input with .NS suffix as best guess
-    return ticker_candidate
-
-
-
-
-
+    from finance_ml.components.ticker_resolver import get_ticker_resolver
+    return get_ticker_resolver().resolve(input_text)
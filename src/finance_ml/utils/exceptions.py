@@ -1,3 +1,30 @@
 class AgentExecutionError(Exception):
     """Raised when any of the agents fail during execution."""
     pass
+
+
+class DataValidationError(Exception):
+    """Raised when a stage is asked to use data that failed validation."""
+    pass
+
+
+class JobQueueFullError(Exception):
+    """Raised when the pipeline job queue has no room for another job."""
+    pass
+
+
+class PipelineTimeoutError(Exception):
+    """Raised when a pipeline job runs for longer than the runner's job timeout."""
+    pass
+
+
+class DownloadError(Exception):
+    """Raised when market data could not be downloaded for some tickers.
+
+    failed lists those tickers, frames holds the DataFrames of the tickers
+    of the same request that did download.
+    """
+    def __init__(self, failed, frames=None):
+        self.failed = list(failed)
+        self.frames = frames or {}
+        super().__init__(f"Download failed for {', '.join(self.failed)}")
@@ -0,0 +1,42 @@
+import os
+import threading
+
+
+class Handoff:
+    """In-memory values of a run's artifacts, keyed by the artifact's path.
+
+    A stage puts the DataFrames, arrays and models it has just written, and a
+    later stage in the same process takes them from here instead of reading
+    the file back. The file is always written too: get() loads it whenever
+    the value is not here, because the stage that makes it ran in another
+    process, was restored from the stage cache or was not selected.
+    """
+
+    def __init__(self):
+        self._values = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(path) -> str:
+        return os.path.abspath(path)
+
+    def put(self, path, value):
+        with self._lock:
+            self._values[self._key(path)] = value
+
+    def get(self, path, load):
+        """Returns the value of path, or load(path) if no stage of this process put it."""
+        with self._lock:
+            if self._key(path) in self._values:
+                return self._values[self._key(path)]
+        return load(path)
+
+    def discard(self, paths):
+        """Forgets the values of paths, e.g. before the stage that writes them runs again."""
+        with self._lock:
+            for path in paths:
+                self._values.pop(self._key(path), None)
+
+    def __contains__(self, path):
+        with self._lock:
+            return self._key(path) in self._values
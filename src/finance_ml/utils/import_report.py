@@ -0,0 +1,68 @@
+import re
+import subprocess
+import sys
+
+# e.g. "import time:      1035 |      20412 |   tensorflow"
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s+)(\S+)\s*$")
+
+
+def parse_importtime(stderr) -> list:
+    """Parses `python -X importtime` output into (package, self_us, cumulative_us, depth) tuples."""
+    entries = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, package = match.groups()
+            # One leading space for top-level imports, two more per nesting level
+            entries.append((package, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return entries
+
+
+def measure_import(module, top=5, python=None) -> dict:
+    """Imports a module in a fresh interpreter with -X importtime.
+
+    Returns:
+        dict: total import time of the module in ms and its heaviest direct and
+              indirect imports, or an 'error' if the import failed
+    """
+    proc = subprocess.run(
+        [python or sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True,
+    )
+    entries = parse_importtime(proc.stderr)
+    report = {"module": module, "total_ms": None, "heaviest": []}
+    if proc.returncode != 0:
+        report["error"] = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "import failed"
+        return report
+
+    # The module itself is reported last, right after everything it pulled in
+    module_index = max((i for i, entry in enumerate(entries) if entry[0] == module), default=None)
+    if module_index is None:
+        return report
+    module_depth = entries[module_index][3]
+    report["total_ms"] = round(entries[module_index][2] / 1000, 1)
+
+    first = module_index
+    while first > 0 and entries[first - 1][3] > module_depth:
+        first -= 1
+    # Top-level packages only, their cumulative time includes their submodules
+    heaviest = sorted((entry for entry in entries[first:module_index] if "." not in entry[0]),
+                      key=lambda entry: entry[2], reverse=True)[:top]
+    report["heaviest"] = [{"package": package, "cumulative_ms": round(cumulative / 1000, 1)}
+                          for package, _, cumulative, _ in heaviest]
+    return report
+
+
+def import_time_report(modules, top=5) -> list:
+    return [measure_import(module, top=top) for module in modules]
+
+
+def format_import_report(report) -> str:
+    lines = [f"{'module':<50} {'import ms':>10}  heaviest imports"]
+    for entry in report:
+        if "error" in entry:
+            lines.append(f"{entry['module']:<50} {'failed':>10}  {entry['error']}")
+            continue
+        heaviest = ", ".join(f"{item['package']} {item['cumulative_ms']:.0f}" for item in entry["heaviest"])
+        lines.append(f"{entry['module']:<50} {entry['total_ms']:>10}  {heaviest}")
+    return "\n".join(lines)
@@ -0,0 +1,95 @@
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from finance_ml import logger
+
+try:
+    import resource
+except ImportError:
+    # Windows has neither resource nor /proc
+    resource = None
+
+_current_span = contextvars.ContextVar("current_span", default=None)
+_spans_file = None
+_write_lock = threading.Lock()
+
+
+def configure_spans(path):
+    """Appends every finished span to the JSON lines file at path from now on. None stops writing."""
+    global _spans_file
+    if path is not None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+    _spans_file = path
+
+
+def peak_rss_mb() -> float:
+    """Highest resident set size of this process so far, 0 where it cannot be measured (Windows)."""
+    try:
+        with open("/proc/self/status") as f:
+            return next(int(line.split()[1]) for line in f if line.startswith("VmHWM:")) / 1024
+    except (OSError, StopIteration):
+        if resource is None:
+            return 0.0
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and in kilobytes on the other Unix systems
+        return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+
+
+def _write(record):
+    if _spans_file is None:
+        return
+    line = json.dumps(record, default=str) + "\n"
+    try:
+        with _write_lock, open(_spans_file, "a") as f:
+            f.write(line)
+    except OSError as e:
+        logger.warning(f"Could not write span {record['name']} to {_spans_file}: {e}")
+
+
+@contextmanager
+def span(name, **attributes):
+    """Measures the block as a span: wall time, CPU time and peak RSS.
+
+    Spans opened inside the block, also in threads started with a copy of the
+    context, record this one as their parent. cpu_seconds is the CPU time of
+    the whole process while the span was open, so it includes spans running
+    alongside. peak_rss_mb is the process high-water mark when the span ends
+    and rss_growth_mb how much the span raised it. Callers may add attributes
+    to the yielded record.
+    """
+    parent = _current_span.get()
+    record = {
+        "name": name,
+        "span_id": uuid.uuid4().hex[:16],
+        "parent_id": parent["span_id"] if parent else None,
+        "pid": os.getpid(),
+        "thread": threading.current_thread().name,
+        "start": datetime.now().isoformat(timespec="milliseconds"),
+        **attributes,
+    }
+    token = _current_span.set(record)
+    start_wall, start_cpu, start_peak = time.perf_counter(), time.process_time(), peak_rss_mb()
+    record["status"] = "ok"
+    try:
+        yield record
+    except BaseException:
+        record["status"] = "error"
+        raise
+    finally:
+        _current_span.reset(token)
+        peak = peak_rss_mb()
+        record.update(
+            wall_seconds=round(time.perf_counter() - start_wall, 6),
+            cpu_seconds=round(time.process_time() - start_cpu, 6),
+            peak_rss_mb=round(peak, 1),
+            rss_growth_mb=round(peak - start_peak, 1),
+        )
+        _write(record)
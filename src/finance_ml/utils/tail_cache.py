@@ -0,0 +1,73 @@
+import io
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from finance_ml.utils.columnar import _is_csv, read_parquet_tail, resolve
+
+
+def read_csv_tail(path, n, block_size=8192, usecols=None) -> pd.DataFrame:
+    """Reads the header and the last n rows of a CSV file without scanning the rest of it.
+
+    Blocks are read backwards from the end of the file until n data lines
+    have been seen, so the cost depends on n rather than on the file size.
+    """
+    with open(path, "rb") as f:
+        header = f.readline()
+        data_start = f.tell()
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+
+        tail = b""
+        while position > data_start and tail.count(b"\n") <= n:
+            read_size = min(block_size, position - data_start)
+            position -= read_size
+            f.seek(position)
+            tail = f.read(read_size) + tail
+
+    lines = tail.splitlines()
+    if position > data_start:
+        # The first line may have been cut in the middle
+        lines = lines[1:]
+    lines = [line for line in lines if line.strip()][-n:] if n > 0 else []
+
+    return pd.read_csv(io.BytesIO(header + b"\n".join(lines)), usecols=usecols)
+
+
+def read_tail(path, n, usecols=None) -> pd.DataFrame:
+    """Reads the last n rows of a Parquet or CSV file, see read_parquet_tail and read_csv_tail."""
+    path = resolve(path)
+    if _is_csv(path):
+        return read_csv_tail(path, n, usecols=usecols)
+    return read_parquet_tail(path, n, columns=usecols)
+
+
+class TailCache:
+    """LRU cache of the last rows of data files, invalidated when the file changes.
+
+    Entries are keyed by path, n and the file's mtime and size, so a rewritten
+    file is read again on the next request.
+    """
+
+    def __init__(self, max_entries=128):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path, n, usecols=None) -> pd.DataFrame:
+        path = resolve(path)
+        stat = os.stat(path)
+        key = (str(path), n, tuple(usecols) if usecols else None, stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        df = read_tail(path, n, usecols=usecols)
+        with self._lock:
+            self._entries[key] = df
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return df
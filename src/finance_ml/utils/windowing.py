@@ -0,0 +1,42 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def create_sequences(data: np.ndarray, lookback: int, target_index: int = 0, out_path=None):
+    """Builds LSTM training windows from a 2D (time, features) array without a Python loop.
+
+    X[i] holds rows i .. i+lookback-1 and y[i] is the target column of row i+lookback,
+    the same samples the old per-window loop produced. X is a strided view on data,
+    so nothing is copied unless out_path is given.
+
+    Args:
+        data (np.ndarray): array of shape (time, features)
+        lookback (int): number of time steps per window
+        target_index (int, optional): column of data used as y. Defaults to 0.
+        out_path (Path, optional): if given, X is written straight into a
+            memory-mapped .npy file at this path instead of returned as a view
+
+    Raises:
+        ValueError: if data has no more rows than lookback
+
+    Returns:
+        tuple: X of shape (samples, lookback, features) and y of shape (samples,)
+    """
+    data = np.asarray(data)
+    if data.ndim == 1:
+        data = data.reshape(-1, 1)
+    if len(data) <= lookback:
+        raise ValueError(f"Need more than {lookback} rows to build sequences, got {len(data)}")
+
+    # (samples + 1, features, lookback) -> drop the last window, it has no target
+    windows = sliding_window_view(data, lookback, axis=0)[:-1]
+    X = windows.transpose(0, 2, 1)
+    y = data[lookback:, target_index]
+
+    if out_path is not None:
+        X_file = np.lib.format.open_memmap(out_path, mode="w+", dtype=X.dtype, shape=X.shape)
+        X_file[:] = X
+        X_file.flush()
+        X = X_file
+
+    return X, y
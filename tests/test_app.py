@@ -1,6 +1,27 @@
+from pathlib import Path
+
 from app import app
 
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
 def test_app_creation():
     """Test that the Flask app exists and is configured"""
     assert app is not None
     assert app.config['TESTING'] is not True  # Ensure we're not in testing mode by default
+
+
+def test_chart_rejects_invalid_tickers():
+    response = app.test_client().get("/api/chart/bad$ticker")
+    assert response.status_code == 400
+
+
+def test_chart_rejects_run_ids_outside_the_ticker_runs(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    Path("config").mkdir()
+    for name in ["config/config.yaml", "params.yaml", "schema.yaml"]:
+        Path(name).write_text((REPO_ROOT / name).read_text())
+    client = app.test_client()
+    for run_id in ["../../../tmp", "20240101-000000-deadbeef"]:
+        response = client.get("/api/chart/TCS.NS", query_string={"run_id": run_id})
+        assert response.status_code == 404
+    assert not (tmp_path / "artifacts").exists()
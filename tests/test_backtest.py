@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from sklearn.metrics import mean_absolute_error, mean_squared_error
+
+from finance_ml.components.backtest import fold_windows, regression_metrics, strategy_metrics, walk_forward_folds
+
+
+def test_folds_tile_the_end_of_the_history():
+    assert walk_forward_folds(100, 10, 3, 20) == [(0, 40, 60), (0, 60, 80), (0, 80, 100)]
+    assert walk_forward_folds(100, 10, 3, 20, train_window=30) == [(10, 40, 60), (30, 60, 80), (50, 80, 100)]
+    with pytest.raises(ValueError):
+        walk_forward_folds(100, 40, 3, 20)
+
+
+def test_regression_metrics_match_scikit_learn():
+    rng = np.random.default_rng(0)
+    y_true = rng.uniform(90, 110, 50)
+    y_pred = y_true + rng.normal(0, 2, 50)
+    metrics = regression_metrics(y_true, y_pred)
+
+    assert metrics["mae_in_rupees"] == pytest.approx(mean_absolute_error(y_true, y_pred))
+    assert metrics["rmse_in_rupees"] == pytest.approx(np.sqrt(mean_squared_error(y_true, y_pred)))
+    assert metrics["accuracy_percentage"] == pytest.approx(100 - metrics["mape_percentage"])
+
+
+def test_strategy_holds_only_on_predicted_up_days():
+    previous_close = np.array([100.0, 110.0, 99.0, 99.0])
+    y_true = np.array([110.0, 99.0, 99.0, 108.9])
+    # Predicts up, up, down, up: in the market on days 0, 1 and 3
+    y_pred = np.array([105.0, 111.0, 98.0, 100.0])
+    metrics = strategy_metrics(y_true, y_pred, previous_close)
+
+    assert metrics["days_in_market"] == 3
+    assert metrics["trades"] == 3
+    assert metrics["strategy_return_percentage"] == pytest.approx((1.1 * 0.9 * 1.1 - 1) * 100)
+    assert metrics["buy_and_hold_return_percentage"] == pytest.approx(8.9)
+    assert metrics["max_drawdown_percentage"] == pytest.approx(10.0)
+    assert metrics["hit_rate_percentage"] == pytest.approx(50.0)
+
+    with_costs = strategy_metrics(y_true, y_pred, previous_close, cost_bps=100)
+    assert with_costs["strategy_return_percentage"] < metrics["strategy_return_percentage"]
+
+
+def test_fold_windows_scale_with_training_rows_only():
+    values = np.arange(100, dtype=np.float64).reshape(-1, 1)
+    X_train, y_train, X_test, y_test, mean, scale = fold_windows(values, 0, 50, 70, lookback=5)
+
+    assert mean == pytest.approx(24.5)
+    assert (X_train.shape, X_test.shape) == ((45, 5, 1), (20, 5, 1))
+    # The first test window ends on the last training row and predicts row 50
+    np.testing.assert_allclose(X_test[0, -1, 0] * scale + mean, 49)
+    np.testing.assert_allclose(y_test * scale + mean, values[50:70, 0])
@@ -0,0 +1,92 @@
+import os
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.preprocessing import MinMaxScaler
+
+from finance_ml.components import prediction
+from finance_ml.components.model_registry import ModelRegistry
+from finance_ml.components.prediction import ModelPrediction
+from finance_ml.entity.config_entity import ModelPredictionConfig
+from finance_ml.utils.columnar import write_frame
+
+LOOKBACK = 5
+
+
+class LastValueModel:
+    """Predicts the last scaled close of every window and counts its forward passes."""
+    def __init__(self):
+        self.batches = []
+
+    def predict_on_batch(self, X):
+        self.batches.append(X.shape)
+        return X[:, -1, :1]
+
+    def get_weights(self):
+        return []
+
+
+def make_config(tmp_path, ticker, closes, model_path):
+    run_dir = tmp_path / ticker
+    run_dir.mkdir()
+    input_path = run_dir / "raw_data.parquet"
+    write_frame(pd.DataFrame({
+        "Ticker": ticker,
+        "Datetime": pd.date_range("2024-01-01", periods=len(closes)),
+        "Close": np.asarray(closes, dtype=float),
+    }), input_path)
+    scaler_path = run_dir / "scaler.joblib"
+    scaler_path.write_bytes(b"scaler")
+    return ModelPredictionConfig(
+        root_dir=run_dir, trained_model_path=model_path, input_data_path=input_path, scaler_path=scaler_path,
+        predictions_file_name="predictions.csv", history_db=tmp_path / "history.db", legacy_history_csv=None,
+        lookback=LOOKBACK, features=["Close"], model_cache_size=8, model_cache_memory_mb=512,
+    )
+
+
+def test_tickers_sharing_a_model_are_scored_in_one_forward_pass(tmp_path, monkeypatch):
+    model = LastValueModel()
+    scaler = MinMaxScaler().fit(np.array([[0.0], [1000.0]]))
+    registry = ModelRegistry(load_model=lambda path: model, load_scaler=lambda path: scaler)
+    monkeypatch.setattr(prediction, "get_model_registry", lambda *args, **kwargs: registry)
+
+    model_path = tmp_path / "shared.keras"
+    model_path.write_bytes(b"model")
+    configs = {
+        "TCS.NS": make_config(tmp_path, "TCS.NS", list(range(100, 120)), model_path),
+        "INFY.NS": make_config(tmp_path, "INFY.NS", [50, 51, 52], model_path),
+    }
+    configs["GONE.NS"] = make_config(tmp_path, "GONE.NS", [1, 2], tmp_path / "missing.keras")
+
+    predictions_df, failed = ModelPrediction.predict_many(configs)
+
+    assert model.batches == [(2, LOOKBACK, 1)]
+    assert list(failed) == ["GONE.NS"]
+    by_ticker = predictions_df.set_index("ticker")
+    assert by_ticker.loc["TCS.NS", "predicted_close_price"] == pytest.approx(119)
+    # The data ends on Saturday 2024-01-20, so the next trading day is Monday
+    assert by_ticker.loc["TCS.NS", "predicted_date"] == "2024-01-22"
+    assert by_ticker.loc["INFY.NS", "predicted_close_price"] == pytest.approx(52)
+
+
+def test_forecast_dates_skip_weekends():
+    friday = "2024-06-07"
+    assert ModelPrediction._prediction_dates(friday, 3) == ["2024-06-10", "2024-06-11", "2024-06-12"]
+
+
+def test_a_numpy_export_older_than_the_model_is_not_used(tmp_path, monkeypatch):
+    registry = ModelRegistry(load_model=lambda path: path, load_scaler=lambda path: path)
+    monkeypatch.setattr(prediction, "get_model_registry", lambda *args, **kwargs: registry)
+    model_path, numpy_path = tmp_path / "lstm_model.keras", tmp_path / "lstm_model.npz"
+    numpy_path.write_bytes(b"export of the seeded run's model")
+    os.utime(numpy_path, (1_000_000, 1_000_000))
+    model_path.write_bytes(b"model")
+    config = replace(make_config(tmp_path, "TCS.NS", [1, 2], model_path), engine="numpy",
+                     numpy_model_path=numpy_path)
+
+    assert ModelPrediction._load_model(config, "TCS.NS")[2] == model_path
+
+    os.utime(numpy_path)
+    assert ModelPrediction._load_model(config, "TCS.NS")[2] == numpy_path
@@ -0,0 +1,25 @@
+from benchmarks.suite import find_regressions, synthetic_ohlcv
+
+
+def test_synthetic_history_is_deterministic():
+    df = synthetic_ohlcv(300)
+
+    assert df.equals(synthetic_ohlcv(300))
+    assert not df.equals(synthetic_ohlcv(300, seed=1))
+    assert list(df.columns) == ["Ticker", "Datetime", "Open", "High", "Low", "Close", "Volume"]
+    assert df["Datetime"].is_monotonic_increasing
+    assert (df["High"] >= df["Close"]).all() and (df["Low"] <= df["Close"]).all()
+
+
+def test_only_slowdowns_beyond_the_threshold_are_regressions():
+    baseline = {"transform": 0.100, "predict": 0.100, "index": 0.0010, "chart": 0.020}
+    timings = {
+        "transform": 0.130,  # 30% slower
+        "predict": 0.120,    # 20% slower, within the threshold
+        "index": 0.0016,     # 60% slower, but by less than a millisecond
+        "chart": 0.010,      # faster
+        "new": 5.0,          # not in the baseline yet
+    }
+
+    assert find_regressions(timings, baseline, threshold=0.25) == ["transform"]
+    assert find_regressions(timings, baseline, threshold=0.1) == ["transform", "predict"]
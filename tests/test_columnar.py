@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from finance_ml.utils import columnar
+from finance_ml.utils.columnar import column_names, iter_frames, read_frame, read_parquet_tail, write_frame
+from finance_ml.utils.tail_cache import read_tail
+
+SCHEMA = {"Ticker": "object", "Open": "float64", "High": "float64", "Low": "float64",
+          "Close": "float64", "Volume": "int64", "Datetime": "datetime64[ns]"}
+
+
+def make_df(n):
+    closes = np.round(np.linspace(100, 200, n), 4)
+    return pd.DataFrame({
+        "Ticker": "TCS.NS",
+        "Datetime": pd.date_range("2020-01-01", periods=n, tz="Asia/Kolkata"),
+        "Open": closes, "High": closes + 1, "Low": closes - 1, "Close": closes,
+        "Volume": np.arange(n, dtype=np.float64),
+    })
+
+
+def test_write_frame_enforces_the_schema(tmp_path):
+    path = tmp_path / "raw_data.parquet"
+    write_frame(make_df(20), path, SCHEMA)
+
+    assert column_names(path) == list(SCHEMA)
+    df = read_frame(path)
+    assert str(df["Volume"].dtype) == "int64"
+    assert str(df["Datetime"].dtype).startswith("datetime64") and str(df["Datetime"].dt.tz) == "Asia/Kolkata"
+    assert list(read_frame(path, columns=["Close"]).columns) == ["Close"]
+
+    with pytest.raises(ValueError, match="Volume"):
+        write_frame(make_df(20).drop(columns="Volume"), path, SCHEMA)
+    fractional = make_df(20)
+    fractional.loc[3, "Volume"] = 1.5
+    with pytest.raises(ValueError):
+        write_frame(fractional, path, SCHEMA)
+    assert len(read_frame(path)) == 20 # The failed writes left the file alone
+
+
+def test_fixed_offset_timestamps_read_back(tmp_path):
+    # Bars parsed from CSV text like '2020-01-01 00:00:00+05:30' carry a fixed offset, not a named zone
+    path = tmp_path / "raw_data.parquet"
+    df = make_df(5)
+    df["Datetime"] = pd.to_datetime(df["Datetime"].astype(str))
+    write_frame(df, path, SCHEMA)
+
+    assert read_frame(path)["Datetime"].equals(df["Datetime"].astype("datetime64[ns, +05:30]"))
+
+
+def test_tail_and_chunks_span_row_groups(tmp_path, monkeypatch):
+    monkeypatch.setattr(columnar, "ROW_GROUP_SIZE", 16)
+    path = tmp_path / "raw_data.parquet"
+    df = make_df(100)
+    write_frame(df, path, SCHEMA)
+    expected = read_frame(path)
+
+    for n in (1, 16, 23, 500):
+        pd.testing.assert_frame_equal(read_parquet_tail(path, n), expected.tail(n).reset_index(drop=True))
+    assert list(read_tail(path, 3, usecols=["Close"]).columns) == ["Close"]
+
+    chunks = list(iter_frames(path, 30, columns=["Close"]))
+    assert [len(chunk) for chunk in chunks] == [30, 30, 30, 10]
+    assert chunks[-1].index[0] == 90
+
+
+def test_runs_with_only_a_csv_are_still_read(tmp_path):
+    make_df(10).to_csv(tmp_path / "raw_data.csv", index=False)
+    path = tmp_path / "raw_data.parquet"
+
+    df = read_frame(path, columns=["Datetime", "Close"])
+    assert str(df["Datetime"].dtype).startswith("datetime64")
+    assert len(read_tail(path, 4)) == 4
+    assert column_names(path)[0] == "Ticker"
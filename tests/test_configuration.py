@@ -0,0 +1,81 @@
+from pathlib import Path
+
+import yaml
+
+from finance_ml.config.configuration import ConfigurationManager
+
+
+def make_config(tmp_path, runs_to_keep=3):
+    """Copies config/config.yaml with every artifact path moved below tmp_path"""
+    text = Path("config/config.yaml").read_text().replace(" artifacts", f" {tmp_path / 'artifacts'}")
+    config = yaml.safe_load(text)
+    config["runs_to_keep"] = runs_to_keep
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml.safe_dump(config))
+    return config_path
+
+
+def test_run_paths_are_namespaced_by_ticker_and_run(tmp_path):
+    config_path = make_config(tmp_path)
+    first = ConfigurationManager(config_filepath=config_path, ticker="M&M.NS", run_id="run-1")
+    second = ConfigurationManager(config_filepath=config_path, ticker="TCS.NS", run_id="run-2")
+
+    first_model = first.get_model_evaluation_config().model_path
+    second_model = second.get_model_evaluation_config().model_path
+    assert first_model != second_model
+    assert Path(first_model).is_relative_to(tmp_path / "artifacts" / "runs" / "M_M.NS" / "run-1")
+
+    training_config, _ = first.get_model_training_config()
+    assert training_config.X_train_path.parent == first.get_data_transformation_config().root_dir
+
+
+def test_publish_run_updates_latest_and_prunes_old_runs(tmp_path):
+    config_path = make_config(tmp_path, runs_to_keep=2)
+    for run_id in ["run-1", "run-2", "run-3"]:
+        manager = ConfigurationManager(config_filepath=config_path, ticker="TCS.NS", run_id=run_id)
+        manager.run_root.mkdir(parents=True)
+        manager.publish_run()
+
+    assert manager.get_latest_run_id("TCS.NS") == "run-3"
+    remaining = sorted(p.name for p in manager.get_ticker_root("TCS.NS").iterdir() if p.is_dir())
+    assert remaining == ["run-2", "run-3"]
+    assert manager.get_latest_run_id("INFY.NS") is None
+
+
+def test_runs_still_writing_are_never_pruned(tmp_path):
+    config_path = make_config(tmp_path, runs_to_keep=1)
+    managers = {run_id: ConfigurationManager(config_filepath=config_path, ticker="TCS.NS", run_id=run_id)
+                for run_id in ["run-1", "run-2", "run-3", "run-4"]}
+    for manager in managers.values():
+        manager.run_root.mkdir(parents=True)
+
+    # run-1 and run-2 are still in flight when run-3 finishes, and run-4 seeds from run-3
+    managers["run-3"].publish_run()
+    managers["run-4"].seed_from_run("run-3")
+    remaining = sorted(p.name for p in managers["run-3"].get_ticker_root("TCS.NS").iterdir() if p.is_dir())
+    assert remaining == ["run-1", "run-2", "run-3", "run-4"]
+
+    managers["run-4"].publish_run()
+    remaining = sorted(p.name for p in managers["run-4"].get_ticker_root("TCS.NS").iterdir() if p.is_dir())
+    assert remaining == ["run-1", "run-2", "run-4"]
+
+
+def test_getting_configs_creates_no_directories(tmp_path):
+    manager = ConfigurationManager(config_filepath=make_config(tmp_path), ticker="TCS.NS", run_id="run-1")
+    for name in dir(manager):
+        if name.startswith("get_") and name.endswith("_config"):
+            getattr(manager, name)()
+
+    assert not (tmp_path / "artifacts").exists()
+
+
+def test_run_exists_only_for_run_ids_of_the_ticker(tmp_path):
+    config_path = make_config(tmp_path)
+    run_id = ConfigurationManager.new_run_id()
+    manager = ConfigurationManager(config_filepath=config_path, ticker="TCS.NS", run_id=run_id)
+    manager.run_root.mkdir(parents=True)
+
+    assert manager.run_exists("TCS.NS", run_id)
+    assert not manager.run_exists("INFY.NS", run_id)
+    assert not manager.run_exists("TCS.NS", f"../TCS.NS/{run_id}")
+    assert manager.get_ticker_root("..").parent == manager.get_ticker_root("TCS.NS").parent
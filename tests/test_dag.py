@@ -0,0 +1,62 @@
+import threading
+
+import pytest
+
+from finance_ml.pipeline.dag import DagExecutor, StageTask, stage_dependencies
+from finance_ml.utils.handoff import Handoff
+
+
+def make_tasks(tmp_path, run):
+    path = lambda name: str(tmp_path / name)
+    return [
+        StageTask("transform", lambda: run("transform"), [path("raw.parquet")], [path("X.npy"), path("scaler.joblib")]),
+        StageTask("train", lambda: run("train"), [path("X.npy")], [path("model.keras")]),
+        StageTask("evaluate", lambda: run("evaluate"), [path("model.keras"), path("scaler.joblib")], [path("metrics.json")]),
+        StageTask("predict", lambda: run("predict"), [path("raw.parquet"), path("model.keras")], []),
+    ]
+
+
+def test_dependencies_follow_inputs_and_outputs(tmp_path):
+    dependencies = stage_dependencies(make_tasks(tmp_path, print))
+    assert dependencies == {"transform": set(), "train": {"transform"},
+                            "evaluate": {"train", "transform"}, "predict": {"train"}}
+
+
+def test_independent_stages_run_at_the_same_time(tmp_path):
+    # evaluate and predict only return once both are running
+    both_running = threading.Barrier(2, timeout=5)
+    order = []
+
+    def run(key):
+        order.append(key)
+        if key in ("evaluate", "predict"):
+            both_running.wait()
+        return key.upper()
+
+    results = DagExecutor(make_tasks(tmp_path, run)).run()
+    assert results == {"transform": "TRANSFORM", "train": "TRAIN", "evaluate": "EVALUATE", "predict": "PREDICT"}
+    assert order[:2] == ["transform", "train"]
+
+
+def test_failed_stage_stops_its_dependents(tmp_path):
+    ran = []
+
+    def run(key):
+        ran.append(key)
+        if key == "train":
+            raise RuntimeError("no data")
+
+    with pytest.raises(RuntimeError, match="no data"):
+        DagExecutor(make_tasks(tmp_path, run)).run()
+    assert ran == ["transform", "train"]
+
+
+def test_handoff_falls_back_to_loading_the_file(tmp_path):
+    handoff = Handoff()
+    path = tmp_path / "X.npy"
+    assert handoff.get(path, lambda p: f"loaded {p.name}") == "loaded X.npy"
+
+    handoff.put(str(path), "in memory")
+    assert handoff.get(path, lambda p: "loaded") == "in memory"
+    handoff.discard([path])
+    assert path not in handoff
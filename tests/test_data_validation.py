@@ -0,0 +1,99 @@
+import dataclasses
+import json
+
+import pandas as pd
+import pytest
+
+from finance_ml.components.data_validation import DataValidation, require_valid_data
+from finance_ml.entity.config_entity import DataValidationConfig
+from finance_ml.utils.columnar import write_frame
+from finance_ml.utils.exceptions import DataValidationError
+
+SCHEMA = {"Ticker": "object", "Open": "float64", "High": "float64", "Low": "float64",
+          "Close": "float64", "Volume": "int64", "Datetime": "datetime64[ns]"}
+
+
+def make_config(tmp_path, df, chunk_size=3):
+    data = tmp_path / "raw_data.csv"
+    df.to_csv(data, index=False)
+    return DataValidationConfig(root_dir=tmp_path, STATUS_FILE=str(tmp_path / "status.txt"), data=data,
+                                all_schemas=SCHEMA, REPORT_FILE=str(tmp_path / "report.json"),
+                                chunk_size=chunk_size, max_gap_days=5)
+
+
+def make_df(n=10):
+    closes = [100.0 + i for i in range(n)]
+    return pd.DataFrame({
+        "Ticker": "TCS.NS",
+        "Datetime": pd.bdate_range("2024-01-01", periods=n).strftime("%Y-%m-%d"),
+        "Open": closes, "High": [c + 1 for c in closes], "Low": [c - 1 for c in closes], "Close": closes,
+        "Volume": 1000,
+    })
+
+
+def test_clean_data_passes_and_writes_both_reports(tmp_path):
+    config = make_config(tmp_path, make_df())
+    report = DataValidation(config).validate()
+
+    assert report["status"] is True
+    assert report["rows"] == 10 and report["failed_checks"] == []
+    assert (tmp_path / "status.txt").read_text() == "Validation status: True"
+    assert json.loads((tmp_path / "report.json").read_text())["status"] is True
+    require_valid_data(config)
+
+
+def test_parquet_data_is_validated_in_chunks(tmp_path):
+    df = make_df()
+    df["Datetime"] = pd.to_datetime(df["Datetime"])
+    df.loc[7, "High"] = 90.0
+    config = make_config(tmp_path, df)
+    data = tmp_path / "raw_data.parquet"
+    write_frame(df, data, SCHEMA)
+    report = DataValidation(dataclasses.replace(config, data=data)).validate()
+
+    assert report["rows"] == 10
+    assert report["failed_checks"] == ["high_below_low"]
+    assert report["checks"]["high_below_low"]["examples"] == ["row 7: High 90.0 < Low 106.0"]
+
+
+def test_every_problem_is_reported_across_chunk_boundaries(tmp_path):
+    df = make_df()
+    df.loc[1, "Close"] = None
+    df.loc[2, "Low"] = -5.0
+    df.loc[4, ["High", "Low"]] = [90.0, 95.0]
+    df.loc[6, "Datetime"] = df.loc[5, "Datetime"]    # duplicate, row 6 starts the third chunk
+    df.loc[8, "Datetime"] = "2023-12-01"             # goes back in time, then jumps forward
+    config = make_config(tmp_path, df)
+    report = DataValidation(config).validate()
+
+    assert report["status"] is False
+    assert set(report["failed_checks"]) == {"missing_values", "non_positive_prices", "high_below_low",
+                                            "duplicate_datetime", "non_monotonic_datetime"}
+    checks = report["checks"]
+    assert checks["missing_values"]["examples"] == ["row 1: Close"]
+    assert checks["duplicate_datetime"]["count"] == 1
+    assert checks["non_monotonic_datetime"]["count"] == 1
+    assert checks["calendar_gaps"]["count"] == 1 and report["warnings"] == ["calendar_gaps"]
+    assert checks["dtypes"]["count"] == 0
+
+    with pytest.raises(DataValidationError, match="high_below_low"):
+        require_valid_data(config)
+
+
+def test_missing_columns_fail_without_stopping_the_other_checks(tmp_path):
+    df = make_df().drop(columns=["Volume"])
+    df.loc[3, "High"] = 0.0
+    report = DataValidation(make_config(tmp_path, df)).validate()
+
+    assert report["status"] is False
+    assert report["missing_columns"] == ["Volume"]
+    assert report["checks"]["non_positive_prices"]["count"] == 1
+
+
+def test_calendar_gaps_only_warn(tmp_path):
+    df = make_df()
+    df.loc[5:, "Datetime"] = pd.bdate_range("2024-03-01", periods=5).strftime("%Y-%m-%d")
+    report = DataValidation(make_config(tmp_path, df)).validate()
+
+    assert report["status"] is True
+    assert report["checks"]["calendar_gaps"]["examples"] == ["row 5: 56 days after 2024-01-05"]
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+from finance_ml.components.forecasting import rollout, rollout_loop
+
+
+class MeanModel:
+    """Predicts the mean target of each window plus the last row's second feature."""
+    def predict(self, X, verbose=0):
+        return X[:, :, 0].mean(axis=1) + X[:, -1, 1]
+
+
+def test_rollout_feeds_predictions_back_and_carries_other_features():
+    window = np.zeros((2, 4, 2), dtype=np.float32)
+    window[0, :, 0] = [1, 2, 3, 4]
+    window[1, :, 0] = 8
+    window[:, -1, 1] = 5
+
+    path = rollout(MeanModel(), window, horizon=3)
+
+    assert path.shape == (2, 3)
+    np.testing.assert_allclose(path[0], [7.5, 9.125, 10.90625])
+    np.testing.assert_allclose(path[1], [13, 14.25, 15.8125])
+
+
+def test_compiled_rollout_matches_the_python_loop():
+    keras = pytest.importorskip("tensorflow").keras
+    model = keras.Sequential([keras.Input((6, 2)), keras.layers.LSTM(4), keras.layers.Dense(1)])
+    window = np.random.default_rng(0).standard_normal((3, 6, 2)).astype(np.float32)
+
+    np.testing.assert_allclose(rollout(model, window, 5), rollout_loop(model, window, 5), rtol=1e-5, atol=1e-6)
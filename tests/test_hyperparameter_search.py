@@ -0,0 +1,62 @@
+import math
+
+from finance_ml.components.hyperparameter_search import (AshaScheduler, grid_size, sample_configurations,
+                                                         successive_halving_rungs)
+
+SEARCH_SPACE = {"lstm_units_1": [32, 64, 128], "dropout_rate": [0.2, 0.5], "batch_size": [32, 64]}
+
+
+def test_sample_configurations_draws_distinct_grid_points():
+    configurations = sample_configurations(SEARCH_SPACE, 5, seed=1)
+
+    assert len(configurations) == 5
+    assert len({tuple(c.items()) for c in configurations}) == 5
+    assert all(c["lstm_units_1"] in SEARCH_SPACE["lstm_units_1"] for c in configurations)
+    assert configurations == sample_configurations(SEARCH_SPACE, 5, seed=1)
+    assert len(sample_configurations(SEARCH_SPACE, 100)) == grid_size(SEARCH_SPACE) == 12
+
+
+def test_rungs_grow_by_the_reduction_factor_up_to_max_epochs():
+    assert successive_halving_rungs(2, 20, 3) == [2, 6, 20]
+    assert successive_halving_rungs(1, 27, 3) == [1, 3, 9, 27]
+    assert successive_halving_rungs(30, 20, 3) == [20]
+
+
+def run_sequentially(scheduler, loss_of):
+    """Drives the scheduler with one worker, returning the (trial_id, rung) jobs in order."""
+    jobs = []
+    while (job := scheduler.next_job()) is not None:
+        jobs.append(job)
+        scheduler.report(*job, loss_of(*job))
+    return jobs
+
+
+def test_asha_promotes_only_the_best_third_of_each_rung():
+    scheduler = AshaScheduler(9, [1, 3, 9], reduction_factor=3)
+    # Lower trial ids are better at every rung
+    jobs = run_sequentially(scheduler, lambda trial_id, rung: trial_id / (rung + 1))
+
+    rung_counts = [sum(1 for _, rung in jobs if rung == r) for r in range(3)]
+    assert rung_counts == [9, 3, 1]
+    assert scheduler.best() == (0, 2, 0.0)
+    # 9 * 1 + 3 * 3 + 1 * 9 epochs instead of 9 * 9 for the full grid at max epochs
+    assert sum([1, 3, 9][rung] for _, rung in jobs) < 9 * 9
+
+
+def test_asha_promotes_without_waiting_for_the_rung_to_fill():
+    scheduler = AshaScheduler(9, [1, 3], reduction_factor=3)
+    for trial_id in range(3):
+        assert scheduler.next_job() == (trial_id, 0)
+        scheduler.report(trial_id, 0, 1.0 + trial_id)
+
+    assert scheduler.next_job() == (0, 1)
+    assert scheduler.next_job() == (3, 0)
+
+
+def test_failed_trials_are_never_promoted():
+    scheduler = AshaScheduler(3, [1, 3], reduction_factor=3)
+    jobs = run_sequentially(scheduler, lambda trial_id, rung: None if trial_id == 0 else float(trial_id))
+
+    assert (0, 1) not in jobs
+    assert scheduler.losses[0][0] == math.inf
+    assert scheduler.best() == (1, 1, 1.0)
@@ -0,0 +1,94 @@
+import json
+
+import pytest
+
+from finance_ml.utils import spans
+from finance_ml.utils.prometheus import MetricsRegistry
+from finance_ml.utils.spans import configure_spans, span
+
+
+@pytest.fixture
+def spans_file(tmp_path):
+    path = tmp_path / "instrumentation" / "spans.jsonl"
+    configure_spans(path)
+    yield path
+    configure_spans(None)
+
+
+def test_spans_are_written_as_json_lines(spans_file):
+    with span("stage", stage="train") as outer:
+        with span("fit", epochs=2) as inner:
+            inner["epochs_run"] = 2
+        with pytest.raises(ValueError):
+            with span("predict"):
+                raise ValueError("bad window")
+
+    records = [json.loads(line) for line in spans_file.read_text().splitlines()]
+    assert [record["name"] for record in records] == ["fit", "predict", "stage"]
+    fit, predict, stage = records
+    assert fit["parent_id"] == stage["span_id"] == outer["span_id"] and stage["parent_id"] is None
+    assert fit["epochs_run"] == 2 and fit["status"] == "ok" and predict["status"] == "error"
+    assert stage["wall_seconds"] >= fit["wall_seconds"] >= 0
+    assert stage["peak_rss_mb"] > 0 and "cpu_seconds" in stage
+
+
+def test_spans_are_not_written_without_a_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(spans, "_spans_file", None)
+    with span("download") as record:
+        pass
+    assert record["wall_seconds"] >= 0
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.parametrize("platform, ru_maxrss", [("darwin", 300 * 1024 ** 2), ("freebsd14", 300 * 1024)])
+def test_peak_rss_without_proc_is_scaled_by_platform(monkeypatch, platform, ru_maxrss):
+    def no_proc(path):
+        raise FileNotFoundError(path)
+
+    class StubResource:
+        RUSAGE_SELF = 0
+
+        @staticmethod
+        def getrusage(who):
+            return type("Usage", (), {"ru_maxrss": ru_maxrss})
+
+    monkeypatch.setattr(spans, "open", no_proc, raising=False)
+    monkeypatch.setattr(spans.sys, "platform", platform)
+    monkeypatch.setattr(spans, "resource", StubResource)
+    assert spans.peak_rss_mb() == 300
+
+    monkeypatch.setattr(spans, "resource", None)
+    assert spans.peak_rss_mb() == 0
+
+
+def test_metrics_render_in_prometheus_text_format():
+    registry = MetricsRegistry()
+    latency = registry.histogram("http_seconds", "Request latency", ["endpoint"], buckets=(0.1, 1))
+    registry.gauge("jobs", "Pipeline jobs", ["status"], callback=lambda: {("queued",): 2, ("running",): 1})
+    latency.observe(0.05, endpoint="index")
+    latency.observe(0.5, endpoint="index")
+    latency.observe(3, endpoint='say "hi"')
+
+    text = registry.render()
+    assert "# TYPE http_seconds histogram" in text
+    assert 'http_seconds_bucket{endpoint="index",le="0.1"} 1' in text
+    assert 'http_seconds_bucket{endpoint="index",le="1"} 2' in text
+    assert 'http_seconds_bucket{endpoint="index",le="+Inf"} 2' in text
+    assert 'http_seconds_sum{endpoint="index"} 0.55' in text
+    assert 'http_seconds_count{endpoint="say \\"hi\\""} 1' in text
+    assert 'jobs{status="queued"} 2' in text
+    with pytest.raises(ValueError):
+        latency.observe(1, path="/")
+
+
+def test_app_serves_request_latencies():
+    from app import app
+
+    client = app.test_client()
+    client.get("/health")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.content_type.startswith("text/plain; version=0.0.4")
+    text = response.get_data(as_text=True)
+    assert 'finsight_http_request_duration_seconds_count{method="GET",endpoint="health_check",status="200"}' in text
+    assert 'finsight_pipeline_jobs{status="queued"} 0' in text
@@ -0,0 +1,80 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from finance_ml.pipeline.job_manager import JobManager
+from finance_ml.utils.exceptions import JobQueueFullError
+
+
+class StubRunner:
+    """Stands in for PipelineRunner without starting worker processes"""
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.executor = ThreadPoolExecutor(max_workers=1)
+
+    def submit(self, choice, ticker=None):
+        def run():
+            time.sleep(self.delay)
+            if ticker == "FAIL":
+                raise ValueError("Invalid input provided")
+            return {"ticker": ticker, "predicted_date": "2025-01-02", "predicted_close_price": 100.0}
+        return self.executor.submit(run)
+
+    def submit_batch(self, tickers):
+        def run():
+            time.sleep(self.delay)
+            return {"predictions": [], "missing": list(tickers), "failed": {}}
+        return self.executor.submit(run)
+
+
+def test_job_reports_result_when_completed():
+    manager = JobManager(StubRunner())
+    job = manager.submit("1", "TCS.NS")
+    job.future.result(timeout=5)
+
+    status = manager.get(job.job_id).to_dict()
+    assert status["status"] == "completed"
+    assert status["result"]["ticker"] == "TCS.NS"
+
+
+def test_failed_job_reports_error():
+    manager = JobManager(StubRunner())
+    job = manager.submit("1", "FAIL")
+    with pytest.raises(ValueError):
+        job.future.result(timeout=5)
+    assert job.to_dict()["status"] == "failed"
+
+
+def test_submit_rejects_when_queue_is_full():
+    manager = JobManager(StubRunner(delay=0.5), max_pending=1)
+    manager.submit("1", "TCS.NS")
+    with pytest.raises(JobQueueFullError):
+        manager.submit("1", "INFY.NS")
+
+
+def test_finished_jobs_are_reported_and_counted():
+    finished = []
+    manager = JobManager(StubRunner(delay=0.2), on_job_done=finished.append)
+    first = manager.submit("1", "TCS.NS")
+    manager.submit("1", "INFY.NS")
+    time.sleep(0.05)
+    assert manager.status_counts() == {"running": 1, "queued": 1}
+
+    first.future.result(timeout=5)
+    deadline = time.time() + 5
+    while len(finished) < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    assert [job.ticker for job in finished] == ["TCS.NS", "INFY.NS"]
+    assert manager.status_counts() == {"completed": 2}
+
+
+def test_batch_predictions_are_jobs_bounded_by_the_queue():
+    manager = JobManager(StubRunner(delay=0.5), max_pending=1)
+    job = manager.submit_batch(["TCS.NS", "INFY.NS"])
+    assert job.choice == "predict_batch"
+    with pytest.raises(JobQueueFullError):
+        manager.submit_batch(["WIPRO.NS"])
+
+    job.future.result(timeout=5)
+    assert job.to_dict()["result"]["missing"] == ["TCS.NS", "INFY.NS"]
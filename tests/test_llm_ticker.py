@@ -0,0 +1,81 @@
+from datetime import datetime
+
+import pytest
+
+from finance_ml.components import LLM_ticker
+from finance_ml.components.LLM_ticker import DailyPickCache, StubAgent, get_bullish_ticker, trading_day
+from finance_ml.entity.config_entity import LLMTickerConfig
+
+
+@pytest.fixture
+def stub_agent(monkeypatch):
+    agent = StubAgent("TCS.NS")
+    monkeypatch.setitem(LLM_ticker.AGENT_BACKENDS, "test-stub", lambda today: agent)
+    monkeypatch.setattr(LLM_ticker, "_agents", {})
+    monkeypatch.setattr(LLM_ticker, "is_valid_ticker", lambda ticker: ticker == "TCS.NS")
+    return agent
+
+
+def make_config(tmp_path):
+    return LLMTickerConfig(
+        backend="test-stub",
+        pick_cache_file=tmp_path / "daily_pick.json",
+        pick_ttl_hours=12,
+        max_retries=2,
+        retry_delay_seconds=0,
+    )
+
+
+def test_pick_is_cached_for_the_trading_day(tmp_path, stub_agent):
+    config = make_config(tmp_path)
+    assert get_bullish_ticker(config=config) == "TCS.NS"
+    assert get_bullish_ticker(config=config) == "TCS.NS"
+    assert stub_agent.calls == 1
+    assert DailyPickCache(config.pick_cache_file).acquire(timeout=0)
+
+
+def test_fallback_pick_is_not_cached(tmp_path, stub_agent):
+    config = make_config(tmp_path)
+    stub_agent.ticker = "NOTREAL.NS"
+    assert get_bullish_ticker(config=config) in LLM_ticker.FALLBACK_TICKERS
+    assert stub_agent.calls == 2
+
+    stub_agent.ticker = "TCS.NS"
+    assert get_bullish_ticker(config=config) == "TCS.NS"
+
+
+def test_pick_lock_is_exclusive_and_survives_a_left_over_lock_file(tmp_path):
+    (tmp_path / "daily_pick.json.lock").touch()
+    holder = DailyPickCache(tmp_path / "daily_pick.json")
+    waiter = DailyPickCache(tmp_path / "daily_pick.json")
+    assert holder.acquire(timeout=0)
+    assert not waiter.acquire(timeout=0)
+
+    holder.release()
+    assert waiter.acquire(timeout=0)
+    waiter.release()
+
+
+def test_pick_lock_uses_msvcrt_without_fcntl(tmp_path, monkeypatch):
+    calls = []
+
+    class StubMsvcrt:
+        LK_NBLCK, LK_UNLCK = 2, 0
+
+        @staticmethod
+        def locking(fd, mode, nbytes):
+            calls.append(mode)
+
+    monkeypatch.setattr(LLM_ticker, "fcntl", None)
+    monkeypatch.setattr(LLM_ticker, "msvcrt", StubMsvcrt, raising=False)
+    cache = DailyPickCache(tmp_path / "daily_pick.json")
+    assert cache.acquire(timeout=0)
+    cache.release()
+    assert calls == [StubMsvcrt.LK_NBLCK, StubMsvcrt.LK_UNLCK]
+
+
+def test_weekends_belong_to_friday():
+    friday = trading_day(datetime(2024, 6, 7, 12, 0))
+    assert trading_day(datetime(2024, 6, 8, 12, 0)) == friday
+    assert trading_day(datetime(2024, 6, 9, 12, 0)) == friday
+    assert trading_day(datetime(2024, 6, 10, 12, 0)) != friday
@@ -0,0 +1,69 @@
+import os
+
+import numpy as np
+
+from finance_ml.components.model_registry import ModelRegistry
+
+
+class StubModel:
+    def __init__(self, path, n_weights=1000):
+        self.path = path
+        self.weights = [np.zeros(n_weights, dtype=np.float32)]
+
+    def get_weights(self):
+        return self.weights
+
+
+def make_registry(loads, **kwargs):
+    def load_model(path):
+        loads.append(path)
+        return StubModel(path)
+    return ModelRegistry(load_model=load_model, load_scaler=lambda path: "scaler", **kwargs)
+
+
+def write_artifacts(tmp_path, ticker):
+    model_path, scaler_path = tmp_path / f"{ticker}.keras", tmp_path / f"{ticker}.joblib"
+    model_path.write_bytes(b"model")
+    scaler_path.write_bytes(b"scaler")
+    return model_path, scaler_path
+
+
+def test_cached_model_is_reused_until_retrained(tmp_path):
+    loads = []
+    registry = make_registry(loads)
+    model_path, scaler_path = write_artifacts(tmp_path, "TCS.NS")
+
+    first, _ = registry.get("TCS.NS", model_path, scaler_path)
+    second, _ = registry.get("TCS.NS", model_path, scaler_path)
+    assert first is second and len(loads) == 1
+
+    # Retraining rewrites the model file
+    model_path.write_bytes(b"retrained model")
+    stat = os.stat(model_path)
+    os.utime(model_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    third, _ = registry.get("TCS.NS", model_path, scaler_path)
+    assert third is not first and len(loads) == 2
+    assert len(registry) == 1
+
+
+def test_least_recently_used_model_is_evicted(tmp_path):
+    loads = []
+    registry = make_registry(loads, max_models=2)
+    artifacts = {ticker: write_artifacts(tmp_path, ticker) for ticker in ["A.NS", "B.NS", "C.NS"]}
+
+    registry.get("A.NS", *artifacts["A.NS"])
+    registry.get("B.NS", *artifacts["B.NS"])
+    registry.get("A.NS", *artifacts["A.NS"])
+    registry.get("C.NS", *artifacts["C.NS"])  # Evicts B.NS
+    registry.get("A.NS", *artifacts["A.NS"])
+    registry.get("B.NS", *artifacts["B.NS"])
+
+    assert [os.path.basename(p) for p in loads] == ["A.NS.keras", "B.NS.keras", "C.NS.keras", "B.NS.keras"]
+
+
+def test_memory_bound_evicts_models(tmp_path):
+    loads = []
+    registry = make_registry(loads, max_memory_mb=0.005)  # Room for one 4 KB stub model
+    registry.get("A.NS", *write_artifacts(tmp_path, "A.NS"))
+    registry.get("B.NS", *write_artifacts(tmp_path, "B.NS"))
+    assert len(registry) == 1
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+from sklearn.preprocessing import MinMaxScaler, StandardScaler
+
+from finance_ml.components.numpy_lstm import export_numpy_model, load_numpy_model, load_numpy_scaler
+
+
+@pytest.mark.parametrize("scaler_class", [StandardScaler, MinMaxScaler])
+def test_exported_scaler_matches_scikit_learn(tmp_path, scaler_class):
+    data = np.random.default_rng(0).uniform(50, 500, size=(100, 2))
+    scaler = scaler_class().fit(data)
+    path = tmp_path / "model.npz"
+    export_numpy_model(type("EmptyModel", (), {"layers": []})(), scaler, path)
+
+    exported = load_numpy_scaler(path)
+    np.testing.assert_allclose(exported.transform(data), scaler.transform(data))
+    np.testing.assert_allclose(exported.inverse_transform(scaler.transform(data)), data)
+    assert exported.n_features_in_ == 2
+
+
+def test_numpy_forward_pass_matches_keras(tmp_path):
+    keras = pytest.importorskip("tensorflow").keras
+    # Same architecture as ModelTraining.train_model
+    model = keras.Sequential([
+        keras.Input((20, 2)),
+        keras.layers.LSTM(16, return_sequences=True),
+        keras.layers.LSTM(8),
+        keras.layers.Dense(32, activation="relu"),
+        keras.layers.Dropout(0.5),
+        keras.layers.Dense(1),
+    ])
+    path = tmp_path / "model.npz"
+    export_numpy_model(model, StandardScaler().fit(np.ones((2, 2))), path)
+
+    X = np.random.default_rng(1).standard_normal((64, 20, 2)).astype(np.float32)
+    np.testing.assert_allclose(load_numpy_model(path).predict(X), model.predict(X, verbose=0), rtol=1e-4, atol=1e-5)
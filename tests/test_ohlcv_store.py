@@ -0,0 +1,157 @@
+import numpy as np
+import pandas as pd
+import pytest
+import yfinance as yf
+
+from finance_ml.components.bulk_ingestion import BulkDataIngestion
+from finance_ml.components.data_providers import (OHLCV_COLUMNS, LocalFileProvider, MarketDataProvider,
+                                                  YFinanceProvider, split_multi_ticker_frame)
+from finance_ml.components.ohlcv_store import OHLCVStore
+from finance_ml.entity.config_entity import BulkIngestionConfig
+
+
+def write_bars(data_dir, ticker, dates):
+    n = len(dates)
+    close = np.linspace(100, 200, n)
+    pd.DataFrame({
+        'Datetime': dates.strftime('%Y-%m-%d'),
+        'Open': close - 1, 'High': close + 2, 'Low': close - 2, 'Close': close,
+        'Volume': np.arange(n, dtype=np.int64) + 1000,
+    }).to_csv(data_dir / f"{ticker}.csv", index=False)
+
+
+class RecordingProvider(LocalFileProvider):
+    def __init__(self, data_dir):
+        super().__init__(data_dir)
+        self.fetched = []
+
+    def fetch(self, ticker, interval, period=None, start=None):
+        df = super().fetch(ticker, interval, period=period, start=start)
+        self.fetched.append(len(df))
+        return df
+
+
+def test_update_only_fetches_new_bars(tmp_path):
+    end = pd.Timestamp.now().normalize()
+    write_bars(tmp_path, "TCS.NS", pd.date_range(end=end - pd.Timedelta(days=3), periods=300))
+    provider = RecordingProvider(tmp_path)
+    store = OHLCVStore(tmp_path / "store")
+
+    store.update("TCS.NS", provider, period="1y", interval="1d")
+    write_bars(tmp_path, "TCS.NS", pd.date_range(end=end, periods=303))
+    store.update("TCS.NS", provider, period="1y", interval="1d")
+
+    # The second update re-fetches the last stored bar plus the three new ones
+    assert provider.fetched == [300, 4]
+    stored = store.read("TCS.NS", "1d")
+    assert len(stored) == 303
+    assert stored['Datetime'].is_monotonic_increasing
+    assert stored['Volume'].dtype == np.int64
+
+
+def test_longer_period_triggers_backfill(tmp_path):
+    end = pd.Timestamp.now().normalize()
+    write_bars(tmp_path, "INFY.NS", pd.date_range(end=end, periods=800))
+    provider = RecordingProvider(tmp_path)
+    store = OHLCVStore(tmp_path / "store")
+
+    store.update("INFY.NS", provider, period="1y", interval="1d")
+    store.update("INFY.NS", provider, period="2y", interval="1d")
+
+    assert len(store.read("INFY.NS", "1d")) > len(store.read("INFY.NS", "1d", period="1y"))
+
+
+def test_split_multi_ticker_frame_handles_both_column_layouts():
+    dates = pd.date_range("2025-01-01", periods=3, name="Date")
+    prices = ["Open", "High", "Low", "Close", "Volume"]
+    columns = pd.MultiIndex.from_product([["TCS.NS", "INFY.NS"], prices], names=["Ticker", "Price"])
+    grouped = pd.DataFrame(np.ones((3, 10)), index=dates, columns=columns)
+    grouped[("INFY.NS", "Close")] = np.nan
+
+    frames = split_multi_ticker_frame(grouped, ["TCS.NS", "INFY.NS"])
+    assert list(frames) == ["TCS.NS"]
+    assert list(frames["TCS.NS"].columns) == OHLCV_COLUMNS
+
+    by_price = grouped.swaplevel(axis=1)
+    assert list(split_multi_ticker_frame(by_price, ["TCS.NS", "INFY.NS"])) == ["TCS.NS"]
+
+
+class FlakyProvider(LocalFileProvider):
+    def __init__(self, data_dir, failures):
+        super().__init__(data_dir)
+        self.failures = failures
+
+    def fetch_many(self, tickers, interval, period=None, start=None):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("rate limited")
+        return super().fetch_many(tickers, interval, period=period, start=start)
+
+
+def test_bulk_ingestion_retries_and_writes_one_partition_per_ticker(tmp_path):
+    end = pd.Timestamp.now().normalize()
+    for ticker in ["TCS.NS", "INFY.NS", "ITC.NS"]:
+        write_bars(tmp_path, ticker, pd.date_range(end=end, periods=30))
+    config = BulkIngestionConfig(
+        store_dir=tmp_path / "store", provider="local", local_data_dir=tmp_path,
+        period="1y", interval="1d", batch_size=2, max_workers=2, max_retries=3, backoff_seconds=0,
+    )
+    ingestion = BulkDataIngestion(config, provider=FlakyProvider(tmp_path, failures=1))
+
+    summary = ingestion.ingest(["TCS.NS", "INFY.NS", "ITC.NS", "NOSUCH.NS"])
+
+    assert sorted(summary["fetched"]) == ["INFY.NS", "ITC.NS", "TCS.NS"]
+    assert summary["missing"] == ["NOSUCH.NS"]
+    assert summary["failed"] == []
+    assert len(ingestion.store.read("ITC.NS", "1d")) == 30
+
+
+@pytest.mark.parametrize("failures, failed", [(1, []), (10, ["INFY.NS"])])
+def test_symbols_dropped_by_a_download_are_retried_alone(tmp_path, monkeypatch, failures, failed):
+    end = pd.Timestamp.now().normalize()
+    for ticker in ["TCS.NS", "INFY.NS"]:
+        write_bars(tmp_path, ticker, pd.date_range(end=end, periods=30))
+    local = LocalFileProvider(tmp_path)
+    requests = []
+
+    def download(tickers, interval, **kwargs):
+        # Like yf.download when the request for INFY.NS fails: no exception, INFY.NS is just left out
+        requests.append(list(tickers))
+        frames = {t: local.fetch(t, interval).set_index("Datetime") for t in tickers if t != "INFY.NS"}
+        return pd.concat(frames, axis=1) if frames else pd.DataFrame()
+
+    class StubTicker:
+        def __init__(self, ticker):
+            self.ticker = ticker
+
+        def history(self, interval, **kwargs):
+            nonlocal failures
+            requests.append(self.ticker)
+            if failures:
+                failures -= 1
+                raise ConnectionError("rate limited")
+            return local.fetch(self.ticker, interval).set_index("Datetime")
+
+    monkeypatch.setattr(yf, "download", download)
+    monkeypatch.setattr(yf, "Ticker", StubTicker)
+    config = BulkIngestionConfig(
+        store_dir=tmp_path / "store", provider="yfinance", local_data_dir=tmp_path,
+        period="1y", interval="1d", batch_size=2, max_workers=1, max_retries=3, backoff_seconds=0,
+    )
+    ingestion = BulkDataIngestion(config, provider=YFinanceProvider())
+
+    summary = ingestion.ingest(["TCS.NS", "INFY.NS"])
+
+    assert summary["failed"] == failed
+    assert sorted(summary["fetched"]) == sorted({"TCS.NS", "INFY.NS"} - set(failed))
+    assert requests[0] == ["TCS.NS", "INFY.NS"]
+    assert all(request in ("INFY.NS", ["INFY.NS"]) for request in requests[1:])
+    assert len(ingestion.store.read("TCS.NS", "1d")) == 30
+
+
+def test_providers_must_implement_fetch():
+    class NoFetch(MarketDataProvider):
+        pass
+
+    with pytest.raises(TypeError):
+        NoFetch()
@@ -0,0 +1,79 @@
+import time
+from pathlib import Path
+
+import pytest
+
+from finance_ml.config.configuration import ConfigurationManager
+from finance_ml.pipeline.pipeline_runner import PipelineRunner, _stage_io, _validate_legacy_runs
+from finance_ml.pipeline.stage_07_model_prediction import ModelPredictionPipeline
+from finance_ml.utils.exceptions import DataValidationError, PipelineTimeoutError
+
+
+@pytest.fixture(scope="module")
+def runner():
+    runner = PipelineRunner(max_workers=1)
+    runner.warm_up()
+    yield runner
+    runner.shutdown()
+
+
+def wait_until(condition, timeout=30):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def make_config_manager(tmp_path):
+    """ConfigurationManager of a run whose artifacts are all below tmp_path"""
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(Path("config/config.yaml").read_text().replace(" artifacts", f" {tmp_path / 'artifacts'}"))
+    return ConfigurationManager(config_filepath=config_path, ticker="TCS.NS", run_id="run-1")
+
+
+def test_jobs_waiting_for_a_worker_are_not_running(runner):
+    first = runner._submit(time.sleep, 1.0)
+    second = runner._submit(time.sleep, 0.1)
+
+    assert wait_until(first.running)
+    # The pool has already handed the second job to its call queue, but no worker has started it
+    assert not second.running() and not second.done()
+
+    assert wait_until(second.running) or second.done()
+    assert first.result(timeout=30) is None and second.result(timeout=30) is None
+
+
+def test_a_job_past_the_timeout_is_killed_and_the_pool_replaced():
+    runner = PipelineRunner(max_workers=1, job_timeout=1)
+    try:
+        hung = runner._submit(time.sleep, 60)
+        waiting = runner._submit(abs, -3)
+
+        with pytest.raises(PipelineTimeoutError):
+            hung.result(timeout=60)
+        # The queued job did not start on the broken pool, it runs on the new one
+        assert waiting.result(timeout=60) == 3
+        assert runner._submit(abs, -4).result(timeout=60) == 4
+    finally:
+        runner.shutdown()
+
+
+def test_runs_without_a_validation_report_are_validated_first(tmp_path):
+    manager = make_config_manager(tmp_path)
+    stage_io = _stage_io(manager)
+
+    training = ["transform", "train", "evaluate"]
+    assert _validate_legacy_runs(manager, training, stage_io) == ["validate"] + training
+    assert _validate_legacy_runs(manager, ["predict"], stage_io) == ["validate", "predict"]
+    assert _validate_legacy_runs(manager, ["train", "evaluate"], stage_io) == ["train", "evaluate"]
+
+    report_file = Path(manager.get_data_validation_config().REPORT_FILE)
+    report_file.parent.mkdir(parents=True)
+    report_file.write_text("{}")
+    assert _validate_legacy_runs(manager, training, stage_io) == training
+
+
+def test_prediction_requires_validated_data(tmp_path):
+    manager = make_config_manager(tmp_path)
+    with pytest.raises(DataValidationError):
+        ModelPredictionPipeline(config_manager=manager).main()
@@ -0,0 +1,41 @@
+import pandas as pd
+
+from finance_ml.components.prediction_history import PredictionHistoryStore
+
+
+def test_top_k_by_error_and_latest_per_ticker(tmp_path):
+    history = PredictionHistoryStore(tmp_path / "history.db")
+    history.append("TCS.NS", "2025-01-01", "2025-01-02", 100.0)
+    history.append("TCS.NS", "2025-01-02", "2025-01-03", 110.0)
+    history.append("INFY.NS", "2025-01-02", "2025-01-03", 50.0)
+    history.append("INFY.NS", "2025-01-03", "2025-01-06", 51.0)
+
+    assert history.update_actuals("TCS.NS", {"2025-01-02": 103.0, "2025-01-03": 109.5}) == 2
+    assert history.update_actuals("INFY.NS", {"2025-01-03": 48.0}) == 1
+
+    top = history.top_k_by_error(k=2)
+    assert [(row["Ticker"], row["Date"]) for row in top] == [("TCS.NS", "2025-01-03"), ("INFY.NS", "2025-01-03")]
+    assert top[0]["Error"] == 0.5
+
+    latest = {row["ticker"]: row["predicted_for_date"] for row in history.latest_per_ticker()}
+    assert latest == {"INFY.NS": "2025-01-06", "TCS.NS": "2025-01-03"}
+
+
+def test_legacy_csv_is_migrated_once(tmp_path):
+    csv_path = tmp_path / "prediction_history.csv"
+    pd.DataFrame({
+        "ticker": ["TCS.NS", "ITC.NS"],
+        "prediction_generated_on": ["2025-01-01", "2025-01-01"],
+        "predicted_for_date": ["2025-01-02", "2025-01-02"],
+        "predicted_close_price": [100.0, 400.0],
+    }).to_csv(csv_path, index=False)
+
+    PredictionHistoryStore(tmp_path / "history.db", legacy_csv_path=csv_path)
+    assert not csv_path.exists()
+
+    # A restored CSV is not imported a second time
+    (tmp_path / "prediction_history.csv.migrated").rename(csv_path)
+    history = PredictionHistoryStore(tmp_path / "history.db", legacy_csv_path=csv_path)
+    assert len(history.latest_per_ticker()) == 2
+    history.update_actuals("TCS.NS", {"2025-01-02": 101.0})
+    assert len(history.top_k_by_error()) == 1
@@ -0,0 +1,91 @@
+import pytest
+
+from finance_ml.pipeline.stage_cache import StageCache
+from finance_ml.utils import windowing
+
+
+def test_stage_is_skipped_when_inputs_params_and_code_are_unchanged(tmp_path):
+    input_path, output_path = tmp_path / "raw_data.csv", tmp_path / "run" / "X_train.npy"
+    input_path.write_text("Close\n1\n2\n")
+    calls = []
+
+    def stage():
+        calls.append(1)
+        output_path.parent.mkdir(exist_ok=True)
+        output_path.write_text(f"output {len(calls)}")
+
+    def run(cache, params):
+        return cache.run("Data Transformation stage", stage, inputs=[input_path],
+                         outputs=[output_path], params=params, code=[windowing])
+
+    cache = StageCache(tmp_path / "cache")
+    assert run(cache, {"lookback": 60}) is False
+    output_path.unlink()
+
+    assert run(cache, {"lookback": 60}) is True
+    assert output_path.read_text() == "output 1"
+
+    assert run(cache, {"lookback": 30}) is False
+    input_path.write_text("Close\n1\n2\n3\n")
+    assert run(cache, {"lookback": 30}) is False
+    assert run(StageCache(tmp_path / "cache", force=True), {"lookback": 30}) is False
+    assert len(calls) == 4
+
+
+def test_inputs_of_runs_from_before_parquet_are_read_from_csv(tmp_path):
+    input_path, output_path = tmp_path / "raw_data.parquet", tmp_path / "run" / "status.txt"
+    input_path.with_suffix(".csv").write_text("Close\n1\n2\n")
+
+    def stage():
+        output_path.parent.mkdir(exist_ok=True)
+        output_path.write_text("Validation status: True")
+
+    cache = StageCache(tmp_path / "cache")
+    assert cache.run("Data Validation stage", stage, inputs=[input_path], outputs=[output_path]) is False
+    assert cache.run("Data Validation stage", stage, inputs=[input_path], outputs=[output_path]) is True
+
+
+def test_failed_stage_is_not_cached(tmp_path):
+    input_path = tmp_path / "raw_data.csv"
+    input_path.write_text("Close\n1\n")
+    cache = StageCache(tmp_path / "cache")
+
+    for _ in range(2):
+        assert cache.run("Model Training stage", lambda: None, inputs=[input_path],
+                         outputs=[tmp_path / "lstm_model.keras"]) is False
+
+
+def test_outputs_left_by_an_earlier_run_are_not_cached(tmp_path):
+    input_path, output_path = tmp_path / "raw_data.csv", tmp_path / "X_train.npy"
+    input_path.write_text("Close\n1\n")
+    output_path.write_text("from the seeded run")
+    cache = StageCache(tmp_path / "cache")
+
+    def failing_stage():
+        raise ValueError("transform failed")
+
+    with pytest.raises(ValueError):
+        cache.run("Data Transformation stage", failing_stage, inputs=[input_path], outputs=[output_path])
+    assert not output_path.exists()
+    assert cache.run("Data Transformation stage", lambda: None, inputs=[input_path],
+                     outputs=[output_path]) is False
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    input_path, output_path = tmp_path / "raw_data.csv", tmp_path / "run" / "X_train.npy"
+    output_path.parent.mkdir()
+    cache = StageCache(tmp_path / "cache", max_entries=2)
+
+    def run(lookback):
+        return cache.run("Data Transformation stage", lambda: output_path.write_text(str(lookback)),
+                         inputs=[input_path], outputs=[output_path], params={"lookback": lookback})
+
+    input_path.write_text("Close\n1\n")
+    assert [run(10), run(20)] == [False, False]
+    assert run(10) is True  # 10 is now used more recently than 20
+    assert run(30) is False
+
+    entries = [p for p in (tmp_path / "cache" / "data_transformation_stage").iterdir()]
+    assert len(entries) == 2
+    assert run(10) is True
+    assert run(20) is False
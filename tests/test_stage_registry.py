@@ -0,0 +1,31 @@
+import pytest
+
+from finance_ml.pipeline.stage_registry import SELECTABLE_STAGES, get_stage, parse_stages
+from finance_ml.utils.import_report import parse_importtime
+
+IMPORTTIME = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:       900 |       4000 |     numpy.core
+import time:      2000 |       6000 |   numpy
+import time:       300 |       6500 | finance_ml.utils.windowing
+"""
+
+
+def test_stages_are_selected_in_pipeline_order():
+    assert parse_stages() == list(SELECTABLE_STAGES)
+    assert parse_stages("predict, ingest") == ["ingest", "predict"]
+    assert parse_stages(["ticker", "train"]) == ["train"]
+    with pytest.raises(ValueError):
+        parse_stages("ingest,deploy")
+
+
+def test_stage_loads_its_pipeline_class():
+    stage = get_stage("validate")
+    assert stage.module == "finance_ml.pipeline.stage_03_data_validation"
+    assert stage.load().__name__ == "DataValidationTrainingPipeline"
+
+
+def test_parse_importtime():
+    entries = parse_importtime(IMPORTTIME)
+    assert entries[-1] == ("finance_ml.utils.windowing", 300, 6500, 0)
+    assert entries[1] == ("numpy.core", 900, 4000, 2)
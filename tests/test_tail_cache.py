@@ -0,0 +1,38 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from finance_ml.utils.tail_cache import TailCache, read_csv_tail
+
+
+def write_raw_data(path, n):
+    pd.DataFrame({
+        "Ticker": "TCS.NS",
+        "Datetime": pd.date_range("2020-01-01", periods=n).strftime("%Y-%m-%d"),
+        "Close": np.round(np.linspace(100, 200, n), 4),
+    }).to_csv(path, index=False)
+
+
+def test_read_csv_tail_matches_pandas_tail(tmp_path):
+    path = tmp_path / "raw_data.csv"
+    write_raw_data(path, 500)
+    expected = pd.read_csv(path).tail(7).reset_index(drop=True)
+
+    for block_size in (16, 100, 1 << 20):
+        pd.testing.assert_frame_equal(read_csv_tail(path, 7, block_size=block_size), expected)
+    assert len(read_csv_tail(path, 1000)) == 500
+
+
+def test_tail_cache_rereads_changed_file(tmp_path):
+    path = tmp_path / "raw_data.csv"
+    write_raw_data(path, 50)
+    cache = TailCache()
+
+    first = cache.get(path, 7)
+    assert cache.get(path, 7) is first
+
+    write_raw_data(path, 60)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert cache.get(path, 7)["Datetime"].iloc[-1] == "2020-02-29"
@@ -0,0 +1,92 @@
+import time
+
+import pytest
+import yfinance as yf
+from yfinance.exceptions import YFPricesMissingError
+
+from finance_ml.components import ticker_resolver
+from finance_ml.components.ticker_resolver import SymbolIndex, TickerResolver, TickerValidationCache
+
+LISTING = """SYMBOL,NAME OF COMPANY, SERIES
+INFY,Infosys Limited,EQ
+TATAMOTORS,Tata Motors Limited,EQ
+TATASTEEL,Tata Steel Limited,EQ
+M&M,Mahindra & Mahindra Limited,EQ
+RELIANCE,Reliance Industries Limited,EQ
+"""
+
+
+def make_resolver(tmp_path, calls, valid=()):
+    listing_path = tmp_path / "EQUITY_L.csv"
+    listing_path.write_text(LISTING)
+    index = SymbolIndex.from_listing(listing_path, aliases={"ril": "RELIANCE.NS"})
+    cache = TickerValidationCache(tmp_path / "cache.json", positive_ttl_hours=1, negative_ttl_hours=1)
+
+    def validator(ticker):
+        calls.append(ticker)
+        if ticker == "OFFLINE":
+            raise ConnectionError("Failed to resolve query2.finance.yahoo.com")
+        return ticker in valid
+    return TickerResolver(index, cache, validator=validator)
+
+
+def test_names_and_listed_symbols_resolve_offline(tmp_path):
+    calls = []
+    resolver = make_resolver(tmp_path, calls)
+
+    assert resolver.resolve("Infosys Ltd") == "INFY.NS"
+    assert resolver.resolve("tata mot") == "TATAMOTORS.NS"
+    assert resolver.resolve("mahindra and mahindra") == "M&M.NS"
+    assert resolver.resolve("Relaince Industries") == "RELIANCE.NS"
+    assert resolver.resolve("ril") == "RELIANCE.NS"
+    assert resolver.resolve("tatasteel") == "TATASTEEL.NS"
+    assert resolver.is_valid("INFY.NS")
+    assert calls == []
+
+
+def test_validation_results_persist_across_resolvers(tmp_path):
+    calls = []
+    resolver = make_resolver(tmp_path, calls, valid={"AAPL"})
+    assert resolver.resolve("AAPL") == "AAPL"
+    assert not resolver.is_valid("NOSUCH.NS")
+    assert calls == ["AAPL", "NOSUCH.NS"]
+
+    # A new process reads the same cache file and does not download again
+    resolver = make_resolver(tmp_path, calls, valid={"AAPL"})
+    assert resolver.resolve("AAPL") == "AAPL"
+    assert not resolver.is_valid("NOSUCH.NS")
+    assert calls == ["AAPL", "NOSUCH.NS"]
+
+
+def test_expired_entries_are_checked_again(tmp_path):
+    cache = TickerValidationCache(tmp_path / "cache.json", positive_ttl_hours=1, negative_ttl_hours=1)
+    cache.set("AAPL", True)
+    assert cache.get("AAPL") is True
+
+    cache._entries["AAPL"][1] = time.time() - 2 * 3600
+    assert cache.get("AAPL") is None
+
+
+def test_failed_checks_are_not_cached(tmp_path):
+    calls = []
+    resolver = make_resolver(tmp_path, calls)
+    assert resolver.is_valid("OFFLINE") is None
+    assert resolver.is_valid("OFFLINE") is None
+    assert calls == ["OFFLINE", "OFFLINE"]
+    assert resolver.cache.get("OFFLINE") is None
+
+
+def test_download_check_tells_unknown_tickers_from_failed_requests(monkeypatch):
+    class StubTicker:
+        def __init__(self, ticker):
+            self.ticker = ticker
+
+        def history(self, **kwargs):
+            if self.ticker == "NOSUCH.NS":
+                raise YFPricesMissingError(self.ticker, "")
+            raise ConnectionError("Failed to resolve query2.finance.yahoo.com")
+
+    monkeypatch.setattr(yf, "Ticker", StubTicker)
+    assert ticker_resolver._download_check("NOSUCH.NS") is False
+    with pytest.raises(ConnectionError):
+        ticker_resolver._download_check("TCS.NS")
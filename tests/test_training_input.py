@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("tensorflow")
+
+from finance_ml.components.training_input import EpochThroughput, make_dataset
+from finance_ml.entity.config_entity import ModelTrainingParams
+
+
+def _params(**overrides):
+    values = dict(epochs=1, batch_size=4, lstm_units_1=4, lstm_units_2=4,
+                  dense_units_1=4, dropout_rate=0.0, shuffle_buffer=0)
+    values.update(overrides)
+    return ModelTrainingParams(**values)
+
+
+def _save_arrays(tmp_path, n=10):
+    X = np.arange(n * 3 * 2, dtype=np.float64).reshape(n, 3, 2)
+    y = np.arange(n, dtype=np.float64)
+    np.save(tmp_path / "X.npy", X)
+    np.save(tmp_path / "y.npy", y)
+    return np.load(tmp_path / "X.npy", mmap_mode="r"), np.load(tmp_path / "y.npy", mmap_mode="r")
+
+
+def test_dataset_yields_float32_batches_in_order_without_shuffle(tmp_path, monkeypatch):
+    monkeypatch.setattr("finance_ml.components.training_input.READ_CHUNK_ROWS", 3)
+    X, y = _save_arrays(tmp_path)
+    batches = list(make_dataset(X, y, _params()))
+
+    assert [len(batch_y) for _, batch_y in batches] == [4, 4, 2]
+    assert batches[0][0].dtype.name == "float32"
+    np.testing.assert_array_equal(np.concatenate([batch_y for _, batch_y in batches]), y)
+    np.testing.assert_array_equal(np.concatenate([batch_X for batch_X, _ in batches]), X)
+
+
+def test_shuffled_dataset_keeps_every_sample_and_cardinality(tmp_path):
+    X, y = _save_arrays(tmp_path)
+    dataset = make_dataset(X, y, _params(shuffle_buffer=10, cache_dataset=True))
+
+    assert int(dataset.cardinality()) == 3
+    for _ in range(2):
+        assert sorted(np.concatenate([batch_y for _, batch_y in dataset])) == list(y)
+
+
+def test_epoch_throughput_reports_samples_per_second():
+    reported = []
+    throughput = EpochThroughput(1000, on_epoch_end=lambda epoch, rate: reported.append((epoch, rate)))
+    throughput.on_epoch_begin(0)
+    throughput.on_epoch_end(0)
+
+    assert len(throughput.samples_per_sec) == 1 and throughput.samples_per_sec[0] > 0
+    assert reported == [(0, throughput.samples_per_sec[0])]
@@ -0,0 +1,41 @@
+import pytest
+
+from finance_ml.entity.config_entity import ModelTrainingParams
+from finance_ml.pipeline.watchlist_training import plan_workers
+
+
+@pytest.mark.parametrize("n_tickers, max_workers, threads_per_worker, cores, expected", [
+    (10, 4, 0, 16, (4, 4)),   # cores split evenly
+    (2, 4, 0, 16, (2, 8)),    # no more workers than tickers
+    (10, 0, 0, 8, (8, 1)),    # 0 workers means one per core
+    (10, 32, 0, 8, (8, 1)),   # never more workers than cores
+    (10, 4, 2, 16, (4, 2)),   # fewer threads than the even split when asked
+    (10, 4, 8, 16, (4, 4)),   # but never more
+    (1, 4, 0, 1, (1, 1)),
+])
+def test_plan_workers_never_oversubscribes(n_tickers, max_workers, threads_per_worker, cores, expected):
+    workers, threads = plan_workers(n_tickers, max_workers, threads_per_worker, cores)
+
+    assert (workers, threads) == expected
+    assert workers * threads <= cores
+
+
+def test_thread_limit_caps_params(monkeypatch):
+    pytest.importorskip("tensorflow")
+    from finance_ml.components import training_input
+
+    calls = {}
+    monkeypatch.setattr(training_input.tf.config.threading, "set_intra_op_parallelism_threads",
+                        lambda n: calls.__setitem__("intra", n))
+    monkeypatch.setattr(training_input.tf.config.threading, "set_inter_op_parallelism_threads",
+                        lambda n: calls.__setitem__("inter", n))
+    monkeypatch.setattr(training_input, "_thread_limit", None)
+
+    params = ModelTrainingParams(epochs=1, batch_size=1, lstm_units_1=1, lstm_units_2=1, dense_units_1=1,
+                                 dropout_rate=0.0, intra_op_threads=16, inter_op_threads=4)
+    training_input.limit_threads(3)
+    training_input.configure_tensorflow(params)
+    assert calls == {"intra": 3, "inter": 1}
+
+    training_input.configure_tensorflow(ModelTrainingParams(**{**params.__dict__, "intra_op_threads": 2}))
+    assert calls["intra"] == 2
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from finance_ml.utils.windowing import create_sequences
+
+
+def loop_sequences(data, lookback):
+    """The per-window loop DataTransformation used before create_sequences"""
+    X, y = [], []
+    for i in range(lookback, len(data)):
+        X.append(data[i - lookback:i])
+        y.append(data[i, 0])
+    return np.array(X), np.array(y)
+
+
+def test_matches_loop_for_multiple_features():
+    data = np.random.default_rng(0).normal(size=(200, 3))
+    X, y = create_sequences(data, lookback=60)
+    X_expected, y_expected = loop_sequences(data, 60)
+
+    assert X.shape == (140, 60, 3)
+    np.testing.assert_array_equal(X, X_expected)
+    np.testing.assert_array_equal(y, y_expected)
+    assert np.shares_memory(X, data)
+
+
+def test_writes_memory_mapped_npy(tmp_path):
+    data = np.arange(100, dtype=np.float64).reshape(-1, 1)
+    out_path = tmp_path / "X_train.npy"
+    X, _ = create_sequences(data, lookback=10, out_path=out_path)
+
+    np.testing.assert_array_equal(np.load(out_path), loop_sequences(data, 10)[0])
+    assert X.shape == (90, 10, 1)
+
+
+def test_rejects_data_shorter_than_lookback():
+    with pytest.raises(ValueError):
+        create_sequences(np.zeros((10, 1)), lookback=10)